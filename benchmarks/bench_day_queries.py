@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark "today" screenshot queries.
+
+Builds a throwaway database with a large screenshots table (10-second captures
+spread over many days) and times the old DATE(timestamp) = DATE('now') filter
+against the indexed half-open range predicate used by database.py.
+
+Usage:
+    python3 benchmarks/bench_day_queries.py --rows 1000000 --repeat 5
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.database import local_day_bounds
+
+console = Console()
+
+CAPTURE_SECONDS = 10
+
+QUERIES = {
+    'hours (timestamps)': (
+        "SELECT timestamp FROM screenshots WHERE DATE(timestamp) = DATE('now') ORDER BY timestamp ASC",
+        "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp ASC",
+    ),
+    'count': (
+        "SELECT COUNT(*) FROM screenshots WHERE DATE(timestamp) = DATE('now')",
+        "SELECT COUNT(*) FROM screenshots WHERE timestamp >= ? AND timestamp < ?",
+    ),
+    'latest 5': (
+        "SELECT timestamp, extracted_text FROM screenshots WHERE DATE(timestamp) = DATE('now') "
+        "ORDER BY timestamp DESC LIMIT 5",
+        "SELECT timestamp, extracted_text FROM screenshots WHERE timestamp >= ? AND timestamp < ? "
+        "ORDER BY timestamp DESC LIMIT 5",
+    ),
+}
+
+
+def build_database(db_path, rows):
+    """Fill a screenshots table with `rows` captures ending now, 8 hours of them per day."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE screenshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            extracted_text TEXT
+        )
+    """)
+
+    per_day = 8 * 3600 // CAPTURE_SECONDS
+    now = datetime.now(timezone.utc)
+
+    def generate():
+        for i in range(rows):
+            days_back, offset = divmod(rows - 1 - i, per_day)
+            moment = now - timedelta(days=days_back, seconds=offset * CAPTURE_SECONDS)
+            yield ("", moment.strftime("%Y-%m-%d %H:%M:%S"), "benchmark text")
+
+    conn.executemany("INSERT INTO screenshots (file_path, timestamp, extracted_text) VALUES (?, ?, ?)", generate())
+    conn.commit()
+    return conn
+
+
+def time_query(conn, sql, params, repeat):
+    """Run a query `repeat` times, returning the median seconds and the row count."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark today's screenshot queries")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="screenshots table size (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        with console.status(f"Building {args.rows:,}-row screenshots table..."):
+            conn = build_database(db_path, args.rows)
+
+        bounds = local_day_bounds()
+        results = {}
+        for name, (old_sql, _) in QUERIES.items():
+            results[name] = [time_query(conn, old_sql, (), args.repeat)]
+
+        with console.status("Creating timestamp index..."):
+            conn.execute("CREATE INDEX idx_screenshots_timestamp ON screenshots (timestamp)")
+            conn.execute("ANALYZE")
+
+        for name, (_, new_sql) in QUERIES.items():
+            results[name].append(time_query(conn, new_sql, bounds, args.repeat))
+        conn.close()
+
+    table = Table(title=f"Today's screenshots, {args.rows:,} rows (median of {args.repeat})")
+    table.add_column("Query", style="cyan")
+    table.add_column("DATE() = DATE('now')", justify="right")
+    table.add_column("Indexed range", justify="right")
+    table.add_column("Speedup", justify="right", style="bold green")
+
+    for name, ((old_seconds, old_rows), (new_seconds, new_rows)) in results.items():
+        table.add_row(
+            name,
+            f"{old_seconds * 1000:.1f} ms ({old_rows} rows)",
+            f"{new_seconds * 1000:.1f} ms ({new_rows} rows)",
+            f"{old_seconds / new_seconds:.0f}x" if new_seconds else "-",
+        )
+
+    console.print(table)
+    console.print("[dim]Row counts differ when the local day is not the UTC day.[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized hours engine.
+
+Generates stored-format timestamps for --users employees over --days days
+(10-second captures with random idle breaks), then times the current loop
+(datetime.fromisoformat per timestamp, grouping by local day and walking the
+gaps in Python, as rebuild_daily_rollups did) against hours_engine.hours_by_day,
+with and without activity bitmaps. Both must agree.
+
+Usage:
+    python3 benchmarks/bench_hours_engine.py --users 20 --days 30 --repeat 3
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.database import _active_seconds, _local_day
+from loggerheads.hours_engine import hours_by_day
+
+console = Console()
+
+CAPTURE_SECONDS = 10
+
+
+def generate(users, days, seed):
+    """Stored UTC timestamps and a user key per timestamp, 8 working hours a day with breaks."""
+    rng = random.Random(seed)
+    today = datetime.now().date()
+    timestamps, keys = [], []
+    for user in range(users):
+        for days_back in range(days):
+            day = today - timedelta(days=days_back)
+            moment = datetime.combine(day, datetime.min.time()).astimezone() + timedelta(hours=9)
+            end = moment + timedelta(hours=8)
+            while moment < end:
+                timestamps.append(moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+                keys.append(f"employee-{user}")
+                moment += timedelta(seconds=CAPTURE_SECONDS if rng.random() > 0.002 else rng.randint(120, 1800))
+    return timestamps, keys
+
+
+def loop_hours(timestamps, keys):
+    """The current per-timestamp loop: group by (user, local day), then sum gaps."""
+    groups = {}
+    for timestamp, key in zip(timestamps, keys):
+        groups.setdefault((key, _local_day(timestamp)), []).append(timestamp)
+    return {group: _active_seconds(sorted(values)) for group, values in groups.items()}
+
+
+def time_call(func, repeat):
+    """Run func `repeat` times, returning the median seconds and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized hours engine")
+    parser.add_argument("--users", type=int, default=20, help="employees (default: 20)")
+    parser.add_argument("--days", type=int, default=30, help="days per employee (default: 30)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args()
+
+    with console.status("Generating timestamps..."):
+        timestamps, keys = generate(args.users, args.days, args.seed)
+
+    loop_seconds, expected = time_call(lambda: loop_hours(timestamps, keys), args.repeat)
+    engine_seconds, engine = time_call(lambda: hours_by_day(timestamps, users=keys), args.repeat)
+    bitmap_seconds, _ = time_call(lambda: hours_by_day(timestamps, users=keys, with_activity=True), args.repeat)
+
+    vectorized = {(key, day.isoformat()): totals['active_seconds'] for (key, day), totals in engine.items()}
+    if vectorized != expected:
+        console.print("[red]Results differ![/red]")
+
+    table = Table(title=f"{len(timestamps):,} timestamps, {args.users} users x {args.days} days "
+                        f"(median of {args.repeat})")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Time", justify="right")
+    table.add_column("Timestamps/s", justify="right")
+    table.add_column("Speedup", justify="right", style="bold green")
+    for name, seconds in (("Python loop", loop_seconds), ("hours_by_day", engine_seconds),
+                          ("hours_by_day + bitmaps", bitmap_seconds)):
+        table.add_row(name, f"{seconds * 1000:.0f} ms", f"{len(timestamps) / seconds:,.0f}",
+                      f"{loop_seconds / seconds:.1f}x")
+
+    console.print(table)
+    console.print(f"[dim]{len(engine)} user-days; both include parsing the timestamp strings.[/dim]")
+
+
+if __name__ == "__main__":
+    main()
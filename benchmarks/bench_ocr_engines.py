@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark OCR engines.
+
+Compares per-image latency and throughput of the persistent in-process tesserocr
+engine against pytesseract (one tesseract process per image) on a corpus of screenshots.
+
+Usage:
+    python3 benchmarks/bench_ocr_engines.py ~/.loggerheads_logs/screenshots --limit 30 --threads 2
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.ocr_engines import ENGINES
+from loggerheads.ocr_processor import ocr_text_similarity
+
+console = Console()
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def load_corpus(corpus_dir, limit):
+    """Load up to `limit` images from the corpus directory."""
+    files = sorted(f for f in os.listdir(corpus_dir) if f.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    frames = []
+    for name in files:
+        with Image.open(os.path.join(corpus_dir, name)) as image:
+            frames.append(image.convert("RGB"))
+    return frames
+
+
+def measure_latency(engine, frames):
+    """OCR frames one after another, returning per-image seconds and the texts."""
+    # Warm up so one-off model loading is not counted as per-image cost
+    engine.image_to_string(frames[0])
+
+    latencies = []
+    texts = []
+    for frame in frames:
+        start = time.perf_counter()
+        texts.append(engine.image_to_string(frame))
+        latencies.append(time.perf_counter() - start)
+    return latencies, texts
+
+
+def measure_throughput(engine, frames, threads):
+    """OCR all frames on a thread pool, returning images per second."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(engine.image_to_string, frames))
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR engines")
+    parser.add_argument("corpus_dir", help="Directory of screenshots")
+    parser.add_argument("--limit", type=int, default=20, help="Max screenshots to use")
+    parser.add_argument("--threads", type=int, default=2, help="Threads for the throughput run")
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus_dir, args.limit)
+    if not frames:
+        console.print(f"[red]No images found in {args.corpus_dir}[/red]")
+        sys.exit(1)
+
+    table = Table(title=f"OCR engine benchmark ({len(frames)} frames)")
+    table.add_column("Engine", style="cyan")
+    table.add_column("Mean ms/image", justify="right")
+    table.add_column("p95 ms/image", justify="right")
+    table.add_column("Images/s (1 thread)", justify="right")
+    table.add_column(f"Images/s ({args.threads} threads)", justify="right")
+    table.add_column("Agreement", justify="right")
+
+    reference_texts = None
+    for name, engine_class in ENGINES.items():
+        engine = engine_class()
+        if not engine.is_available():
+            console.print(f"[yellow]⚠️  {name} not available, skipping[/yellow]")
+            continue
+
+        with console.status(f"Benchmarking {name}..."):
+            latencies, texts = measure_latency(engine, frames)
+            throughput = measure_throughput(engine, frames, args.threads)
+
+        if reference_texts is None:
+            reference_texts = texts
+        agreement = statistics.mean(ocr_text_similarity(r, t) for r, t in zip(reference_texts, texts))
+
+        latencies_ms = sorted(l * 1000 for l in latencies)
+        p95 = latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.95))]
+        table.add_row(
+            name,
+            f"{statistics.mean(latencies_ms):.0f}",
+            f"{p95:.0f}",
+            f"{1000 / statistics.mean(latencies_ms):.2f}",
+            f"{throughput:.2f}",
+            f"{agreement * 100:.1f}%",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
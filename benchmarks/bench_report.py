@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark the multi-day report query.
+
+Builds a throwaway database with --days days of 10-second captures (8 hours a day,
+with a lunch break) plus liveness checks, then times get_daily_report's single
+window-function query (partitioned by local day, joined on day bounds computed in
+Python) against a window partitioned by DATE(timestamp, 'localtime') (a per-row
+date conversion in SQLite) and against computing the report the way the per-day
+helpers would: fetching each day's timestamps and summing the gaps in Python.
+All three must agree.
+
+Usage:
+    python3 benchmarks/bench_report.py --days 90 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.config import MAX_GAP_SECONDS
+from loggerheads.database import init_db, get_daily_report, local_day_bounds, _active_seconds
+from loggerheads.db_connection import get_connection, close_connection
+
+console = Console()
+
+CAPTURE_SECONDS = 10
+LIVENESS_SECONDS = 30 * 60
+
+
+def build_database(db_path, days):
+    """Fill screenshots and liveness_checks with `days` local working days ending today."""
+    init_db(db_path)
+    conn = get_connection(db_path)
+    today = datetime.now().date()
+
+    def stamp(moment):
+        return moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    def work_periods():
+        for days_back in range(days - 1, -1, -1):
+            day = today - timedelta(days=days_back)
+            start = datetime.combine(day, datetime.min.time()).astimezone()
+            # 09:00-12:30 and 13:30-18:00 local
+            yield start + timedelta(hours=9), start + timedelta(hours=12, minutes=30)
+            yield start + timedelta(hours=13, minutes=30), start + timedelta(hours=18)
+
+    def screenshots():
+        for begin, end in work_periods():
+            for offset in range(0, int((end - begin).total_seconds()), CAPTURE_SECONDS):
+                yield ("", stamp(begin + timedelta(seconds=offset)))
+
+    def liveness():
+        for begin, end in work_periods():
+            for i, offset in enumerate(range(0, int((end - begin).total_seconds()), LIVENESS_SECONDS)):
+                yield (stamp(begin + timedelta(seconds=offset)), i % 5 != 0, 0.9, 1)
+
+    conn.executemany("INSERT INTO screenshots (file_path, timestamp) VALUES (?, ?)", screenshots())
+    conn.executemany(
+        "INSERT INTO liveness_checks (timestamp, face_detected, confidence, face_count) VALUES (?, ?, ?, ?)",
+        liveness()
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return today - timedelta(days=days - 1), today
+
+
+def python_report(db_path, first_day, last_day):
+    """The same report from per-day timestamp fetches, summed in Python."""
+    conn = get_connection(db_path)
+    report = []
+    day = first_day
+    while day <= last_day:
+        bounds = local_day_bounds(day)
+        timestamps = [ts for (ts,) in conn.execute(
+            "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp", bounds
+        )]
+        checks = conn.execute(
+            "SELECT face_detected FROM liveness_checks WHERE timestamp >= ? AND timestamp < ?", bounds
+        ).fetchall()
+        if timestamps or checks:
+            report.append({
+                'day': day.isoformat(),
+                'active_seconds': _active_seconds(timestamps),
+                'screenshot_count': len(timestamps),
+                'liveness_checks': len(checks),
+                'liveness_passed': sum(passed for (passed,) in checks),
+            })
+        day += timedelta(days=1)
+    return report
+
+
+def partitioned_report(db_path, first_day, last_day):
+    """Active seconds and counts from one LAG() partitioned by the local date of every row."""
+    rows = get_connection(db_path).execute(
+        """
+        SELECT day, COUNT(*), SUM(CASE WHEN gap <= ? THEN gap ELSE 0 END) FROM (
+            SELECT DATE(timestamp, 'localtime') AS day,
+                   strftime('%s', timestamp) - strftime('%s', LAG(timestamp) OVER (
+                       PARTITION BY DATE(timestamp, 'localtime') ORDER BY timestamp)) AS gap
+            FROM screenshots WHERE timestamp >= ? AND timestamp < ?
+        ) GROUP BY day ORDER BY day
+        """,
+        (MAX_GAP_SECONDS, local_day_bounds(first_day)[0], local_day_bounds(last_day)[1])
+    ).fetchall()
+    return [(day, active_seconds, count) for day, count, active_seconds in rows]
+
+
+def time_call(func, repeat):
+    """Run func `repeat` times, returning the median seconds and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-day report query")
+    parser.add_argument("--days", type=int, default=90, help="days of history (default: 90)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        with console.status(f"Building {args.days} days of history..."):
+            first_day, last_day = build_database(db_path, args.days)
+        rows = get_connection(db_path).execute("SELECT COUNT(*) FROM screenshots").fetchone()[0]
+
+        sql_seconds, sql_report = time_call(lambda: get_daily_report(first_day, last_day, db_path), args.repeat)
+        partitioned_seconds, partitioned = time_call(
+            lambda: partitioned_report(db_path, first_day, last_day), args.repeat)
+        py_seconds, py_report = time_call(lambda: python_report(db_path, first_day, last_day), args.repeat)
+        close_connection(db_path)
+
+    shot_days = [(row['day'], row['active_seconds'], row['screenshot_count']) for row in sql_report]
+    without_pauses = [{key: value for key, value in row.items() if key != 'paused_seconds'} for row in sql_report]
+    if without_pauses != py_report or shot_days != partitioned:
+        console.print("[red]Reports differ![/red]")
+
+    table = Table(title=f"{args.days}-day report, {rows:,} screenshots (median of {args.repeat})")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Time", justify="right")
+    table.add_column("Speedup", justify="right", style="bold green")
+    table.add_column("Rows to Python", justify="right")
+    table.add_row("LAG() partitioned by DATE()", f"{partitioned_seconds * 1000:.1f} ms", "1.0x", f"{len(partitioned)}")
+    table.add_row("get_daily_report", f"{sql_seconds * 1000:.1f} ms",
+                  f"{partitioned_seconds / sql_seconds:.1f}x" if sql_seconds else "-", f"{len(sql_report)}")
+    table.add_row("per-day fetch + Python", f"{py_seconds * 1000:.1f} ms",
+                  f"{partitioned_seconds / py_seconds:.1f}x" if py_seconds else "-", f"{rows:,}")
+
+    console.print(table)
+    console.print("[dim]The Python loop also holds every timestamp in memory; the queries return one row per day.[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark screenshot storage encodings.
+
+For each encoder setting, reports bytes per frame, encode time, and OCR character
+accuracy against the lossless original on a corpus of screenshots, plus how often
+detect_app_from_text still picks the same app.
+
+Usage:
+    python3 benchmarks/bench_screenshot_encoding.py ~/.loggerheads_logs/screenshots --limit 50
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytesseract
+from PIL import Image
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.frame_encoder import FrameEncoder
+from loggerheads.ocr_processor import ocr_text_similarity
+from loggerheads.app_based_analyzer import detect_app_from_text
+
+console = Console()
+
+# (format, scale, quality, grayscale)
+DEFAULT_SETTINGS = [
+    ('png', 1.0, 0, False),
+    ('png', 1.0, 0, True),
+    ('webp', 1.0, 80, True),
+    ('webp', 1.0, 60, True),
+    ('webp', 0.75, 60, True),
+    ('webp', 0.5, 70, True),
+    ('jpeg', 1.0, 70, True),
+    ('jpeg', 0.75, 60, True),
+]
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def load_corpus(corpus_dir, limit):
+    """Load up to `limit` images from the corpus directory as RGB frames."""
+    files = sorted(f for f in os.listdir(corpus_dir) if f.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    frames = []
+    for name in files:
+        with Image.open(os.path.join(corpus_dir, name)) as image:
+            frames.append((name, image.convert("RGB")))
+    return frames
+
+
+def benchmark_setting(encoder, frames, references):
+    """Encode, decode and OCR every frame with one encoder setting."""
+    total_bytes = 0
+    encode_seconds = 0.0
+    accuracy = []
+    app_matches = 0
+
+    for (name, frame), reference in zip(frames, references):
+        start = time.perf_counter()
+        data = encoder.encode(frame)
+        encode_seconds += time.perf_counter() - start
+        total_bytes += len(data)
+
+        with Image.open(io.BytesIO(data)) as decoded:
+            text = pytesseract.image_to_string(decoded).strip()
+
+        accuracy.append(ocr_text_similarity(reference, text))
+        if detect_app_from_text(reference)['app_name'] == detect_app_from_text(text)['app_name']:
+            app_matches += 1
+
+    count = len(frames)
+    return {
+        'bytes_per_frame': total_bytes / count,
+        'encode_ms': encode_seconds / count * 1000,
+        'accuracy': sum(accuracy) / count,
+        'min_accuracy': min(accuracy),
+        'app_agreement': app_matches / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screenshot storage encodings")
+    parser.add_argument("corpus_dir", help="Directory of lossless screenshots (PNG)")
+    parser.add_argument("--limit", type=int, default=30, help="Max screenshots to use")
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus_dir, args.limit)
+    if not frames:
+        console.print(f"[red]No images found in {args.corpus_dir}[/red]")
+        sys.exit(1)
+
+    console.print(f"[cyan]📸 {len(frames)} frames, running reference OCR on lossless originals...[/cyan]")
+    references = [pytesseract.image_to_string(frame).strip() for _, frame in frames]
+
+    table = Table(title="Screenshot encoding benchmark")
+    table.add_column("Setting", style="cyan")
+    table.add_column("KB/frame", justify="right")
+    table.add_column("vs PNG", justify="right")
+    table.add_column("Encode ms", justify="right")
+    table.add_column("OCR accuracy", justify="right")
+    table.add_column("Worst frame", justify="right")
+    table.add_column("Same app", justify="right")
+
+    baseline_bytes = None
+    for fmt, scale, quality, grayscale in DEFAULT_SETTINGS:
+        encoder = FrameEncoder(fmt=fmt, scale=scale, quality=quality, grayscale=grayscale)
+        with console.status(f"Benchmarking {encoder.describe()}..."):
+            result = benchmark_setting(encoder, frames, references)
+
+        if baseline_bytes is None:
+            baseline_bytes = result['bytes_per_frame']
+
+        table.add_row(
+            encoder.describe(),
+            f"{result['bytes_per_frame'] / 1024:.0f}",
+            f"{baseline_bytes / result['bytes_per_frame']:.1f}x",
+            f"{result['encode_ms']:.1f}",
+            f"{result['accuracy'] * 100:.1f}%",
+            f"{result['min_accuracy'] * 100:.1f}%",
+            f"{result['app_agreement'] * 100:.0f}%",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
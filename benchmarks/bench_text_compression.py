@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark OCR text compression.
+
+Fills a throwaway database with synthetic OCR text (screens of a few apps: fixed
+window chrome plus changing content), or copies the texts from your own database
+with --from-db, then compares the raw TEXT column against compression without a
+dictionary and with trained zlib/zstd dictionaries: bytes stored in the text column,
+database size after VACUUM (which includes the search index), compression
+throughput (the recompress pass) and read throughput through ocr_text().
+
+Usage:
+    python3 benchmarks/bench_text_compression.py --rows 20000
+    python3 benchmarks/bench_text_compression.py --from-db ~/.loggerheads_logs/activity_log.db
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from loggerheads.database import init_db, _get_text_id
+from loggerheads.db_connection import get_connection, close_connection
+from loggerheads.text_compression import train_text_dictionary, recompress_texts, compression_stats, zstandard
+
+console = Console()
+
+APPS = {
+    'ide': [
+        "File Edit Selection View Go Run Terminal Help",
+        "EXPLORER    OPEN EDITORS    LOGGERHEADS",
+        "> .github  > benchmarks  v loggerheads  > cli  __init__.py  config.py  database.py",
+        "PROBLEMS  OUTPUT  DEBUG CONSOLE  TERMINAL  PORTS",
+        "Ln 42, Col 17  Spaces: 4  UTF-8  LF  Python 3.11.4 64-bit  Prettier",
+    ],
+    'browser': [
+        "Inbox (3) - mail  x  Pull requests  x  Stack Overflow  x  +",
+        "<- -> C  https://github.com/loggerheads/loggerheads/pulls",
+        "Bookmarks  Docs  Jira board  Calendar  Grafana  Other bookmarks",
+        "Code  Issues 12  Pull requests 4  Actions  Projects  Wiki  Security  Insights",
+    ],
+    'chat': [
+        "Slack  Home  DMs  Activity  Later  More",
+        "# engineering  # general  # random  # deploys  # incidents",
+        "Message #engineering   Aa  @  :)  +",
+        "Threads  Huddles  Drafts & sent  Directories",
+    ],
+    'terminal': [
+        "Terminal  Shell  Edit  View  Window  Help",
+        "user@laptop ~/code/loggerheads (main) $",
+        "zsh  80x24",
+    ],
+}
+
+WORDS = (
+    "def return import self cursor execute query timestamp screenshot window title "
+    "commit merge review deploy staging production error warning fixed tests passed "
+    "failed meeting standup sprint ticket customer invoice billing report dashboard "
+    "the a to of and in for is on that with this be it as are was at by from"
+).split()
+
+
+def synthetic_text(rng):
+    """One frame's OCR text: an app's fixed chrome plus a few lines of changing content."""
+    chrome = APPS[rng.choice(list(APPS))]
+    content = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))) + f" {rng.randint(1, 9999)}"
+        for _ in range(rng.randint(3, 12))
+    ]
+    lines = chrome[:2] + content + chrome[2:]
+    return "\n".join(lines)
+
+
+def load_texts(args):
+    if args.from_db:
+        db_path = os.path.expanduser(args.from_db)
+        rows = get_connection(db_path).execute(
+            "SELECT ocr_text(text) FROM ocr_texts ORDER BY id DESC LIMIT ?", (args.rows,)
+        ).fetchall()
+        close_connection(db_path)
+        return [text for (text,) in rows if text.strip()]
+
+    rng = random.Random(args.seed)
+    return [synthetic_text(rng) for _ in range(args.rows)]
+
+
+def build_database(db_path, texts):
+    """A current-schema database holding the texts uncompressed."""
+    init_db(db_path)
+    conn = get_connection(db_path)
+    cursor = conn.cursor()
+    for text in texts:
+        cursor.execute(
+            "INSERT INTO screenshots (file_path, text_id, timestamp) VALUES ('', ?, CURRENT_TIMESTAMP)",
+            (_get_text_id(cursor, text, compress=False),)
+        )
+    conn.commit()
+
+
+def file_size(db_path):
+    conn = get_connection(db_path)
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # in WAL mode VACUUM's output lands in the WAL first
+    return os.path.getsize(db_path)
+
+
+def read_all(db_path):
+    """Seconds to read every text through ocr_text()."""
+    start = time.perf_counter()
+    for (_,) in get_connection(db_path).execute("SELECT ocr_text(text) FROM ocr_texts"):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR text compression")
+    parser.add_argument("--rows", type=int, default=20000, help="texts to store (default: 20000)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for synthetic text")
+    parser.add_argument("--from-db", help="use plain-text OCR texts from an existing activity database")
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    if not texts:
+        console.print("[red]No texts to benchmark[/red]")
+        return
+    texts = list(dict.fromkeys(texts))  # texts are stored once each
+    raw_bytes = sum(len(text.encode("utf-8")) for text in texts)
+
+    variants = [("no dictionary", None, False), ("zlib dictionary", "zlib", True)]
+    if zstandard is not None:
+        variants.append(("zstd dictionary", "zstd", True))
+    else:
+        console.print("[dim]zstandard not installed; skipping zstd[/dim]")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = os.path.join(tmp, "raw.db")
+        with console.status(f"Storing {len(texts):,} texts..."):
+            build_database(baseline, texts)
+        raw_size = file_size(baseline)
+        raw_read = read_all(baseline)
+        close_connection(baseline)
+
+        for name, codec, trained in variants:
+            db_path = os.path.join(tmp, f"{name.replace(' ', '_')}.db")
+            shutil.copy(baseline, db_path)
+
+            with console.status(f"Compressing ({name})..."):
+                start = time.perf_counter()
+                if trained:
+                    train_text_dictionary(db_path, codec=codec)
+                train_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                recompress_texts(db_path)
+                compress_seconds = time.perf_counter() - start
+
+            stored = compression_stats(db_path)['stored_bytes']
+            results.append((name, stored, file_size(db_path), train_seconds, compress_seconds, read_all(db_path)))
+            close_connection(db_path)
+
+    megabytes = raw_bytes / 1e6
+    table = Table(title=f"OCR text storage, {len(texts):,} texts, {megabytes:.1f} MB raw")
+    table.add_column("Storage", style="cyan")
+    table.add_column("Text column", justify="right")
+    table.add_column("Ratio", justify="right", style="bold green")
+    table.add_column("DB size", justify="right")
+    table.add_column("Train", justify="right")
+    table.add_column("Compress", justify="right")
+    table.add_column("Read", justify="right")
+
+    table.add_row("raw TEXT", f"{megabytes:.2f} MB", "1.0x", f"{raw_size / 1e6:.2f} MB", "-", "-",
+                  f"{megabytes / raw_read:.0f} MB/s")
+    for name, stored, size, train_seconds, compress_seconds, read_seconds in results:
+        table.add_row(
+            name,
+            f"{stored / 1e6:.2f} MB",
+            f"{raw_bytes / stored:.1f}x",
+            f"{size / 1e6:.2f} MB",
+            f"{train_seconds:.2f} s" if train_seconds > 0.001 else "-",
+            f"{megabytes / compress_seconds:.0f} MB/s",
+            f"{megabytes / read_seconds:.0f} MB/s",
+        )
+
+    console.print(table)
+    console.print("[dim]Compress includes the row rewrites; read is a full scan through ocr_text().[/dim]")
+
+
+if __name__ == "__main__":
+    main()
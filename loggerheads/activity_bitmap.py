@@ -0,0 +1,157 @@
+"""
+Per-minute activity bitmaps.
+A day of activity is 1,440 bits (180 bytes), one per local minute, set for every
+minute covered by an active gap between screenshots (MAX_GAP_SECONDS or less).
+The bitmap is kept in the day's rollup row as screenshots are saved, so hours,
+first/last active time, focus blocks and idle gaps come from popcounts and bit
+scans instead of rescanning the day's timestamps. A year of history is ~65 KB.
+
+Bit i of the little-endian integer is minute i after local midnight.
+"""
+
+import base64
+from datetime import datetime, timezone
+
+MINUTES_PER_DAY = 24 * 60
+BITMAP_BYTES = MINUTES_PER_DAY // 8
+
+
+def empty_bitmap():
+    """A bitmap with no active minutes."""
+    return bytes(BITMAP_BYTES)
+
+
+def _to_int(bitmap):
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def _to_bytes(value):
+    return value.to_bytes(BITMAP_BYTES, "little")
+
+
+def minute_of_day(timestamp):
+    """
+    Local minute of the day (0-1439) of a stored UTC timestamp.
+
+    Args:
+        timestamp (str): Stored "YYYY-MM-DD HH:MM:SS" UTC timestamp
+
+    Returns:
+        int: Minutes since local midnight
+    """
+    moment = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).astimezone()
+    return moment.hour * 60 + moment.minute
+
+
+def mark_active(bitmap, first_minute, last_minute):
+    """
+    Set the bits of a span of minutes (both ends included).
+
+    Args:
+        bitmap (bytes): Day bitmap (None counts as empty)
+        first_minute (int): First active minute
+        last_minute (int): Last active minute
+
+    Returns:
+        bytes: Updated bitmap
+    """
+    first_minute = max(first_minute, 0)
+    last_minute = min(last_minute, MINUTES_PER_DAY - 1)
+    if first_minute > last_minute:
+        return bitmap or empty_bitmap()
+    span = ((1 << (last_minute - first_minute + 1)) - 1) << first_minute
+    return _to_bytes(_to_int(bitmap) | span)
+
+
+def active_minutes(bitmap):
+    """Number of active minutes (popcount)."""
+    return bin(_to_int(bitmap)).count("1")
+
+
+def active_blocks(bitmap):
+    """
+    Yield runs of consecutive active minutes, earliest first.
+
+    Yields:
+        tuple: (first minute, minute after the last one)
+    """
+    value = _to_int(bitmap)
+    while value:
+        lowest = value & -value
+        start = lowest.bit_length() - 1
+        # Adding the lowest set bit carries through the run to the first zero above it
+        after = (value + lowest) & ~value
+        end = after.bit_length() - 1
+        yield start, end
+        value &= ~(after - 1)
+
+
+def idle_gaps(bitmap, min_minutes=1):
+    """
+    Get the idle stretches between the first and last active minute.
+
+    Args:
+        bitmap (bytes): Day bitmap
+        min_minutes (int): Shortest gap to report
+
+    Returns:
+        list: (first idle minute, minute activity resumed) tuples
+    """
+    blocks = list(active_blocks(bitmap))
+    return [
+        (previous_end, start)
+        for (_, previous_end), (start, _) in zip(blocks, blocks[1:])
+        if start - previous_end >= min_minutes
+    ]
+
+
+def format_minute(minute):
+    """Format a minute of the day as HH:MM."""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def summarize(bitmap):
+    """
+    Summarize a day bitmap.
+
+    Args:
+        bitmap (bytes): Day bitmap
+
+    Returns:
+        dict: active_minutes, first_active and last_active (HH:MM local, None if
+            idle all day), longest_block_minutes, longest_block (first, end minute)
+            and idle_gaps (count of gaps between active blocks)
+    """
+    blocks = list(active_blocks(bitmap))
+    if not blocks:
+        return {
+            'active_minutes': 0, 'first_active': None, 'last_active': None,
+            'longest_block_minutes': 0, 'longest_block': None, 'idle_gaps': 0,
+        }
+    longest = max(blocks, key=lambda block: block[1] - block[0])
+    return {
+        'active_minutes': active_minutes(bitmap),
+        'first_active': format_minute(blocks[0][0]),
+        'last_active': format_minute(blocks[-1][1] - 1),
+        'longest_block_minutes': longest[1] - longest[0],
+        'longest_block': longest,
+        'idle_gaps': len(blocks) - 1,
+    }
+
+
+def encode(bitmap):
+    """Encode a bitmap for a JSON proof (base64)."""
+    return base64.b64encode(bitmap or empty_bitmap()).decode("ascii")
+
+
+def decode(value):
+    """
+    Decode a bitmap from a JSON proof.
+
+    Raises:
+        ValueError: If the value isn't a base64 day bitmap
+    """
+    bitmap = base64.b64decode(value, validate=True)
+    if len(bitmap) != BITMAP_BYTES:
+        raise ValueError(f"Activity bitmap must be {BITMAP_BYTES} bytes, got {len(bitmap)}")
+    return bitmap
@@ -0,0 +1,82 @@
+"""
+Activity-adaptive screenshot cadence.
+Keyboard/mouse input and frame changes keep captures at the base interval; while the
+user is idle and the screen is static the interval backs off geometrically. The
+longest interval, plus one tracking-loop tick of lateness, is kept below
+MAX_GAP_SECONDS, so the hours calculation (which treats longer gaps as idle time)
+counts the same time it would at a fixed cadence.
+"""
+
+import threading
+import time
+from .config import (
+    SCREENSHOT_INTERVAL,
+    SCREENSHOT_MAX_INTERVAL,
+    CAPTURE_IDLE_AFTER,
+    CAPTURE_BACKOFF_FACTOR,
+    MAX_GAP_SECONDS,
+    TRACKING_INTERVAL
+)
+
+
+class AdaptiveCaptureInterval:
+    """
+    Tracks activity signals and decides how long to wait before the next screenshot.
+
+    record_input() is called from the keyboard/mouse listener threads and
+    record_frame() from the capture loop after each screenshot.
+    """
+
+    def __init__(self, min_interval=SCREENSHOT_INTERVAL, max_interval=SCREENSHOT_MAX_INTERVAL,
+                 idle_after=CAPTURE_IDLE_AFTER, backoff=CAPTURE_BACKOFF_FACTOR):
+        self.min_interval = max(1, min_interval)
+        # Gaps above MAX_GAP_SECONDS would be dropped from the hours calculation; the
+        # capture loop checks the clock every TRACKING_INTERVAL, so a capture can run that late
+        self.max_interval = max(self.min_interval, min(max_interval, MAX_GAP_SECONDS - TRACKING_INTERVAL - 1))
+        self.idle_after = idle_after
+        self.backoff = max(1.0, backoff)
+        self.interval = self.min_interval
+        self._last_input = time.time()
+        self._lock = threading.Lock()
+
+    def record_input(self):
+        """Note keyboard or mouse activity."""
+        self._last_input = time.time()
+
+    def is_idle(self, now=None):
+        """Whether there has been no input for idle_after seconds."""
+        return (now or time.time()) - self._last_input >= self.idle_after
+
+    def record_frame(self, changed, now=None):
+        """
+        Update the interval after a capture.
+
+        Args:
+            changed (bool): Whether the frame differed from the previous one
+            now (float, optional): Capture time (defaults to time.time())
+
+        Returns:
+            float: Seconds to wait before the next capture
+        """
+        with self._lock:
+            if changed or not self.is_idle(now):
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            return self.interval
+
+    def next_interval(self):
+        """
+        Seconds between the last capture and the next one.
+        Input since the last capture cuts a backed-off wait short.
+        """
+        with self._lock:
+            if not self.is_idle():
+                self.interval = self.min_interval
+            return self.interval
+
+    def reset(self):
+        """Return to the base interval (e.g. when work hours start)."""
+        with self._lock:
+            self.interval = self.min_interval
+            self._last_input = time.time()
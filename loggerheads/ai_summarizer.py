@@ -12,7 +12,7 @@ from .user_context import get_user_context
 console = Console()
 
 
-def summarize_work_with_ai(all_ocr_text, ollama_url, ollama_model, is_friday=False):
+def summarize_work_with_ai(all_ocr_text, ollama_url, ollama_model, is_friday=False, counts=None):
     """
     Use Ollama local LLM to analyze all OCR text and generate intelligent work summary.
 
@@ -21,6 +21,8 @@ def summarize_work_with_ai(all_ocr_text, ollama_url, ollama_model, is_friday=Fal
         ollama_url (str): Ollama API URL (e.g., http://localhost:11434)
         ollama_model (str): Ollama model name (e.g., llama3.2)
         is_friday (bool): Whether today is Friday
+        counts (list, optional): Number of screenshots that showed each text, so
+            distinct texts can be sent once and the model told how long each was on screen
 
     Returns:
         dict: Structured summary with all sections
@@ -34,10 +36,18 @@ def summarize_work_with_ai(all_ocr_text, ollama_url, ollama_model, is_friday=Fal
     if len(all_ocr_text) > 30:
         sample_rate = max(2, len(all_ocr_text) // 30)
         all_ocr_text = all_ocr_text[::sample_rate]
+        if counts:
+            counts = counts[::sample_rate]
         console.print(f"[cyan]📊 Sampled {len(all_ocr_text)} screenshots from {original_count} total (every {sample_rate}th)[/cyan]")
 
     # Combine all OCR text
-    combined_text = "\n\n---SCREENSHOT---\n\n".join(all_ocr_text)
+    if counts:
+        combined_text = "\n\n".join(
+            f"---SCREENSHOT (on screen for {count} captures)---\n\n{text}" if count > 1 else f"---SCREENSHOT---\n\n{text}"
+            for text, count in zip(all_ocr_text, counts)
+        )
+    else:
+        combined_text = "\n\n---SCREENSHOT---\n\n".join(all_ocr_text)
 
     # Truncate if still too long
     max_chars = 5000000  # Conservative limit for local models
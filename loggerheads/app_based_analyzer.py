@@ -226,52 +226,62 @@ def generate_app_based_summary(screenshots_data):
     Generate work summary based on application usage.
 
     Args:
-        screenshots_data (list): List of dicts with 'ocr_text' and 'timestamp'
+        screenshots_data (iterable): Dicts with 'ocr_text' and 'timestamp', and
+            optionally 'is_static' for frames where the screen did not change.
+            An item may stand for several screenshots with the same text: 'count'
+            is how many (default 1) and 'static_count' how many of them were static.
+            Consumed in a single pass, so a generator streaming from the database works.
 
     Returns:
         dict: Summary with tasks, apps used, etc.
     """
-    if not screenshots_data:
-        return {
-            'tasks_worked_on': [],
-            'completed_tasks': [],
-            'problems_blockers': [],
-            'apps_used': {},
-            'files_edited': [],
-            'total_screenshots': 0,
-            'work_screenshots': 0,
-            'non_work_screenshots': 0
-        }
-
-    all_apps = []
-    all_files = []
-    all_git_activities = []
+    # Tallies are kept as counters so memory doesn't grow with the number of screenshots
+    app_counts = Counter()
+    file_counts = Counter()
+    all_git_activities = set()
+    total_count = 0
     work_count = 0
     non_work_count = 0
+    static_count = 0
+    last_text = None  # unchanged screens repeat the previous text, detect once
+    app_info = None
 
     for item in screenshots_data:
         ocr_text = item.get('ocr_text', '')
+        count = item.get('count', 1)
+        total_count += count
+        static_count += item.get('static_count', count if item.get('is_static') else 0)
 
         # Detect app
-        app_info = detect_app_from_text(ocr_text)
-        all_apps.append(app_info['app_name'])
+        if ocr_text != last_text:
+            app_info = detect_app_from_text(ocr_text)
+            last_text = ocr_text
+        app_counts[app_info['app_name']] += count
 
         if app_info['is_work']:
-            work_count += 1
+            work_count += count
 
             # Extract files mentioned
-            files = extract_file_mentions(ocr_text)
-            all_files.extend(files)
+            for file in extract_file_mentions(ocr_text):
+                file_counts[file] += count
 
             # Extract git activity
-            git_activities = extract_git_activity(ocr_text)
-            all_git_activities.extend(git_activities)
+            all_git_activities.update(extract_git_activity(ocr_text))
         else:
-            non_work_count += 1
+            non_work_count += count
 
-    # Count app usage
-    app_counts = Counter(all_apps)
-    file_counts = Counter(all_files)
+    if not total_count:
+        return {
+            'tasks_worked_on': [],
+            'completed_tasks': [],
+            'problems_blockers': [],
+            'apps_used': {},
+            'files_edited': [],
+            'total_screenshots': 0,
+            'work_screenshots': 0,
+            'non_work_screenshots': 0,
+            'static_screenshots': 0
+        }
 
     # Generate task list based on apps and files
     tasks = []
@@ -292,7 +302,7 @@ def generate_app_based_summary(screenshots_data):
                         if app in WORK_APPS['terminals'])
     if terminal_count > 0:
         if all_git_activities:
-            tasks.extend(set(all_git_activities))
+            tasks.extend(all_git_activities)
         else:
             tasks.append(f"Terminal/command line work ({terminal_count} screenshots)")
 
@@ -304,14 +314,15 @@ def generate_app_based_summary(screenshots_data):
 
     return {
         'tasks_worked_on': tasks if tasks else ['Active work session detected'],
-        'completed_tasks': list(set(all_git_activities)),  # Git activities = completions
+        'completed_tasks': list(all_git_activities),  # Git activities = completions
         'problems_blockers': [],  # Can't detect from app usage alone
         'apps_used': dict(app_counts.most_common()),
-        'files_edited': list(set(all_files)),
-        'total_screenshots': len(screenshots_data),
+        'files_edited': list(file_counts),
+        'total_screenshots': total_count,
         'work_screenshots': work_count,
         'non_work_screenshots': non_work_count,
-        'work_percentage': round((work_count / len(screenshots_data)) * 100) if screenshots_data else 0
+        'static_screenshots': static_count,
+        'work_percentage': round((work_count / total_count) * 100)
     }
 
 
@@ -353,6 +364,9 @@ def format_app_summary_for_display(summary):
     lines.append(f"  • Work-related: {summary.get('work_screenshots', 0)} ({summary.get('work_percentage', 0)}%)")
     lines.append(f"  • Non-work: {summary.get('non_work_screenshots', 0)}")
 
+    if summary.get('static_screenshots'):
+        lines.append(f"  • Unchanged screen: {summary['static_screenshots']}")
+
     if summary.get('files_edited'):
         lines.append(f"  • Files edited: {len(summary['files_edited'])}")
 
@@ -5,10 +5,13 @@ Runs at end of day to automatically submit hours to blockchain via oracle API.
 
 import sys
 from datetime import datetime
-from .database import calculate_hours_worked_today, get_screenshots, get_liveness_checks_today
+from .database import (calculate_hours_worked_today, iter_screenshots, get_daily_rollup, get_liveness_checks_today,
+                       get_sessions)
 from .vault_config import VaultConfig
 from .oracle_client import get_oracle_client
 from .app_based_analyzer import generate_app_based_summary
+from .activity_bitmap import summarize, encode
+from .config import ADAPTIVE_CAPTURE, SCREENSHOT_INTERVAL, SCREENSHOT_MAX_INTERVAL
 
 
 def auto_submit():
@@ -40,15 +43,15 @@ def auto_submit():
         return
 
     # Get work proof (screenshots from today)
-    # IMPORTANT: Get ALL screenshots from today to get accurate count and timestamps
-    all_screenshots = get_screenshots(today_only=True)  # Get all screenshots from today only
+    # IMPORTANT: Count ALL screenshots from today; the daily rollup has the count and first/last timestamps
+    rollup = get_daily_rollup() or {'screenshot_count': 0}
 
-    # Analyze work quality using existing app-based analyzer
+    # Analyze work quality using existing app-based analyzer (streams today's text from the database)
     print("\n📊 Analyzing work quality...")
-    screenshots_data = [
-        {'ocr_text': screenshot[3] or '', 'timestamp': screenshot[2]}
-        for screenshot in all_screenshots
-    ]
+    screenshots_data = (
+        {'ocr_text': extracted_text or '', 'timestamp': timestamp}
+        for timestamp, extracted_text in iter_screenshots(("timestamp", "extracted_text"), today_only=True)
+    )
 
     work_analysis = generate_app_based_summary(screenshots_data)
 
@@ -57,8 +60,10 @@ def auto_submit():
 
     # Build proof summary with work quality metrics
     proof = {
-        'screenshot_count': len(all_screenshots),
+        'screenshot_count': rollup['screenshot_count'],
         'work_summary': f'{hours} hours tracked',
+        # Longest capture interval (adaptive capture backs off while idle)
+        'max_capture_interval': SCREENSHOT_MAX_INTERVAL if ADAPTIVE_CAPTURE else SCREENSHOT_INTERVAL,
         # Work quality metrics
         'work_percentage': work_analysis.get('work_percentage', 100),
         'work_screenshots': work_analysis.get('work_screenshots', 0),
@@ -78,10 +83,20 @@ def auto_submit():
             for check in liveness_checks
         ]
 
-    if all_screenshots:
-        # Note: get_screenshots() returns ordered by timestamp DESC (newest first)
-        proof['first_screenshot_time'] = all_screenshots[-1][2]  # oldest (last in list)
-        proof['last_screenshot_time'] = all_screenshots[0][2]    # newest (first in list)
+    if rollup['screenshot_count']:
+        proof['first_screenshot_time'] = rollup['first_timestamp']
+        proof['last_screenshot_time'] = rollup['last_timestamp']
+
+    # Work sessions (a handful of rows) and pauses the hours are made of
+    sessions = get_sessions()
+    proof['sessions'] = [[session['start'], session['end']] for session in sessions if not session['paused']]
+    proof['pause_seconds'] = sum(session['seconds'] for session in sessions if session['paused'])
+
+    # Per-minute activity bitmap (180 bytes): which minutes of the day were worked
+    activity = summarize(rollup.get('activity'))
+    if rollup.get('activity') is not None:
+        proof['activity_bitmap'] = encode(rollup['activity'])
+        proof['longest_focus_minutes'] = activity['longest_block_minutes']
 
     print(f"   Screenshots: {proof['screenshot_count']}")
     print(f"   Work-related: {proof['work_screenshots']} ({proof['work_percentage']}%)")
@@ -92,6 +107,10 @@ def auto_submit():
         print(f"   Liveness checks: {passed}/{len(liveness_checks)} passed")
     print(f"   First screenshot: {proof.get('first_screenshot_time', 'N/A')}")
     print(f"   Last screenshot: {proof.get('last_screenshot_time', 'N/A')}")
+    if activity['active_minutes']:
+        print(f"   Active: {activity['first_active']}-{activity['last_active']}, "
+              f"longest focus {activity['longest_block_minutes']} min, {activity['idle_gaps']} break(s)")
+    print(f"   Sessions: {len(proof['sessions'])} ({proof['pause_seconds'] // 60} min paused)")
     print(f"   Submitting as: {hours} hours")
 
     # Submit to oracle API
@@ -0,0 +1,183 @@
+"""
+Screen capture backends.
+Each backend returns captured frames as in-memory PIL images so callers can hash,
+OCR or encode them without a round-trip through a file on disk.
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+from abc import ABC, abstractmethod
+from PIL import Image
+from .config import CAPTURE_BACKEND, CAPTURE_REPLAY_DIR
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+class CaptureBackend(ABC):
+    """Base class for screen capture backends."""
+
+    name = "base"
+
+    def is_available(self):
+        """Check whether this backend can capture on the current machine."""
+        return False
+
+    @abstractmethod
+    def grab(self):
+        """
+        Capture the screen.
+
+        Returns:
+            PIL.Image.Image: RGB frame, or None if capture failed
+        """
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class MSSBackend(CaptureBackend):
+    """
+    In-process capture using the mss library (X11 on Linux, Quartz on macOS, GDI on Windows).
+    Captures all monitors as one frame with no subprocess and no image encoding.
+    """
+
+    name = "mss"
+
+    def __init__(self):
+        self._sct = None
+
+    def is_available(self):
+        try:
+            import mss
+        except ImportError:
+            return False
+        if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+            return False
+        return True
+
+    def grab(self):
+        try:
+            if self._sct is None:
+                import mss
+                self._sct = mss.mss()
+
+            # monitors[0] is the bounding box of every attached monitor
+            shot = self._sct.grab(self._sct.monitors[0])
+            return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+        except Exception as e:
+            print(f"Error capturing screenshot with mss: {e}")
+            return None
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+class ScreencaptureBackend(CaptureBackend):
+    """macOS capture by running the screencapture utility into a temporary file."""
+
+    name = "screencapture"
+
+    def is_available(self):
+        return sys.platform == "darwin"
+
+    def grab(self):
+        fd, temp_path = tempfile.mkstemp(suffix=".png", prefix="loggerheads_")
+        os.close(fd)
+        try:
+            # -x: don't play sound
+            result = subprocess.run(
+                ["screencapture", "-x", temp_path],
+                capture_output=True,
+                timeout=5
+            )
+
+            if result.returncode != 0 or os.path.getsize(temp_path) == 0:
+                print(f"Screenshot capture failed: {result.stderr.decode()}")
+                return None
+
+            with Image.open(temp_path) as image:
+                return image.convert("RGB")
+
+        except Exception as e:
+            print(f"Error capturing screenshot: {e}")
+            return None
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Replays image files from a directory in name order, for headless testing and benchmarks.
+    Loops back to the first image after the last one.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory=CAPTURE_REPLAY_DIR, loop=True):
+        self.directory = directory
+        self.loop = loop
+        self._files = None
+        self._index = 0
+
+    def is_available(self):
+        return bool(self.directory) and os.path.isdir(self.directory)
+
+    def grab(self):
+        if self._files is None:
+            self._files = sorted(
+                os.path.join(self.directory, f) for f in os.listdir(self.directory)
+                if f.lower().endswith(IMAGE_EXTENSIONS)
+            )
+
+        if not self._files or (self._index >= len(self._files) and not self.loop):
+            return None
+
+        path = self._files[self._index % len(self._files)]
+        self._index += 1
+        try:
+            with Image.open(path) as image:
+                return image.convert("RGB")
+        except Exception as e:
+            print(f"Error reading replay frame {path}: {e}")
+            return None
+
+
+BACKENDS = {
+    MSSBackend.name: MSSBackend,
+    ScreencaptureBackend.name: ScreencaptureBackend,
+    ReplayBackend.name: ReplayBackend,
+}
+
+
+def get_capture_backend(name=None):
+    """
+    Create a capture backend.
+
+    Args:
+        name (str, optional): "auto", "mss", "screencapture" or "replay"
+            (defaults to CAPTURE_BACKEND). "auto" prefers the in-process mss
+            backend and falls back to screencapture on macOS.
+
+    Returns:
+        CaptureBackend: The selected backend, or None if nothing is available
+    """
+    name = name or CAPTURE_BACKEND
+
+    if name == "auto":
+        for backend_class in (MSSBackend, ScreencaptureBackend):
+            backend = backend_class()
+            if backend.is_available():
+                return backend
+        return None
+
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown capture backend: {name} (expected auto, {', '.join(BACKENDS)})")
+
+    backend = backend_class()
+    return backend if backend.is_available() else None
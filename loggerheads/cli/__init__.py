@@ -3,7 +3,7 @@ Main CLI entry point - clean and modular.
 """
 
 import sys
-from .commands import tracking, wallet, work, vault, demo, autosubmit
+from .commands import tracking, wallet, work, vault, demo, autosubmit, ocr, search, report
 from .onboarding import simple_onboarding
 from .menu import interactive_menu, show_welcome_and_launch
 from ..autostart import install_autostart, uninstall_autostart, check_autostart_status
@@ -18,6 +18,10 @@ COMMAND_MAP = {
     'status': tracking.show_status,
     'logs': tracking.view_logs,
     'screenshots': tracking.view_screenshots,
+    'rebuild-rollups': tracking.rebuild_rollups,
+    'compress-text': tracking.compress_text,
+    'search': search.search,
+    'report': report.report,
     'dashboard': lambda: __import__('loggerheads.cli.dashboard_textual', fromlist=['show_textual_dashboard']).show_textual_dashboard(),
     'dashboard-old': lambda: __import__('loggerheads.cli.dashboard', fromlist=['show_dashboard']).show_dashboard(),
     
@@ -54,6 +58,9 @@ COMMAND_MAP = {
 
     # Demo mode
     'demo': demo.demo_command,
+
+    # OCR tuning
+    'ocr-tune': ocr.tune_ocr,
 }
 
 
@@ -98,7 +105,12 @@ def print_help():
 
     loggerheads logs                View live logs
     loggerheads screenshots         View recent screenshots
+    loggerheads search <words>      Find when text was on screen (--since today/3d/2w)
+    loggerheads report              Hours per day (--from 30d --to today)
+    loggerheads rebuild-rollups     Recompute daily hours totals from screenshots
+    loggerheads compress-text       Retrain the OCR text dictionary and recompress stored text
     loggerheads demo                Generate fake work data (for testing/demos)
+    loggerheads ocr-tune [dir]      Compare OCR preprocessing speed vs accuracy
     loggerheads install             Enable auto-start on boot
     loggerheads menu                Interactive menu
     loggerheads config              View configuration
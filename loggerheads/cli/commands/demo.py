@@ -7,7 +7,10 @@ import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict
-from ...database import save_screenshot, get_db_path, calculate_hours_worked_today
+from ...database import (
+    save_screenshot, get_db_path, calculate_hours_worked_today, local_day_bounds, rebuild_daily_rollups
+)
+from ...db_connection import transaction
 from ..display import (
     print_header, print_success, print_info, print_warning,
     console, confirm, prompt
@@ -15,7 +18,6 @@ from ..display import (
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.panel import Panel
 from rich.table import Table
-import sqlite3
 
 
 # Activity templates for realistic fake data
@@ -243,18 +245,18 @@ def reset_demo_data():
         return
     
     # Connect and check for demo data
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # For now, just clear all today's data
-    cursor.execute("""
-        DELETE FROM screenshots 
-        WHERE DATE(timestamp) = DATE('now')
-    """)
-    
-    deleted = cursor.rowcount
-    conn.commit()
-    conn.close()
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+        
+        # For now, just clear all today's data
+        cursor.execute("""
+            DELETE FROM screenshots 
+            WHERE timestamp >= ? AND timestamp < ?
+        """, local_day_bounds())
+        
+        deleted = cursor.rowcount
+
+    rebuild_daily_rollups(datetime.now().date())
     
     print_success(f"Reset complete", {"Deleted records": str(deleted)})
 
@@ -0,0 +1,75 @@
+"""
+OCR commands - tune preprocessing presets.
+"""
+
+import os
+import sys
+import argparse
+from rich.table import Table
+from ...ocr_preprocess import ACTIVE_PRESET, PRESETS, tune_presets
+from ...config import SCREENSHOT_DIR
+from ..display import print_header, print_info, console
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def tune_ocr():
+    """Compare OCR preprocessing presets on a corpus of screenshots."""
+    parser = argparse.ArgumentParser(description="Compare OCR preprocessing presets")
+    parser.add_argument("corpus_dir", nargs="?", default=SCREENSHOT_DIR, help="Directory of screenshots")
+    parser.add_argument("--limit", type=int, default=20, help="Max screenshots to use")
+    parser.add_argument("--presets", nargs="+", choices=list(PRESETS), help="Presets to compare (default: all)")
+    parser.add_argument("--min-app-agreement", type=float, default=0.95,
+                        help="Share of frames that must keep the same detected app (default: 0.95)")
+
+    args = parser.parse_args(sys.argv[2:])  # Skip 'loggerheads' and 'ocr-tune'
+
+    if not os.path.isdir(args.corpus_dir):
+        print(f"\n❌ Screenshot directory not found: {args.corpus_dir}")
+        return
+
+    # Screenshots are kept in one subdirectory per day
+    image_paths = sorted(
+        os.path.join(directory, f) for directory, _, files in os.walk(args.corpus_dir) for f in files
+        if f.lower().endswith(IMAGE_EXTENSIONS) and not f.endswith("_thumb.jpg")
+    )[:args.limit]
+
+    if not image_paths:
+        print("\n📸 No screenshots found")
+        print_info("Capture some first with: loggerheads start")
+        return
+
+    print_header(f"🔬 OCR Preprocessing Tuner ({len(image_paths)} frames)")
+
+    with console.status("[bold green]Running OCR...", spinner="dots") as status:
+        results = tune_presets(
+            image_paths,
+            presets=args.presets,
+            on_progress=lambda name: status.update(f"[bold green]Running OCR with preset '{name}'...")
+        )
+
+    table = Table()
+    table.add_column("Preset", style="cyan")
+    table.add_column("Seconds/frame", justify="right")
+    table.add_column("Text similarity", justify="right")
+    table.add_column("Same app", justify="right")
+
+    for result in results:
+        marker = " (current)" if result['preset'] == ACTIVE_PRESET else ""
+        table.add_row(
+            result['preset'] + marker,
+            f"{result['seconds_per_frame']:.2f}",
+            f"{result['similarity'] * 100:.1f}%",
+            f"{result['app_agreement'] * 100:.0f}%",
+        )
+
+    console.print()
+    console.print(table)
+
+    # Fastest preset that still classifies apps like unprocessed frames do
+    eligible = [r for r in results if r['app_agreement'] >= args.min_app_agreement]
+    if eligible:
+        best = min(eligible, key=lambda r: r['seconds_per_frame'])
+        print_info(f"Recommended preset: {best['preset']}")
+        print(f"   export LOGGERHEADS_OCR_PREPROCESS={best['preset']}")
+    print()
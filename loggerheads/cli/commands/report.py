@@ -0,0 +1,121 @@
+"""
+Report command - hours and activity per day over a range of days.
+"""
+
+import re
+import sys
+import argparse
+from datetime import datetime, date, timedelta
+from rich.table import Table
+from ...database import init_db, get_daily_report
+from ..display import print_header, print_info, print_error, console
+
+
+def parse_day(value, today=None):
+    """
+    Turn a --from/--to value into a local date.
+
+    Args:
+        value (str): "today", "yesterday", a relative age like "3d" or "2w",
+            or a local date "YYYY-MM-DD"
+        today (date, optional): Date to count back from (defaults to today)
+
+    Returns:
+        date: Local date
+    """
+    value = value.strip().lower()
+    today = today or datetime.now().date()
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - timedelta(days=1)
+
+    match = re.fullmatch(r"(\d+)([dw])", value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        return today - timedelta(days=amount * (7 if unit == "w" else 1))
+
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _format_hours(seconds):
+    hours, minutes = divmod(int(round(seconds / 60)), 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def _pass_rate(passed, checks):
+    return f"{passed}/{checks} ({passed / checks:.0%})" if checks else "-"
+
+
+def report():
+    """Show active hours, pause time, screenshot counts and liveness pass rates per day."""
+    parser = argparse.ArgumentParser(prog="loggerheads report", description="Hours and activity per day")
+    parser.add_argument("--from", dest="first", default="6d",
+                        help="First day: today, yesterday, 3d, 2w or YYYY-MM-DD (default: 6d, a week with today)")
+    parser.add_argument("--to", dest="last", default="today", help="Last day, inclusive (default: today)")
+    parser.add_argument("--all-days", action="store_true", help="Also list days without any activity")
+
+    args = parser.parse_args(sys.argv[2:])  # Skip 'loggerheads' and 'report'
+
+    try:
+        first_day, last_day = parse_day(args.first), parse_day(args.last)
+    except ValueError:
+        print_error(f"Can't understand --from {args.first} / --to {args.last}",
+                    "Use today, yesterday, 3d, 2w or YYYY-MM-DD")
+        return
+    if first_day > last_day:
+        print_error("--from is after --to")
+        return
+
+    init_db()
+    days = get_daily_report(first_day, last_day)
+
+    print_header(f"📅 Report: {first_day.isoformat()} to {last_day.isoformat()}")
+
+    if not days:
+        print_info("No activity recorded in this range")
+        print()
+        return
+
+    if args.all_days:
+        by_day = {row['day']: row for row in days}
+        span = (last_day - first_day).days + 1
+        days = [
+            by_day.get(day, {'day': day, 'active_seconds': 0, 'screenshot_count': 0,
+                             'liveness_checks': 0, 'liveness_passed': 0, 'paused_seconds': 0})
+            for day in ((first_day + timedelta(days=offset)).isoformat() for offset in range(span))
+        ]
+
+    table = Table(show_lines=False)
+    table.add_column("Day", style="cyan", no_wrap=True)
+    table.add_column("Active", justify="right", style="bold")
+    table.add_column("Paused", justify="right", style="yellow")
+    table.add_column("Screenshots", justify="right")
+    table.add_column("Liveness", justify="right")
+
+    for row in days:
+        label = date.fromisoformat(row['day']).strftime("%a %Y-%m-%d")
+        table.add_row(
+            label,
+            _format_hours(row['active_seconds']),
+            _format_hours(row['paused_seconds']) if row['paused_seconds'] else "-",
+            f"{row['screenshot_count']:,}",
+            _pass_rate(row['liveness_passed'], row['liveness_checks']),
+        )
+
+    active_days = [row for row in days if row['active_seconds'] > 0]
+    total_seconds = sum(row['active_seconds'] for row in days)
+    table.add_section()
+    table.add_row(
+        f"Total ({len(active_days)} active days)",
+        _format_hours(total_seconds),
+        _format_hours(sum(row['paused_seconds'] for row in days)),
+        f"{sum(row['screenshot_count'] for row in days):,}",
+        _pass_rate(sum(row['liveness_passed'] for row in days), sum(row['liveness_checks'] for row in days)),
+    )
+
+    console.print()
+    console.print(table)
+    if active_days:
+        console.print(f"[dim]Average {_format_hours(total_seconds / len(active_days))} per active day[/dim]")
+    print()
@@ -0,0 +1,99 @@
+"""
+Search command - full-text search over OCR'd screenshots.
+"""
+
+import re
+import sys
+import argparse
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from rich.table import Table
+from rich.markup import escape
+from ...database import init_db, search_screenshots, local_day_bounds, to_db_timestamp
+from ..display import print_header, print_info, print_error, console
+
+MATCH_MARKERS = ("\x02", "\x03")  # snippet markers around matched terms (never in OCR text)
+
+
+def parse_since(value):
+    """
+    Turn a --since value into a stored (UTC) timestamp.
+
+    Args:
+        value (str): "today", "yesterday", a relative age like "3d", "2w" or "12h",
+            or a local date "YYYY-MM-DD"
+
+    Returns:
+        str: UTC timestamp, or None for no lower bound
+    """
+    if not value:
+        return None
+
+    value = value.strip().lower()
+    today = datetime.now().date()
+    if value == "today":
+        return local_day_bounds(today)[0]
+    if value == "yesterday":
+        return local_day_bounds(today - timedelta(days=1))[0]
+
+    match = re.fullmatch(r"(\d+)([hdw])", value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"h": timedelta(hours=amount), "d": timedelta(days=amount), "w": timedelta(weeks=amount)}[unit]
+        return to_db_timestamp(datetime.now() - delta)
+
+    return local_day_bounds(datetime.strptime(value, "%Y-%m-%d").date())[0]
+
+
+def _local_time(timestamp):
+    """Format a stored UTC timestamp in local time for display."""
+    moment = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).astimezone()
+    return moment.strftime("%a %b %d %H:%M")
+
+
+def search():
+    """Search screenshot text and list matching screens, best match first."""
+    parser = argparse.ArgumentParser(prog="loggerheads search", description="Search OCR text of screenshots")
+    parser.add_argument("query", nargs="+", help="Words to search for (all must appear)")
+    parser.add_argument("--since", help="today, yesterday, 12h, 3d, 2w or YYYY-MM-DD (default: all)")
+    parser.add_argument("--limit", type=int, default=20, help="Max results (default: 20)")
+    parser.add_argument("--raw", action="store_true",
+                        help='Pass the query to SQLite FTS5 as-is ("exact phrase", OR, NEAR, prefix*)')
+
+    args = parser.parse_args(sys.argv[2:])  # Skip 'loggerheads' and 'search'
+    query = " ".join(args.query)
+
+    try:
+        since = parse_since(args.since)
+    except ValueError:
+        print_error(f"Can't understand --since {args.since}", "Use today, yesterday, 12h, 3d, 2w or YYYY-MM-DD")
+        return
+
+    init_db()
+    try:
+        hits = search_screenshots(query, since=since, limit=args.limit, raw=args.raw, highlight=MATCH_MARKERS)
+    except sqlite3.OperationalError as e:
+        print_error(f"Invalid search query: {e}", "Drop --raw to search for plain words")
+        return
+
+    print_header(f"🔎 Search: {query}")
+
+    if not hits:
+        print_info("No matching screenshots")
+        print()
+        return
+
+    table = Table(show_lines=False)
+    table.add_column("Last seen", style="cyan", no_wrap=True)
+    table.add_column("Seen", justify="right")
+    table.add_column("Match")
+
+    for text_id, last_seen, snippet, score, seen in hits:
+        # Escape OCR text for rich, then turn the match markers into highlighting
+        highlighted = escape(" ".join(snippet.split()))
+        highlighted = highlighted.replace(MATCH_MARKERS[0], "[bold yellow]").replace(MATCH_MARKERS[1], "[/bold yellow]")
+        table.add_row(_local_time(last_seen), f"{seen}x", highlighted)
+
+    console.print()
+    console.print(table)
+    print()
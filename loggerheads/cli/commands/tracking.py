@@ -6,7 +6,9 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 from ...scheduler import run_scheduled_tracker
-from ...database import calculate_hours_worked_today
+from ...database import calculate_hours_worked_today, rebuild_daily_rollups, init_db, get_daily_rollup
+from ...activity_bitmap import summarize
+from ...text_compression import train_text_dictionary, recompress_texts, compression_stats
 from ...user_context import UserContext
 from ...vault_config import VaultConfig
 from ...blockchain import load_keypair
@@ -84,7 +86,6 @@ def show_status():
     # Check if logs exist
     log_dir = Path.home() / ".loggerheads_logs"
     log_file = log_dir / "loggerheads.log"
-    screenshot_dir = log_dir / "screenshots"
     db_path = log_dir / "activity_log.db"
 
     # Check if tracking is running
@@ -103,24 +104,22 @@ def show_status():
 
     print(f"\n{status_icon} Tracker: {status_text}")
 
-    # Hours worked today
+    # Hours worked today, from today's rollup and its activity bitmap
     if db_path.exists():
         try:
             hours = calculate_hours_worked_today()
             print(f"⏰ Hours today: {hours:.1f} hours")
+            rollup = get_daily_rollup() or {'screenshot_count': 0, 'activity': None}
+            activity = summarize(rollup['activity'])
+            if activity['active_minutes']:
+                print(f"🎯 Active {activity['first_active']}-{activity['last_active']}, "
+                      f"longest focus {activity['longest_block_minutes']} min, {activity['idle_gaps']} break(s)")
+            print(f"📸 Screenshots today: {rollup['screenshot_count']}")
         except Exception as e:
             print(f"⏰ Hours today: Unable to calculate ({e})")
     else:
         print("⏰ Hours today: No data (database not found)")
 
-    # Screenshot count today
-    if screenshot_dir.exists():
-        today = datetime.now().strftime("%Y-%m-%d")
-        screenshots_today = list(screenshot_dir.glob(f"screenshot_{today}*"))
-        print(f"📸 Screenshots today: {len(screenshots_today)}")
-    else:
-        print("📸 Screenshots today: 0 (directory not found)")
-
     # Log file status
     if log_file.exists():
         size_mb = log_file.stat().st_size / (1024 * 1024)
@@ -172,7 +171,7 @@ def view_screenshots():
         return
 
     # Get recent screenshots (last 20)
-    screenshots = sorted(screenshot_dir.glob("screenshot_*.png"), key=lambda p: p.stat().st_mtime, reverse=True)[:20]
+    screenshots = sorted(screenshot_dir.glob("screenshot_*"), key=lambda p: p.stat().st_mtime, reverse=True)[:20]
 
     if not screenshots:
         print("\n📸 No screenshots found")
@@ -200,3 +199,35 @@ def view_screenshots():
     print_info("Open screenshot folder:")
     print(f"   open {screenshot_dir}")
     print()
+
+
+def rebuild_rollups():
+    """Recompute the daily hours rollups from the screenshots table."""
+    print_header("🔁 REBUILD DAILY ROLLUPS")
+
+    init_db()
+    days = rebuild_daily_rollups()
+
+    print(f"\n✅ Rebuilt rollups for {days} day(s)")
+    print(f"⏱️  Hours today: {calculate_hours_worked_today()}")
+    print()
+
+
+def compress_text():
+    """Train a new OCR text dictionary on recent screens and recompress stored text with it."""
+    print_header("🗜️  COMPRESS OCR TEXT")
+
+    init_db()
+    before = compression_stats()
+
+    dictionary_id = train_text_dictionary()
+    if dictionary_id is None:
+        print_info("Not enough OCR text yet to train a dictionary; compressing without one")
+    rewritten = recompress_texts()
+    after = compression_stats()
+
+    print(f"\n✅ Recompressed {rewritten} of {after['rows']} text(s)")
+    if after['dictionary_id']:
+        print(f"📖 Dictionary #{after['dictionary_id']} ({after['codec']})")
+    print(f"💾 Stored text: {before['stored_bytes'] / 1024:.1f} KB → {after['stored_bytes'] / 1024:.1f} KB")
+    print()
@@ -13,11 +13,12 @@ from rich.box import SQUARE, ROUNDED, HEAVY, DOUBLE, Box
 from rich import box
 from rich.style import Style
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 import time
 import sys
 
-from ..database import calculate_hours_worked_today, get_db_path
+from ..database import calculate_hours_worked_today, iter_screenshots
 from ..user_context import UserContext
 
 
@@ -611,25 +612,15 @@ class LiveDashboard:
             return None
 
     def _get_recent_screenshots(self, limit: int = 5) -> list:
-        """Get recent screenshot data."""
+        """Get recent screenshot data (static frames show the text of the frame they repeat)."""
         try:
-            import sqlite3
-            db_path = get_db_path()
-            
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT timestamp, extracted_text
-                FROM screenshots
-                WHERE DATE(timestamp) = DATE('now')
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
+            rows = iter_screenshots(("timestamp", "extracted_text"), today_only=True, newest_first=True,
+                                    batch_size=limit)
+            try:
+                results = list(islice(rows, limit))
+            finally:
+                rows.close()
+
             return [
                 {
                     'timestamp': row[0],
@@ -10,16 +10,81 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Screenshot settings
-SCREENSHOT_INTERVAL = 10  # seconds between screenshots
+SCREENSHOT_INTERVAL = 10  # seconds between screenshots (the fastest cadence when adaptive capture is on)
+# Adaptive capture backs off towards SCREENSHOT_MAX_INTERVAL while there is no keyboard/mouse
+# input and the screen is unchanged, and snaps back to SCREENSHOT_INTERVAL on activity
+ADAPTIVE_CAPTURE = os.getenv("LOGGERHEADS_ADAPTIVE_CAPTURE", "true").lower() == "true"
+SCREENSHOT_MAX_INTERVAL = int(os.getenv("LOGGERHEADS_SCREENSHOT_MAX_INTERVAL", "50"))  # capped at MAX_GAP_SECONDS - TRACKING_INTERVAL - 1
+CAPTURE_IDLE_AFTER = 30  # seconds without input before the interval starts backing off
+CAPTURE_BACKOFF_FACTOR = 1.5  # interval multiplier per idle, unchanged capture
+MAX_GAP_SECONDS = 60  # screenshot gaps longer than this count as idle time in the hours calculation
 # Use centralized directory in user's home folder
 _LOG_DIR = Path.home() / ".loggerheads_logs"
 _LOG_DIR.mkdir(exist_ok=True)
 SCREENSHOT_DIR = str(_LOG_DIR / "screenshots")
-AUTO_CLEANUP_DAYS = 1  # delete screenshots older than X days (0 = no auto-cleanup)
+# Retention, in local days including today (0 = keep forever); images live in one directory per day
+IMAGE_RETENTION_DAYS = int(os.getenv("LOGGERHEADS_IMAGE_RETENTION_DAYS", "1"))  # screenshot image files
+TEXT_RETENTION_DAYS = int(os.getenv("LOGGERHEADS_TEXT_RETENTION_DAYS", "30"))  # OCR text (and cached OCR results), window spans, liveness checks
+CAPTURE_BACKEND = os.getenv("LOGGERHEADS_CAPTURE_BACKEND", "auto")  # "auto", "mss", "screencapture" or "replay"
+CAPTURE_REPLAY_DIR = os.getenv("LOGGERHEADS_CAPTURE_REPLAY_DIR", "")  # image directory for the "replay" backend
+# What reaches disk per frame: "full" keeps the screenshot image, "thumbnail" keeps a small
+# preview, "none" keeps only OCR text and hashes (frames are always OCR'd in memory; with "thumbnail"
+# or "none" the OCR queue blocks when full instead of dropping frames, see OCR_OVERFLOW_POLICY)
+SCREENSHOT_STORAGE = os.getenv("LOGGERHEADS_SCREENSHOT_STORAGE", "full")
+THUMBNAIL_SIZE = (480, 300)  # max thumbnail width, height in pixels
+# Encoding for kept screenshots (see benchmarks/bench_screenshot_encoding.py to pick settings)
+SCREENSHOT_FORMAT = os.getenv("LOGGERHEADS_SCREENSHOT_FORMAT", "png")  # "png", "webp" or "jpeg"
+SCREENSHOT_SCALE = float(os.getenv("LOGGERHEADS_SCREENSHOT_SCALE", "1.0"))  # resize factor before encoding
+SCREENSHOT_QUALITY = int(os.getenv("LOGGERHEADS_SCREENSHOT_QUALITY", "80"))  # webp/jpeg quality (1-100)
+SCREENSHOT_GRAYSCALE = os.getenv("LOGGERHEADS_SCREENSHOT_GRAYSCALE", "false").lower() == "true"
 
 # Activity tracking settings
 TRACKING_INTERVAL = 2  # seconds between activity checks
 
+# OCR pipeline settings (capture pushes frames, background workers run OCR)
+OCR_WORKERS = int(os.getenv("LOGGERHEADS_OCR_WORKERS", "2"))  # number of OCR worker threads
+OCR_QUEUE_SIZE = 8  # max frames (held in memory) waiting for OCR before the overflow policy applies
+OCR_OVERFLOW_POLICY = "drop_oldest"  # "drop_oldest", "drop_newest" or "block" when the queue is full ("block" without full screenshots)
+
+# OCR backfill settings (end-of-day pass over screenshots that have no text yet)
+OCR_BACKFILL_WORKERS = int(os.getenv("LOGGERHEADS_OCR_BACKFILL_WORKERS", str(os.cpu_count() or 1)))  # OCR processes
+OCR_BACKFILL_CHUNKSIZE = 4  # images sent to a worker process per dispatch
+OCR_BACKFILL_BATCH_SIZE = 200  # OCR results written back per database transaction
+
+# Duplicate frame detection (unchanged screens reuse the previous frame's OCR text)
+PHASH_DEDUP_ENABLED = True
+PHASH_THRESHOLD = 3  # max differing perceptual-hash bits (of 256) to treat a frame as unchanged
+
+# OCR engine: "tesserocr" keeps tesseract loaded in-process, "pytesseract" runs the binary per image,
+# "auto" uses tesserocr when installed
+OCR_ENGINE = os.getenv("LOGGERHEADS_OCR_ENGINE", "auto")
+OCR_LANGUAGE = "eng"  # tesseract language model
+
+# Preprocessing ahead of OCR: "none", "accurate", "balanced" or "fast" (anything else falls back to "none")
+# (run `loggerheads ocr-tune <screenshot dir>` to compare them on your own screens)
+OCR_PREPROCESS_PRESET = os.getenv("LOGGERHEADS_OCR_PREPROCESS", "none")
+OCR_SCREEN_DPI = int(os.getenv("LOGGERHEADS_SCREEN_DPI", "96"))  # pixel density of captured screens (144+ on Retina)
+
+# OCR result cache (text of previously seen identical frames, stored in the activity database)
+OCR_CACHE_ENABLED = True
+OCR_CACHE_MAX_ENTRIES = 20000  # least recently used entries are evicted above this
+
+# OCR text compression in the database (zstd when the zstandard package is installed, zlib otherwise),
+# with a dictionary trained on your own screens (`loggerheads compress-text` retrains it)
+TEXT_COMPRESSION = os.getenv("LOGGERHEADS_TEXT_COMPRESSION", "true").lower() == "true"
+TEXT_COMPRESSION_MIN_BYTES = 64  # shorter texts are stored as plain TEXT
+TEXT_DICTIONARY_SIZE = 32 * 1024  # bytes (zlib can use at most 32 KB)
+TEXT_DICTIONARY_SAMPLES = 5000  # most recent distinct texts a dictionary is trained on
+TEXT_DICTIONARY_MIN_SAMPLES = 200  # texts needed before the first dictionary is trained
+
+# OCR mode: "full" reads every frame whole, "tiled" only re-reads the text lines in screen tiles that
+# changed since the OCR worker's previous frame (live capture only; backfills read whole frames)
+OCR_MODE = os.getenv("LOGGERHEADS_OCR_MODE", "full")
+OCR_TILE_ROWS = 8  # tile grid rows
+OCR_TILE_COLS = 2  # tile grid columns
+OCR_TILE_PIXEL_THRESHOLD = 24  # grayscale difference (0-255) for a pixel to count as changed
+OCR_TILE_FULL_FRAME_RATIO = 0.5  # re-read the whole frame when at least this share of tiles changed
+
 # Database settings
 DATABASE_NAME = "activity_log.db"
 
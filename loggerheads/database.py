@@ -1,7 +1,29 @@
-import sqlite3
 import os
+import json
+import hashlib
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone, time as dt_time
+from .config import MAX_GAP_SECONDS
+from .db_connection import get_connection, transaction
+from .migrations import migrate
+from .text_compression import compress_text
+from .activity_bitmap import empty_bitmap, mark_active, minute_of_day
+
+SCREENSHOT_FETCH_BATCH = 500  # rows per fetchmany() when streaming screenshots
+
+# ocr_texts row holding a screenshot's text; duplicate frames use the frame they repeat
+_TEXT_ID = "CASE WHEN s.duplicate_of IS NULL THEN s.text_id ELSE src.text_id END"
+_TEXT_JOIN = f" LEFT JOIN screenshots src ON src.id = s.duplicate_of LEFT JOIN ocr_texts t ON t.id = {_TEXT_ID}"
+
+# Columns iter_screenshots can project; ocr_text() decompresses only the rows actually returned
+SCREENSHOT_COLUMNS = {
+    'id': "s.id",
+    'file_path': "s.file_path",
+    'timestamp': "s.timestamp",
+    'extracted_text': "ocr_text(t.text)",
+    'text_id': _TEXT_ID,
+    'is_static': "s.duplicate_of IS NOT NULL",
+}
 
 
 def get_db_path():
@@ -12,86 +34,715 @@ def get_db_path():
 
 
 def init_db(db_path=None):
+    """
+    Create the database or upgrade an existing one to the current schema.
+
+    Args:
+        db_path (str, optional): Custom database path (defaults to standard path)
+    """
     if db_path is None:
         db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    migrate(db_path)
 
-    # Create logs table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            window_name TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
 
-    # Create screenshots table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS screenshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_path TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            extracted_text TEXT,
-            log_id INTEGER,
-            FOREIGN KEY (log_id) REFERENCES logs(id)
-        )
-    """)
+def utc_timestamp(seconds=None):
+    """Format a Unix time (default: now) the way CURRENT_TIMESTAMP stores it."""
+    moment = datetime.fromtimestamp(seconds, timezone.utc) if seconds is not None else datetime.now(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Create liveness checks table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS liveness_checks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            face_detected BOOLEAN NOT NULL,
-            confidence REAL NOT NULL,
-            face_count INTEGER NOT NULL,
-            error TEXT
+
+def to_db_timestamp(value):
+    """
+    Normalize a timestamp to the stored format: UTC "YYYY-MM-DD HH:MM:SS".
+
+    Stored timestamps must share one format so range comparisons on the text
+    column order correctly.
+
+    Args:
+        value (str or datetime): ISO timestamp or datetime; naive values are local time
+
+    Returns:
+        str: UTC timestamp as CURRENT_TIMESTAMP stores it
+    """
+    moment = datetime.fromisoformat(value) if isinstance(value, str) else value
+    # astimezone() treats a naive datetime as local time
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def local_day_bounds(day=None):
+    """
+    Get the stored-timestamp range covering one local calendar day.
+
+    Timestamps are stored in UTC, so a local day is a UTC range that usually
+    straddles two UTC dates. Use as `timestamp >= start AND timestamp < end`,
+    which can use the timestamp indexes (unlike DATE(timestamp) = ...).
+
+    Args:
+        day (date, optional): Local date (defaults to today)
+
+    Returns:
+        tuple: (start, end) UTC timestamps, end exclusive
+    """
+    day = day or datetime.now().date()
+    start = datetime.combine(day, dt_time.min)
+    end = datetime.combine(day + timedelta(days=1), dt_time.min)
+    return to_db_timestamp(start), to_db_timestamp(end)
+
+
+def _get_title_id(cursor, title):
+    """Look up a window title's id in the dictionary table, adding it if it is new."""
+    cursor.execute("INSERT OR IGNORE INTO window_titles (title) VALUES (?)", (title,))
+    cursor.execute("SELECT id FROM window_titles WHERE title = ?", (title,))
+    return cursor.fetchone()[0]
+
+
+def text_hash(text):
+    """Content address of an OCR text (the ocr_texts.hash key)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_text_id(cursor, text, db_path=None, compress=True):
+    """
+    Look up OCR text's id in the content-addressed ocr_texts table, adding it (and
+    indexing it for search) if it is new.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor inside the caller's transaction
+        text (str): OCR text
+        db_path (str, optional): Database file, for the compression dictionary
+        compress (bool): Store new texts compressed
+
+    Returns:
+        int: ocr_texts id, or None for empty text
+    """
+    if not text or not text.strip():
+        return None
+    key = text_hash(text)
+    cursor.execute(
+        "INSERT OR IGNORE INTO ocr_texts (hash, text) VALUES (?, ?)",
+        (key, compress_text(text, db_path) if compress else text)
+    )
+    if cursor.rowcount:
+        # The stored value may be compressed; index the plain text
+        cursor.execute("INSERT INTO ocr_texts_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text))
+        return cursor.lastrowid
+    cursor.execute("SELECT id FROM ocr_texts WHERE hash = ?", (key,))
+    return cursor.fetchone()[0]
+
+
+def sync_text_index(db_path=None):
+    """
+    Take deleted OCR texts out of the search index. Deleting a text only queues
+    its stored value (see migration 11), since decoding it needs ocr_text().
+
+    Args:
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        int: Number of texts removed from the index
+    """
+    with transaction(db_path or get_db_path()) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO ocr_texts_fts (ocr_texts_fts, rowid, text) "
+            "SELECT 'delete', id, ocr_text(text) FROM ocr_texts_fts_deleted"
         )
-    """)
+        removed = cursor.rowcount
+        cursor.execute("DELETE FROM ocr_texts_fts_deleted")
+    return removed
+
+
+def save_log_span(title, start, end, log_id=None):
+    """
+    Record (or extend) a span of time spent in one window.
+
+    Args:
+        title (str): Window title
+        start (str): Span start (UTC, see utc_timestamp)
+        end (str): Span end so far (UTC)
+        log_id (int, optional): ID of the span to update; a new span is inserted if None
+
+    Returns:
+        int: ID of the span's logs row
+    """
+    db_path = get_db_path()
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+
+        if log_id is None:
+            cursor.execute(
+                "INSERT INTO logs (title_id, timestamp, end_timestamp) VALUES (?, ?, ?)",
+                (_get_title_id(cursor, title), start, end)
+            )
+            log_id = cursor.lastrowid
+        else:
+            cursor.execute("UPDATE logs SET end_timestamp = ? WHERE id = ?", (end, log_id))
+
+    return log_id
 
-    conn.commit()
-    conn.close()
 
+def get_window_time_totals(today_only=True, limit=None):
+    """
+    Total time spent in each window, from the recorded spans.
+
+    Args:
+        today_only (bool): Only count spans that started today (default: True)
+        limit (int, optional): Return only the top N windows
 
-def save_logs(logs):
+    Returns:
+        list: (title, seconds, span_count) tuples, longest first
+    """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
-    cursor.executemany("INSERT INTO logs (window_name) VALUES (?)", [(log,) for log in logs])
-    conn.commit()
-    conn.close()
 
+    query = """
+        SELECT t.title,
+               SUM((julianday(l.end_timestamp) - julianday(l.timestamp)) * 86400.0) AS seconds,
+               COUNT(*)
+        FROM logs l
+        JOIN window_titles t ON t.id = l.title_id
+        WHERE l.end_timestamp IS NOT NULL
+    """
+    params = ()
+    if today_only:
+        query += " AND l.timestamp >= ? AND l.timestamp < ?"
+        params = local_day_bounds()
+    query += " GROUP BY l.title_id ORDER BY seconds DESC"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+
+    cursor.execute(query, params)
+    totals = [(title, round(seconds or 0), spans) for title, seconds, spans in cursor.fetchall()]
+    return totals
 
-def save_screenshot(file_path, extracted_text="", log_id=None, timestamp=None):
+
+def save_screenshot(file_path, extracted_text="", log_id=None, timestamp=None, phash=None, duplicate_of=None,
+                    content_hash=None, thumbnail=False):
     """
     Save screenshot metadata to database.
 
     Args:
-        file_path (str): Path to the screenshot file
-        extracted_text (str): OCR-extracted text from the screenshot
+        file_path (str): Path to the screenshot file (or its thumbnail). Empty or None
+            when the frame was OCR'd in memory and no image was kept; stored as "".
+        extracted_text (str): OCR-extracted text from the screenshot (stored once per
+            distinct text in ocr_texts)
         log_id (int, optional): ID of related activity log entry
-        timestamp (str, optional): Custom timestamp (ISO format) for demo mode
+        timestamp (str, optional): Custom timestamp (ISO format, naive = local time) for demo mode
+        phash (str, optional): Perceptual hash of the frame (hex)
+        duplicate_of (int, optional): ID of an earlier screenshot showing the same screen.
+            The row is not OCR'd and reads resolve its text from that screenshot.
+        content_hash (str, optional): Exact hash of the frame's pixels
+        thumbnail (bool): file_path is a downscaled preview, too small to OCR; the
+            frame's text only comes from the in-memory OCR
+
+    Returns:
+        int: ID of the inserted screenshot row
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    if timestamp:
-        # Custom timestamp (for demo mode)
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+
+        # Rows without a file on disk keep the NOT NULL column as an empty string
+        file_path = file_path or ""
+
+        # Custom timestamp (for demo mode), otherwise now; the rollup needs the value either way
+        timestamp = to_db_timestamp(timestamp) if timestamp else utc_timestamp()
+        cursor.execute(
+            "INSERT INTO screenshots (file_path, text_id, log_id, timestamp, phash, duplicate_of, content_hash, "
+            "thumbnail) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_path, _get_text_id(cursor, extracted_text, db_path), log_id, timestamp, phash, duplicate_of,
+             content_hash, int(thumbnail))
+        )
+        screenshot_id = cursor.lastrowid
+
+        _update_daily_rollup(cursor, timestamp)
+        _update_session(cursor, timestamp)
+    return screenshot_id
+
+
+def _local_day(timestamp):
+    """Local calendar date (YYYY-MM-DD) of a stored UTC timestamp."""
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).astimezone().date().isoformat()
+
+
+def _active_seconds(timestamps, pauses=()):
+    """
+    Sum the gaps between consecutive screenshots that are short enough to count as work.
+
+    Args:
+        timestamps (list): Stored timestamps in ascending order
+        pauses (list): Stored start timestamps of pauses, in ascending order; a gap
+            in which a pause started doesn't count
+
+    Returns:
+        float: Active seconds
+    """
+    times = [datetime.fromisoformat(ts) for ts in timestamps]
+
+    # Screenshots are taken every 10 seconds during active work, backing off while idle
+    # (never beyond MAX_GAP_SECONDS, so a longer gap means the tracker was not running)
+    active_seconds = 0
+    for i in range(len(times) - 1):
+        gap_seconds = (times[i+1] - times[i]).total_seconds()
+        paused = any(timestamps[i] <= pause < timestamps[i+1] for pause in pauses)
+
+        if gap_seconds <= MAX_GAP_SECONDS and not paused:
+            # Active period - count the gap as work time
+            active_seconds += gap_seconds
+        # else: Idle period (break, lunch, stepped away, paused) - don't count
+    return active_seconds
+
+
+def _gap_break(cursor, previous, timestamp):
+    """
+    Why the gap between two consecutive screenshots isn't work time: "day" (a new
+    local day started), "pause" (a P/R pause started in it) or "gap" (longer than
+    MAX_GAP_SECONDS). None if it counts. The same rule as _active_seconds,
+    get_daily_report and hours_engine, so sessions, rollups and reports agree.
+    """
+    if _local_day(previous) != _local_day(timestamp):
+        return "day"
+    cursor.execute(
+        "SELECT 1 FROM sessions WHERE paused = 1 AND timestamp >= ? AND timestamp < ? LIMIT 1", (previous, timestamp)
+    )
+    if cursor.fetchone() is not None:
+        return "pause"
+    if (datetime.fromisoformat(timestamp) - datetime.fromisoformat(previous)).total_seconds() > MAX_GAP_SECONDS:
+        return "gap"
+    return None
+
+
+def _update_daily_rollup(cursor, timestamp):
+    """
+    Fold one new screenshot into its day's rollup row.
+
+    A screenshot older than the day's latest one (e.g. demo data inserted out of
+    order) can't be folded in incrementally; the row is flagged and rebuilt from
+    the screenshots table on its next read.
+    """
+    day = _local_day(timestamp)
+    cursor.execute("SELECT last_timestamp, activity FROM daily_rollups WHERE day = ?", (day,))
+    row = cursor.fetchone()
+
+    if row is None:
         cursor.execute(
-            "INSERT INTO screenshots (file_path, extracted_text, log_id, timestamp) VALUES (?, ?, ?, ?)",
-            (file_path, extracted_text, log_id, timestamp)
+            "INSERT INTO daily_rollups (day, screenshot_count, active_seconds, first_timestamp, last_timestamp, "
+            "activity) VALUES (?, 1, 0, ?, ?, ?)",
+            (day, timestamp, timestamp, empty_bitmap())
+        )
+    elif timestamp >= row[0]:
+        added_seconds, activity = 0, row[1]
+        if _gap_break(cursor, row[0], timestamp) is None:
+            added_seconds = _active_seconds([row[0], timestamp])
+            activity = mark_active(row[1], minute_of_day(row[0]), minute_of_day(timestamp))
+        cursor.execute(
+            "UPDATE daily_rollups SET screenshot_count = screenshot_count + 1, "
+            "active_seconds = active_seconds + ?, last_timestamp = ?, activity = ? WHERE day = ?",
+            (added_seconds, timestamp, activity, day)
         )
     else:
-        # Auto timestamp (normal operation)
         cursor.execute(
-            "INSERT INTO screenshots (file_path, extracted_text, log_id) VALUES (?, ?, ?)",
-            (file_path, extracted_text, log_id)
+            "UPDATE daily_rollups SET screenshot_count = screenshot_count + 1, "
+            "first_timestamp = MIN(first_timestamp, ?), needs_rebuild = 1 WHERE day = ?",
+            (timestamp, day)
+        )
+
+
+def _update_session(cursor, timestamp):
+    """
+    Extend the latest work session with one new screenshot when the gap counts as
+    work (see _gap_break), or close it and open a new one. A session closed when
+    the tracker stopped is reopened if tracking resumes within the gap rule.
+
+    A screenshot older than the latest session's end (e.g. demo data inserted out
+    of order) flags its day's rollup; rebuilding the day re-derives its sessions.
+    """
+    cursor.execute(
+        "SELECT id, end_timestamp, closed_by FROM sessions WHERE paused = 0 ORDER BY timestamp DESC LIMIT 1"
+    )
+    row = cursor.fetchone()
+
+    if row is not None:
+        session_id, end, closed_by = row
+        if timestamp < end:
+            cursor.execute("UPDATE daily_rollups SET needs_rebuild = 1 WHERE day = ?", (_local_day(timestamp),))
+            return
+        reason = _gap_break(cursor, end, timestamp)
+        if reason is None:
+            cursor.execute(
+                "UPDATE sessions SET end_timestamp = ?, closed_by = NULL WHERE id = ?", (timestamp, session_id)
+            )
+            return
+        if closed_by is None:
+            cursor.execute("UPDATE sessions SET closed_by = ? WHERE id = ?", (reason, session_id))
+
+    cursor.execute(
+        "INSERT INTO sessions (timestamp, end_timestamp, source) VALUES (?, ?, 'screenshots')",
+        (timestamp, timestamp)
+    )
+
+
+def close_session(closed_by, db_path=None):
+    """
+    Close the open work session (and any open pause), e.g. at the end of work hours.
+
+    Args:
+        closed_by (str): Reason, e.g. "work_hours" or "stopped"
+        db_path (str, optional): Custom database path (defaults to standard path)
+    """
+    with transaction(db_path or get_db_path()) as conn:
+        conn.execute("UPDATE sessions SET closed_by = ? WHERE closed_by IS NULL", (closed_by,))
+
+
+def start_pause(db_path=None, timestamp=None):
+    """
+    Record the start of an explicit pause: closes the open work session and
+    opens a pause session.
+
+    Args:
+        db_path (str, optional): Custom database path (defaults to standard path)
+        timestamp (str, optional): Custom timestamp (ISO format, naive = local time) for demo mode
+
+    Returns:
+        int: ID of the pause's sessions row (pass to end_pause)
+    """
+    now = to_db_timestamp(timestamp) if timestamp else utc_timestamp()
+    with transaction(db_path or get_db_path()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE sessions SET closed_by = 'pause' WHERE closed_by IS NULL AND paused = 0")
+        cursor.execute(
+            "INSERT INTO sessions (timestamp, end_timestamp, source, paused) VALUES (?, ?, 'pause', 1)",
+            (now, now)
+        )
+        return cursor.lastrowid
+
+
+def end_pause(session_id, db_path=None, timestamp=None):
+    """
+    Record the end of a pause started with start_pause.
+
+    Args:
+        session_id (int): ID returned by start_pause
+        db_path (str, optional): Custom database path (defaults to standard path)
+        timestamp (str, optional): Custom timestamp (ISO format, naive = local time) for demo mode
+    """
+    with transaction(db_path or get_db_path()) as conn:
+        conn.execute(
+            "UPDATE sessions SET end_timestamp = ?, closed_by = 'resume' WHERE id = ?",
+            (to_db_timestamp(timestamp) if timestamp else utc_timestamp(), session_id)
+        )
+
+
+def _rebuild_day(cursor, day, timestamps):
+    """
+    Recompute one local day's rollup and work sessions from its screenshots
+    (stored UTC timestamps in order), splitting sessions at the day's pauses.
+    Close reasons recorded by the tracker ("stopped", "work_hours") are kept for
+    sessions that still end at the same screenshot.
+    """
+    from .hours_engine import hours_by_day, active_spans
+
+    bounds = local_day_bounds(day)
+    cursor.execute("SELECT timestamp FROM sessions WHERE paused = 1 AND timestamp >= ? AND timestamp < ?", bounds)
+    pauses = [timestamp for (timestamp,) in cursor.fetchall()]
+    cursor.execute(
+        "SELECT end_timestamp, closed_by FROM sessions WHERE paused = 0 AND timestamp >= ? AND timestamp < ?", bounds
+    )
+    recorded = dict(cursor.fetchall())
+
+    cursor.execute("DELETE FROM daily_rollups WHERE day = ?", (day.isoformat(),))
+    cursor.execute("DELETE FROM sessions WHERE paused = 0 AND timestamp >= ? AND timestamp < ?", bounds)
+    if not timestamps:
+        return
+
+    today = datetime.now().date()
+    sessions = []
+    for span_day, start, end, closed_by in active_spans(timestamps, pauses=pauses):
+        end = utc_timestamp(end)
+        # The latest session stays open only if it's today's (and wasn't closed by the tracker)
+        closed_by = closed_by or recorded.get(end) or (None if span_day == today else "day")
+        sessions.append((utc_timestamp(start), end, closed_by))
+    cursor.executemany(
+        "INSERT INTO sessions (timestamp, end_timestamp, source, closed_by) VALUES (?, ?, 'rebuild', ?)", sessions
+    )
+
+    totals = hours_by_day(timestamps, pauses=pauses, with_activity=True)[day]
+    cursor.execute(
+        "INSERT INTO daily_rollups (day, screenshot_count, active_seconds, first_timestamp, last_timestamp, "
+        "activity) VALUES (?, ?, ?, ?, ?, ?)",
+        (day.isoformat(), totals['screenshot_count'], totals['active_seconds'],
+         utc_timestamp(totals['first_epoch']), utc_timestamp(totals['last_epoch']), totals['activity'])
+    )
+
+
+def rebuild_daily_rollups(day=None, db_path=None):
+    """
+    Recompute daily rollups, and the work sessions they're made of, from the
+    screenshots table, one local day at a time. Pauses are kept, and split the
+    sessions they fall in.
+
+    Args:
+        day (date, optional): Local date to rebuild; rebuilds every day if None
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        int: Number of days with screenshots
+    """
+    from .migrations import backfill_by_day
+
+    if db_path is None:
+        db_path = get_db_path()
+
+    if day is not None:
+        with transaction(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp ASC",
+                local_day_bounds(day)
+            )
+            timestamps = [timestamp for (timestamp,) in cursor.fetchall()]
+            _rebuild_day(cursor, day, timestamps)
+        return 1 if timestamps else 0
+
+    # Each day commits on its own, so a long history doesn't hold the write lock
+    rebuilt = []
+
+    def apply_day(cursor, local_date, timestamps):
+        _rebuild_day(cursor, local_date, timestamps)
+        rebuilt.append(local_date)
+
+    backfill_by_day(get_connection(db_path), apply_day)
+
+    if rebuilt:
+        # Days before the oldest screenshot have expired (see retention); their rollups are the history
+        with transaction(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT day FROM daily_rollups WHERE day >= ?", (rebuilt[0].isoformat(),))
+            stale = [row[0] for row in cursor.fetchall() if date.fromisoformat(row[0]) not in rebuilt]
+            for stale_day in stale:
+                _rebuild_day(cursor, date.fromisoformat(stale_day), [])
+    return len(rebuilt)
+
+
+def get_daily_rollup(day=None, db_path=None):
+    """
+    Get a day's screenshot rollup with a single primary-key lookup.
+
+    Args:
+        day (date, optional): Local date (defaults to today)
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        dict: screenshot_count, active_seconds, first_timestamp, last_timestamp and
+            activity (per-minute bitmap, None for days rolled up before bitmaps
+            existed), or None if there are no screenshots that day
+    """
+    if db_path is None:
+        db_path = get_db_path()
+    day = day or datetime.now().date()
+
+    conn = get_connection(db_path)
+    query = (
+        "SELECT screenshot_count, active_seconds, first_timestamp, last_timestamp, activity, needs_rebuild "
+        "FROM daily_rollups WHERE day = ?"
+    )
+    row = conn.execute(query, (day.isoformat(),)).fetchone()
+
+    if row is not None and row[5]:
+        rebuild_daily_rollups(day, db_path)
+        row = conn.execute(query, (day.isoformat(),)).fetchone()
+
+    if row is None:
+        return None
+    return {
+        'screenshot_count': row[0],
+        'active_seconds': row[1],
+        'first_timestamp': row[2],
+        'last_timestamp': row[3],
+        'activity': row[4],
+    }
+
+
+def get_sessions(day=None, db_path=None):
+    """
+    Get a day's work sessions and pauses.
+
+    Args:
+        day (date, optional): Local date (defaults to today)
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        list: Dicts with start, end (UTC timestamps), seconds, source, paused and
+            closed_by (None while open), in time order
+    """
+    if db_path is None:
+        db_path = get_db_path()
+    day = day or datetime.now().date()
+
+    conn = get_connection(db_path)
+    flagged = conn.execute("SELECT needs_rebuild FROM daily_rollups WHERE day = ?", (day.isoformat(),)).fetchone()
+    if flagged and flagged[0]:
+        rebuild_daily_rollups(day, db_path)
+
+    rows = conn.execute(
+        "SELECT timestamp, end_timestamp, "
+        "ROUND((JULIANDAY(end_timestamp) - JULIANDAY(timestamp)) * 86400), source, paused, closed_by "
+        "FROM sessions WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+        local_day_bounds(day)
+    ).fetchall()
+    return [
+        {'start': start, 'end': end, 'seconds': int(seconds), 'source': source, 'paused': bool(paused),
+         'closed_by': closed_by}
+        for start, end, seconds, source, paused, closed_by in rows
+    ]
+
+
+def get_session_totals(day=None, db_path=None):
+    """
+    Sum a day's work sessions and pauses.
+
+    Returns:
+        dict: active_seconds, paused_seconds, sessions (count of work sessions)
+            and longest_session_seconds
+    """
+    sessions = get_sessions(day, db_path)
+    work = [session['seconds'] for session in sessions if not session['paused']]
+    return {
+        'active_seconds': sum(work),
+        'paused_seconds': sum(session['seconds'] for session in sessions if session['paused']),
+        'sessions': len(work),
+        'longest_session_seconds': max(work, default=0),
+    }
+
+
+def get_daily_report(first_day, last_day, db_path=None):
+    """
+    Get per-day hours, screenshot counts and liveness pass rates for a range of days.
+
+    Computed by one query that returns a single aggregated row per day: each
+    screenshot is joined to its local day (bounds from local_day_bounds, so days
+    match the rest of the code) and LAG() OVER (PARTITION BY day ORDER BY
+    timestamp) gives the gaps summed into active time, with the same rule as
+    _gap_break: whole-second gaps of MAX_GAP_SECONDS or less in which no pause
+    started. Days are
+    partitioned by their position in the range, which sorts faster than the date
+    text. Days whose screenshots have expired (see retention) fall back to their
+    daily rollup. Pause time comes from the day's pause sessions.
+
+    Args:
+        first_day (date): First local day
+        last_day (date): Last local day (inclusive)
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        list: Dicts with day, active_seconds, screenshot_count, liveness_checks,
+            liveness_passed and paused_seconds, one per day with any activity, in day order
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    days = []
+    day = first_day
+    while day <= last_day:
+        days.append((day.isoformat(), *local_day_bounds(day)))
+        day += timedelta(days=1)
+
+    cursor = get_connection(db_path).cursor()
+    cursor.execute(
+        """
+        WITH days AS (
+            SELECT key AS n, json_extract(value, '$[0]') AS day, json_extract(value, '$[1]') AS start,
+                   json_extract(value, '$[2]') AS end
+            FROM json_each(:days)
+        ),
+        gaps AS (
+            SELECT d.day, s.timestamp,
+                   LAG(s.timestamp) OVER (PARTITION BY d.n ORDER BY s.timestamp) AS previous
+            FROM days d JOIN screenshots s ON s.timestamp >= d.start AND s.timestamp < d.end
+        ),
+        shots AS (
+            SELECT day, COUNT(*) AS screenshots,
+                   SUM(CASE WHEN strftime('%s', timestamp) - strftime('%s', previous) <= :max_gap
+                            AND NOT EXISTS (SELECT 1 FROM sessions p WHERE p.paused = 1
+                                            AND p.timestamp >= previous AND p.timestamp < gaps.timestamp)
+                       THEN strftime('%s', timestamp) - strftime('%s', previous) ELSE 0 END) AS active_seconds
+            FROM gaps GROUP BY day
+        ),
+        per_day AS (
+            SELECT d.day,
+                   COALESCE(sh.screenshots, 0) AS screenshots,
+                   sh.active_seconds,
+                   (SELECT COUNT(*) FROM liveness_checks
+                    WHERE timestamp >= d.start AND timestamp < d.end) AS checks,
+                   (SELECT SUM(face_detected) FROM liveness_checks
+                    WHERE timestamp >= d.start AND timestamp < d.end) AS passed,
+                   (SELECT SUM(strftime('%s', end_timestamp) - strftime('%s', timestamp)) FROM sessions
+                    WHERE paused = 1 AND timestamp >= d.start AND timestamp < d.end) AS paused_seconds,
+                   r.screenshot_count AS rollup_screenshots,
+                   r.active_seconds AS rollup_active_seconds
+            FROM days d LEFT JOIN shots sh ON sh.day = d.day LEFT JOIN daily_rollups r ON r.day = d.day
+        )
+        SELECT day,
+               CASE WHEN screenshots > 0 THEN active_seconds ELSE COALESCE(rollup_active_seconds, 0) END,
+               CASE WHEN screenshots > 0 THEN screenshots ELSE COALESCE(rollup_screenshots, 0) END,
+               checks,
+               COALESCE(passed, 0),
+               COALESCE(paused_seconds, 0)
+        FROM per_day
+        WHERE screenshots > 0 OR checks > 0 OR rollup_screenshots > 0 OR paused_seconds > 0
+        ORDER BY day
+        """,
+        {'max_gap': MAX_GAP_SECONDS, 'days': json.dumps(days)}
+    )
+    return [
+        {
+            'day': day,
+            'active_seconds': active_seconds,
+            'screenshot_count': screenshot_count,
+            'liveness_checks': checks,
+            'liveness_passed': passed,
+            'paused_seconds': paused_seconds,
+        }
+        for day, active_seconds, screenshot_count, checks, passed, paused_seconds in cursor.fetchall()
+    ]
+
+
+def update_screenshot_text(screenshot_id, extracted_text):
+    """
+    Store OCR text for a screenshot row that was saved before OCR finished.
+
+    Args:
+        screenshot_id (int): ID of the screenshot row
+        extracted_text (str): OCR-extracted text from the screenshot
+    """
+    db_path = get_db_path()
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE screenshots SET text_id = ? WHERE id = ?",
+            (_get_text_id(cursor, extracted_text, db_path), screenshot_id)
+        )
+
+
+def update_screenshot_texts(updates, db_path=None):
+    """
+    Store OCR text for many screenshot rows in a single transaction.
+
+    Args:
+        updates (list): List of (screenshot_id, extracted_text) tuples
+        db_path (str, optional): Custom database path (defaults to standard path)
+    """
+    if not updates:
+        return
+    if db_path is None:
+        db_path = get_db_path()
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "UPDATE screenshots SET text_id = ? WHERE id = ?",
+            [(_get_text_id(cursor, extracted_text, db_path), screenshot_id) for screenshot_id, extracted_text in updates]
         )
-    
-    conn.commit()
-    conn.close()
 
 
 def get_screenshots(limit=None, today_only=False, db_path=None):
@@ -104,91 +755,281 @@ def get_screenshots(limit=None, today_only=False, db_path=None):
         db_path (str, optional): Custom database path (defaults to standard path)
 
     Returns:
-        list: List of tuples containing screenshot data
+        list: List of tuples containing screenshot data. Rows marked as a duplicate
+            of an earlier screenshot carry that screenshot's extracted text.
     """
     if db_path is None:
         db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
+    select = (
+        f"SELECT s.id, s.file_path, s.timestamp, ocr_text(t.text) FROM screenshots s{_TEXT_JOIN} "
+    )
+
     if today_only:
-        # Filter to today's screenshots only
+        # Filter to today's screenshots only (local day, as an index range)
+        day_start, day_end = local_day_bounds()
         if limit:
             cursor.execute(
-                "SELECT id, file_path, timestamp, extracted_text FROM screenshots "
-                "WHERE DATE(timestamp) = DATE('now') "
-                "ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
+                select +
+                "WHERE s.timestamp >= ? AND s.timestamp < ? "
+                "ORDER BY s.timestamp DESC LIMIT ?",
+                (day_start, day_end, limit)
             )
         else:
             cursor.execute(
-                "SELECT id, file_path, timestamp, extracted_text FROM screenshots "
-                "WHERE DATE(timestamp) = DATE('now') "
-                "ORDER BY timestamp DESC"
+                select +
+                "WHERE s.timestamp >= ? AND s.timestamp < ? "
+                "ORDER BY s.timestamp DESC",
+                (day_start, day_end)
             )
     else:
         # All screenshots (original behavior)
         if limit:
-            cursor.execute(
-                "SELECT id, file_path, timestamp, extracted_text FROM screenshots ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
-            )
+            cursor.execute(select + "ORDER BY s.timestamp DESC LIMIT ?", (limit,))
         else:
-            cursor.execute(
-                "SELECT id, file_path, timestamp, extracted_text FROM screenshots ORDER BY timestamp DESC"
-            )
+            cursor.execute(select + "ORDER BY s.timestamp DESC")
 
     results = cursor.fetchall()
-    conn.close()
     return results
 
 
-def calculate_hours_worked_today(db_path=None):
+def _screenshot_filters(start, end, today_only, has_text, include_static, has_file):
+    """Build the WHERE clause and parameters shared by iter_screenshots and count_screenshots."""
+    if today_only:
+        start, end = local_day_bounds()
+
+    conditions = []
+    params = []
+    if start:
+        conditions.append("s.timestamp >= ?")
+        params.append(start)
+    if end:
+        conditions.append("s.timestamp < ?")
+        params.append(end)
+    if has_text:
+        # Empty text is never stored in ocr_texts
+        conditions.append(f"{_TEXT_ID} IS NOT NULL")
+    if not include_static:
+        conditions.append("s.duplicate_of IS NULL")
+    if has_file:
+        conditions.append("s.file_path != ''")
+
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+
+def iter_screenshots(columns=("id", "file_path", "timestamp", "extracted_text"), start=None, end=None,
+                     today_only=False, has_text=False, include_static=True, has_file=False,
+                     newest_first=False, batch_size=SCREENSHOT_FETCH_BATCH, db_path=None):
     """
-    Calculate total hours worked today based on screenshot timestamps.
-    Assumes screenshots are taken at regular intervals during active work.
+    Stream screenshots in timestamp order without loading them all into memory.
+
+    Rows are fetched in batches of batch_size, and only the requested columns are
+    read, so a pass over timestamps or file paths never touches the OCR text.
+
+    Args:
+        columns (tuple): Names from SCREENSHOT_COLUMNS, in the order to yield them
+        start (str, optional): Earliest stored timestamp to include (UTC)
+        end (str, optional): Stored timestamp to stop before (UTC, exclusive)
+        today_only (bool): Only today's screenshots (overrides start/end)
+        has_text (bool): Only screenshots with non-empty text (own or duplicated)
+        include_static (bool): Include frames marked as duplicates of an earlier one
+        has_file (bool): Only screenshots with an image on disk
+        newest_first (bool): Yield in descending timestamp order
+        batch_size (int): Rows per fetchmany()
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Yields:
+        tuple: One value per requested column
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    unknown = set(columns) - set(SCREENSHOT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown screenshot columns: {', '.join(sorted(unknown))}")
+
+    where, params = _screenshot_filters(start, end, today_only, has_text, include_static, has_file)
+    select = ", ".join(SCREENSHOT_COLUMNS[column] for column in columns)
+    # The joins are only needed to resolve (duplicate frames') text
+    join = ""
+    if {"extracted_text", "text_id"} & set(columns) or has_text:
+        join = _TEXT_JOIN
+
+    cursor = get_connection(db_path).cursor()
+    cursor.arraysize = batch_size
+    cursor.execute(
+        f"SELECT {select} FROM screenshots s{join}{where} "
+        f"ORDER BY s.timestamp {'DESC' if newest_first else 'ASC'}, s.id {'DESC' if newest_first else 'ASC'}",
+        params
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def count_screenshots(start=None, end=None, today_only=False, has_text=False, include_static=True,
+                      has_file=False, db_path=None):
+    """
+    Count screenshots matching the same filters as iter_screenshots.
 
     Returns:
-        int: Number of hours worked (rounded)
+        int: Number of matching screenshots
     """
     if db_path is None:
         db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    # Get all screenshots from today using DATE comparison (works with any timestamp format)
-    cursor.execute("""
-        SELECT timestamp FROM screenshots
-        WHERE DATE(timestamp) = DATE('now')
-        ORDER BY timestamp ASC
-    """)
+    where, params = _screenshot_filters(start, end, today_only, has_text, include_static, has_file)
+    join = " LEFT JOIN screenshots src ON src.id = s.duplicate_of" if has_text else ""
+    cursor = get_connection(db_path).cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM screenshots s{join}{where}", params)
+    return cursor.fetchone()[0]
 
-    timestamps = cursor.fetchall()
-    conn.close()
 
-    if not timestamps or len(timestamps) < 2:
-        return 0
+def iter_text_occurrences(start=None, end=None, today_only=False, include_static=True, db_path=None):
+    """
+    Stream each distinct OCR text once, with how many screenshots showed it.
 
-    # Parse timestamps
-    times = [datetime.fromisoformat(ts[0]) for ts in timestamps]
+    Analyzers use this to process a text once and weight it by its count instead
+    of re-reading it for every frame it appeared on.
 
-    # FIXED: Calculate based on screenshot frequency, not time span
-    # Screenshots are taken every 10 seconds during active work
-    # Count gaps between screenshots to determine active vs idle periods
+    Args:
+        start (str, optional): Earliest stored timestamp to include (UTC)
+        end (str, optional): Stored timestamp to stop before (UTC, exclusive)
+        today_only (bool): Only today's screenshots (overrides start/end)
+        include_static (bool): Count frames marked as duplicates of an earlier one
+        db_path (str, optional): Custom database path (defaults to standard path)
 
-    active_seconds = 0
-    MAX_GAP_SECONDS = 60  # If gap > 60 seconds, consider it idle time (missed screenshots)
+    Yields:
+        tuple: (text, count, static_count, first_timestamp, last_timestamp), in
+            order of first appearance
+    """
+    if db_path is None:
+        db_path = get_db_path()
 
-    for i in range(len(times) - 1):
-        gap_seconds = (times[i+1] - times[i]).total_seconds()
+    where, params = _screenshot_filters(start, end, today_only, True, include_static, False)
+    cursor = get_connection(db_path).cursor()
+    cursor.arraysize = SCREENSHOT_FETCH_BATCH
+    cursor.execute(
+        "SELECT ocr_text(t.text), COUNT(*), SUM(s.duplicate_of IS NOT NULL), MIN(s.timestamp), MAX(s.timestamp) "
+        f"FROM screenshots s{_TEXT_JOIN}{where} GROUP BY t.id ORDER BY MIN(s.timestamp), t.id",
+        params
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 query matching every term (quoted, so punctuation is literal)."""
+    terms = text.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_screenshots(query, since=None, until=None, limit=20, raw=False, highlight=("[", "]"), db_path=None):
+    """
+    Full-text search over screenshot OCR text, best matches first.
+    Each distinct text is one hit, with when and how often it was on screen.
+
+    Args:
+        query (str): Words that must all appear (or an FTS5 query if raw=True)
+        since (str, optional): Earliest stored timestamp to include (UTC)
+        until (str, optional): Stored timestamp to stop before (UTC, exclusive)
+        limit (int): Maximum number of hits (distinct texts)
+        raw (bool): Pass query to FTS5 unchanged (phrases, OR, NEAR, prefix*)
+        highlight (tuple): Markers placed before and after matched terms in the snippet
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        list: (text_id, last_seen, snippet, score, seen) tuples, where last_seen is the
+            latest screenshot timestamp in range and seen the number of screenshots;
+            lower score ranks higher (bm25)
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    match = query if raw else _fts_query(query)
+    if not match:
+        return []
+
+    in_range = ""
+    range_params = []
+    if since:
+        in_range += " AND timestamp >= ?"
+        range_params.append(since)
+    if until:
+        in_range += " AND timestamp < ?"
+        range_params.append(until)
+
+    sync_text_index(db_path)
+
+    # Per-hit lookups on the (text_id, timestamp) index
+    sightings = f"FROM screenshots WHERE text_id = ocr_texts_fts.rowid{in_range}"
+    cursor = get_connection(db_path).cursor()
+    cursor.execute(
+        f"SELECT ocr_texts_fts.rowid, (SELECT MAX(timestamp) {sightings}) AS last_seen, "
+        "snippet(ocr_texts_fts, 0, ?, ?, '…', 12), bm25(ocr_texts_fts) AS score, "
+        f"(SELECT COUNT(*) {sightings}) AS seen "
+        "FROM ocr_texts_fts WHERE ocr_texts_fts MATCH ? AND last_seen IS NOT NULL ORDER BY score LIMIT ?",
+        (*range_params, *highlight, *range_params, match, limit)
+    )
+    return cursor.fetchall()
+
+
+def get_screenshots_pending_ocr(db_path=None):
+    """
+    Get screenshots that still need OCR.
+
+    Duplicate frames are skipped since their text comes from the screenshot they duplicate,
+    as are rows with no image on disk (nothing left to OCR) and rows that only kept a
+    thumbnail (OCR of a preview would store garbled text as the frame's).
+
+    Args:
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        list: List of (id, file_path) tuples
+    """
+    if db_path is None:
+        db_path = get_db_path()
+    conn = get_connection(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, file_path FROM screenshots "
+        "WHERE duplicate_of IS NULL AND file_path != '' AND thumbnail = 0 "
+        "AND text_id IS NULL "
+        "ORDER BY timestamp ASC"
+    )
+    results = cursor.fetchall()
+    return results
 
-        if gap_seconds <= MAX_GAP_SECONDS:
-            # Active period - count the gap as work time
-            active_seconds += gap_seconds
-        # else: Idle period (break, lunch, stepped away) - don't count
 
-    # Convert to hours
-    hours_worked = active_seconds / 3600
+def calculate_hours_worked_today(db_path=None):
+    """
+    Calculate total hours worked today based on screenshot timestamps.
+    Assumes screenshots are taken at most MAX_GAP_SECONDS apart during active work.
+
+    Sums today's work sessions, which save_screenshot opens and extends as
+    screenshots arrive, instead of re-walking the day's screenshots.
+
+    Returns:
+        int: Number of hours worked (rounded)
+    """
+    # FIXED: Calculate based on screenshot frequency, not time span
+    # (gaps longer than MAX_GAP_SECONDS end a session and are not counted)
+    hours_worked = get_session_totals(db_path=db_path)['active_seconds'] / 3600
 
     # Return actual hours (round to 1 decimal place for readability)
     return round(hours_worked, 1)
@@ -206,24 +1047,21 @@ def save_liveness_check(face_detected, confidence, face_count, error=None, times
         timestamp (str, optional): Custom timestamp (ISO format)
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
 
-    if timestamp:
-        cursor.execute(
-            "INSERT INTO liveness_checks (face_detected, confidence, face_count, error, timestamp) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (face_detected, confidence, face_count, error, timestamp)
-        )
-    else:
-        cursor.execute(
-            "INSERT INTO liveness_checks (face_detected, confidence, face_count, error) "
-            "VALUES (?, ?, ?, ?)",
-            (face_detected, confidence, face_count, error)
-        )
-
-    conn.commit()
-    conn.close()
+        if timestamp:
+            cursor.execute(
+                "INSERT INTO liveness_checks (face_detected, confidence, face_count, error, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (face_detected, confidence, face_count, error, to_db_timestamp(timestamp))
+            )
+        else:
+            cursor.execute(
+                "INSERT INTO liveness_checks (face_detected, confidence, face_count, error) "
+                "VALUES (?, ?, ?, ?)",
+                (face_detected, confidence, face_count, error)
+            )
 
 
 def get_liveness_checks_today(db_path=None):
@@ -239,16 +1077,15 @@ def get_liveness_checks_today(db_path=None):
     if db_path is None:
         db_path = get_db_path()
 
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
         SELECT timestamp, face_detected, confidence, face_count, error
         FROM liveness_checks
-        WHERE DATE(timestamp) = DATE('now')
+        WHERE timestamp >= ? AND timestamp < ?
         ORDER BY timestamp ASC
-    """)
+    """, local_day_bounds())
 
     results = cursor.fetchall()
-    conn.close()
     return results
@@ -2,31 +2,34 @@
 Database cleanup utilities - deletes all data after summary generation.
 """
 
-import sqlite3
 import os
-from .database import get_db_path
+from .database import get_db_path, sync_text_index
+from .db_connection import transaction, close_connection
 
 
 def clear_all_database_data():
     """
-    Delete all logs and screenshots from database.
-    Called after summary is generated and sent.
+    Delete all logs, screenshots and cached OCR results from database.
+    A full reset; the daily flow keeps history and expires old days instead
+    (see retention.apply_retention).
     """
     try:
         db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Delete all screenshots
-        cursor.execute("DELETE FROM screenshots")
-        screenshots_deleted = cursor.rowcount
-
-        # Delete all logs
-        cursor.execute("DELETE FROM logs")
-        logs_deleted = cursor.rowcount
-
-        conn.commit()
-        conn.close()
+        with transaction(db_path) as conn:
+            cursor = conn.cursor()
+
+            # Delete all screenshots (their OCR texts go with them, see the refcount triggers)
+            cursor.execute("DELETE FROM screenshots")
+            screenshots_deleted = cursor.rowcount
+
+            # Delete all logs
+            cursor.execute("DELETE FROM logs")
+            logs_deleted = cursor.rowcount
+            cursor.execute("DELETE FROM window_titles")
+            cursor.execute("DELETE FROM daily_rollups")
+            cursor.execute("DELETE FROM sessions")
+            cursor.execute("DELETE FROM ocr_cache")
+            sync_text_index(db_path)
 
         print(f"🗑️  Database cleaned: {logs_deleted} logs, {screenshots_deleted} screenshots deleted")
 
@@ -43,7 +46,12 @@ def delete_database_file():
 
     if os.path.exists(db_path):
         try:
+            close_connection(db_path)
             os.remove(db_path)
+            # WAL mode leaves these beside the database file
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
             print(f"✅ Database file deleted: {db_path}")
         except Exception as e:
             print(f"❌ Error deleting database file: {e}")
@@ -0,0 +1,123 @@
+"""
+SQLite connection management.
+Each thread keeps one open connection per database file instead of connecting for
+every statement. Connections run in WAL mode with synchronous=NORMAL, so the
+tracker's frequent small commits don't fsync the whole journal and the dashboards
+can read while the tracker writes. Statements are cached per connection, so
+repeated queries are prepared once. Each connection also gets the ocr_text() SQL
+function that decodes stored (possibly compressed) OCR text.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+BUSY_TIMEOUT_SECONDS = 10  # how long to wait on a lock held by another connection
+CACHED_STATEMENTS = 256  # prepared statements kept per connection
+
+_local = threading.local()
+
+
+def _open_connection(db_path):
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS, cached_statements=CACHED_STATEMENTS)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.Error:
+        # e.g. a filesystem without shared memory support; stay on the rollback journal
+        pass
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}")
+
+    from .text_compression import decompress_text
+    conn.create_function("ocr_text", 1, partial(decompress_text, db_path=db_path), deterministic=True)
+    return conn
+
+
+def get_connection(db_path=None):
+    """
+    Get this thread's connection to a database, opening it on first use.
+
+    Args:
+        db_path (str, optional): Database file (defaults to the standard path)
+
+    Returns:
+        sqlite3.Connection: Reusable connection; callers must not close it
+    """
+    if db_path is None:
+        from .database import get_db_path
+        db_path = get_db_path()
+
+    # A forked worker process must not reuse its parent's connections
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+        _local.depths = {}
+
+    conn = _local.connections.get(db_path)
+    if conn is None:
+        conn = _open_connection(db_path)
+        _local.connections[db_path] = conn
+    return conn
+
+
+@contextmanager
+def transaction(db_path=None):
+    """
+    Run statements on this thread's connection as one transaction.
+    Commits when the block exits normally and rolls back if it raises.
+
+    Transactions nest: an inner block runs in a SAVEPOINT, so it rolls back only
+    its own statements on error and its work commits with the outermost block.
+
+    Args:
+        db_path (str, optional): Database file (defaults to the standard path)
+
+    Yields:
+        sqlite3.Connection: This thread's connection
+    """
+    conn = get_connection(db_path)
+    depth = _local.depths.get(conn, 0)
+    _local.depths[conn] = depth + 1
+    try:
+        if depth:
+            savepoint = f"nested_{depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield conn
+                conn.execute(f"RELEASE {savepoint}")
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+                raise
+        else:
+            # Begin explicitly: a savepoint opened before the first write would otherwise
+            # be the outermost transaction and commit on release
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    finally:
+        _local.depths[conn] = depth
+
+
+def close_connection(db_path=None):
+    """
+    Close this thread's connection(s), e.g. before the database file is deleted.
+
+    Args:
+        db_path (str, optional): Database file to close; closes all of them if None
+    """
+    if getattr(_local, "pid", None) != os.getpid():
+        return
+
+    for path in [db_path] if db_path else list(_local.connections):
+        conn = _local.connections.pop(path, None)
+        if conn is not None:
+            _local.depths.pop(conn, None)
+            conn.close()
@@ -0,0 +1,101 @@
+"""
+Storage encoder for screenshots kept on disk.
+Encodes captured frames as PNG, or as smaller lossy WebP/JPEG, optionally
+downscaled and in grayscale, which is all OCR needs.
+"""
+
+import io
+from PIL import Image
+from .config import SCREENSHOT_FORMAT, SCREENSHOT_SCALE, SCREENSHOT_QUALITY, SCREENSHOT_GRAYSCALE
+
+FORMATS = {
+    'png': ('PNG', '.png'),
+    'webp': ('WEBP', '.webp'),
+    'jpeg': ('JPEG', '.jpg'),
+}
+
+
+class FrameEncoder:
+    """Encodes frames for storage with a fixed format, scale, quality and color mode."""
+
+    def __init__(self, fmt=SCREENSHOT_FORMAT, scale=SCREENSHOT_SCALE, quality=SCREENSHOT_QUALITY,
+                 grayscale=SCREENSHOT_GRAYSCALE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown screenshot format: {fmt} (expected one of {', '.join(FORMATS)})")
+        self.fmt = fmt
+        self.scale = scale
+        self.quality = quality
+        self.grayscale = grayscale
+
+    @property
+    def extension(self):
+        """File extension for encoded frames."""
+        return FORMATS[self.fmt][1]
+
+    def describe(self):
+        """Short label for these settings, e.g. "webp q60 x0.75 gray"."""
+        label = self.fmt if self.fmt == 'png' else f"{self.fmt} q{self.quality}"
+        if self.scale != 1.0:
+            label += f" x{self.scale:g}"
+        if self.grayscale:
+            label += " gray"
+        return label
+
+    def prepare(self, image):
+        """Apply color conversion and scaling before encoding."""
+        image = image.convert("L" if self.grayscale else "RGB")
+        if self.scale != 1.0:
+            width, height = image.size
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            image = image.resize(size, Image.LANCZOS)
+        return image
+
+    def encode(self, image):
+        """
+        Encode a frame.
+
+        Args:
+            image (PIL.Image.Image): Captured frame
+
+        Returns:
+            bytes: Encoded image file contents
+        """
+        buffer = io.BytesIO()
+        pil_format = FORMATS[self.fmt][0]
+        prepared = self.prepare(image)
+
+        if self.fmt == 'png':
+            prepared.save(buffer, pil_format, optimize=False)
+        elif self.fmt == 'webp':
+            prepared.save(buffer, pil_format, quality=self.quality, method=4)
+        else:
+            prepared.save(buffer, pil_format, quality=self.quality, optimize=True)
+
+        return buffer.getvalue()
+
+    def save(self, image, path_without_extension):
+        """
+        Encode a frame and write it to disk.
+
+        Args:
+            image (PIL.Image.Image): Captured frame
+            path_without_extension (str): Destination path; the format's extension is appended
+
+        Returns:
+            str: Path of the written file
+        """
+        path = f"{path_without_extension}{self.extension}"
+        with open(path, "wb") as f:
+            f.write(self.encode(image))
+        return path
+
+
+_default_encoder = None
+
+
+def get_frame_encoder():
+    """Get the encoder configured in config.py."""
+    global _default_encoder
+    if _default_encoder is None:
+        _default_encoder = FrameEncoder()
+    return _default_encoder
@@ -0,0 +1,212 @@
+"""
+Vectorized hours engine.
+Computes active time for many days (and many users) at once with NumPy: stored
+timestamps are parsed straight into int64 epoch seconds, gaps come from np.diff,
+and the MAX_GAP_SECONDS rule (no gap across a local day or a pause) is a boolean
+mask. Used to recompute history and for bulk reports; the tracker folds single
+screenshots into the daily rollups instead.
+
+Days and minutes are local wall-clock time. UTC offsets are looked up once per
+distinct quarter hour rather than per timestamp, which is exact across DST changes.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+from .config import MAX_GAP_SECONDS
+from .activity_bitmap import MINUTES_PER_DAY
+
+OFFSET_BUCKET_SECONDS = 15 * 60  # UTC offsets change on quarter hours at most
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def to_epoch_seconds(timestamps):
+    """
+    Parse stored UTC timestamps into epoch seconds.
+
+    Args:
+        timestamps (list): Stored "YYYY-MM-DD HH:MM:SS" UTC timestamps
+
+    Returns:
+        numpy.ndarray: int64 seconds since the Unix epoch
+    """
+    return np.asarray(timestamps, dtype="datetime64[s]").astype(np.int64)
+
+
+def active_seconds(epochs, max_gap=MAX_GAP_SECONDS):
+    """
+    Sum the gaps between consecutive screenshots that count as work.
+
+    Args:
+        epochs (numpy.ndarray): Epoch seconds in ascending order
+        max_gap (int): Longest gap counted as work
+
+    Returns:
+        int: Active seconds
+    """
+    gaps = np.diff(epochs)
+    return int(gaps[gaps <= max_gap].sum())
+
+
+def to_local_seconds(epochs):
+    """
+    Shift epoch seconds to local wall-clock seconds (still counted from 1970-01-01).
+
+    Args:
+        epochs (numpy.ndarray): int64 epoch seconds
+
+    Returns:
+        numpy.ndarray: int64 local seconds; // 86400 is the local day number
+    """
+    buckets, inverse = np.unique(epochs // OFFSET_BUCKET_SECONDS, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(bucket) * OFFSET_BUCKET_SECONDS, timezone.utc).astimezone().utcoffset()
+        .total_seconds()
+        for bucket in buckets
+    ], dtype=np.int64)
+    return epochs + offsets[inverse.reshape(-1)]
+
+
+def _as_epochs(timestamps):
+    """Stored UTC timestamps, or epoch seconds, as an int64 array of epoch seconds."""
+    epochs = np.asarray(timestamps)
+    if epochs.dtype.kind != "i":
+        epochs = to_epoch_seconds(timestamps)
+    return epochs
+
+
+def _paused_gaps(epochs, pauses):
+    """Mask of the gaps between consecutive (sorted) epochs in which a pause started."""
+    if pauses is None or len(pauses) == 0:
+        return np.zeros(max(epochs.size - 1, 0), dtype=bool)
+    pauses = np.sort(_as_epochs(pauses))
+    # First pause at or after each gap's start; the gap is paused if it starts before the gap ends
+    following = np.minimum(np.searchsorted(pauses, epochs[:-1], side="left"), pauses.size - 1)
+    return (pauses[following] >= epochs[:-1]) & (pauses[following] < epochs[1:])
+
+
+def hours_by_day(timestamps, users=None, max_gap=MAX_GAP_SECONDS, with_activity=False, pauses=None):
+    """
+    Compute active time per local day (and per user) in one vectorized pass.
+
+    Args:
+        timestamps (list or numpy.ndarray): Stored UTC timestamps, or epoch seconds,
+            in any order
+        users (list, optional): A user key per timestamp, to compute many users at once
+        max_gap (int): Longest gap counted as work
+        with_activity (bool): Also build each day's per-minute activity bitmap
+        pauses (list, optional): Start times of pauses (stored UTC timestamps or
+            epoch seconds) of a single user's timestamps; a gap in which a pause
+            started isn't counted
+
+    Returns:
+        dict: (user, day) -> dict with screenshot_count, active_seconds, first_epoch,
+            last_epoch and, if with_activity, activity. Keys are plain dates when
+            users is None.
+    """
+    epochs = _as_epochs(timestamps)
+    if epochs.size == 0:
+        return {}
+
+    local = to_local_seconds(epochs)
+    day_number = local // 86400
+    first_day = int(day_number.min())
+    day_count = int(day_number.max()) - first_day + 1
+
+    if users is None:
+        user_index, user_keys = np.zeros(epochs.size, dtype=np.int64), [None]
+    else:
+        positions = {}
+        user_index = np.fromiter((positions.setdefault(user, len(positions)) for user in users),
+                                 dtype=np.int64, count=epochs.size)
+        user_keys = list(positions)
+
+    # One group per (user, day), timestamps sorted within each group
+    group = user_index * day_count + (day_number - first_day)
+    order = np.lexsort((epochs, group))
+    group, epochs, local = group[order], epochs[order], local[order]
+
+    # A gap counts when it's within one group, short enough and not paused
+    gaps = np.diff(epochs)
+    counted = (group[1:] == group[:-1]) & (gaps <= max_gap) & ~_paused_gaps(epochs, pauses)
+
+    group_ids, first = np.unique(group, return_index=True)
+    last = np.append(first[1:], group.size) - 1
+    gap_seconds = np.zeros(group.size, dtype=np.int64)
+    gap_seconds[1:] = np.where(counted, gaps, 0)
+    seconds = np.add.reduceat(gap_seconds, first)
+
+    if with_activity:
+        activity = _activity_bitmaps(local, group, counted, group_ids)
+
+    result = {}
+    for position, group_id in enumerate(group_ids):
+        user, day = divmod(int(group_id), day_count)
+        day = EPOCH_DATE + timedelta(days=first_day + day)
+        key = day if users is None else (user_keys[user], day)
+        result[key] = {
+            'screenshot_count': int(last[position] - first[position] + 1),
+            'active_seconds': int(seconds[position]),
+            'first_epoch': int(epochs[first[position]]),
+            'last_epoch': int(epochs[last[position]]),
+        }
+        if with_activity:
+            result[key]['activity'] = activity[position]
+    return result
+
+
+def _activity_bitmaps(local, group, counted, group_ids):
+    """
+    Per-minute activity bitmaps (see activity_bitmap) for each group, marking the
+    minutes from one screenshot to the next for every counted gap.
+    """
+    minute = (local % 86400) // 60
+    row = np.searchsorted(group_ids, group)
+
+    # A gap that goes back on the wall clock (DST ending) marks nothing, as in mark_active
+    counted = counted & (minute[1:] >= minute[:-1])
+
+    # Coverage counts via a difference array over every group's minutes
+    begin = row[1:][counted] * MINUTES_PER_DAY + minute[:-1][counted]
+    end = row[1:][counted] * MINUTES_PER_DAY + minute[1:][counted] + 1
+    coverage = np.zeros(group_ids.size * MINUTES_PER_DAY + 1, dtype=np.int64)
+    np.add.at(coverage, begin, 1)
+    np.add.at(coverage, end, -1)
+    active = np.cumsum(coverage[:-1]).reshape(group_ids.size, MINUTES_PER_DAY) > 0
+
+    packed = np.packbits(active, axis=1, bitorder="little")
+    return [bytes(bitmap) for bitmap in packed]
+
+
+def active_spans(timestamps, max_gap=MAX_GAP_SECONDS, pauses=None):
+    """
+    Split screenshots into work sessions: runs of screenshots no more than max_gap
+    apart within one local day, with no pause started in between.
+
+    Args:
+        timestamps (list or numpy.ndarray): Stored UTC timestamps, or epoch seconds
+        max_gap (int): Longest gap inside a session
+        pauses (list, optional): Start times of pauses (stored UTC timestamps or
+            epoch seconds)
+
+    Returns:
+        list: (local day, start epoch, end epoch, closed_by) tuples in time order;
+            closed_by is "day", "pause" or "gap", and None for the last session
+    """
+    epochs = _as_epochs(timestamps)
+    if epochs.size == 0:
+        return []
+    epochs = np.sort(epochs)
+
+    day_number = to_local_seconds(epochs) // 86400
+    new_day = day_number[1:] != day_number[:-1]
+    paused = _paused_gaps(epochs, pauses)
+    breaks = np.flatnonzero((np.diff(epochs) > max_gap) | new_day | paused)
+    starts = np.append(0, breaks + 1)
+    ends = np.append(breaks, epochs.size - 1)
+    reasons = np.where(new_day, "day", np.where(paused, "pause", "gap"))[breaks].tolist()
+
+    spans = []
+    for start, end, closed_by in zip(starts.tolist(), ends.tolist(), reasons + [None]):
+        day = EPOCH_DATE + timedelta(days=int(day_number[start]))
+        spans.append((day, int(epochs[start]), int(epochs[end]), closed_by))
+    return spans
@@ -0,0 +1,673 @@
+"""
+Schema migrations for the activity database.
+The schema version is kept in SQLite's PRAGMA user_version. Each migration brings
+the database from the previous version to its own; steps are idempotent, so a
+database created by an older release (user_version 0 with some tables already
+present) is upgraded by running every step from the start. Steps that rewrite
+existing rows do so in chunks, committing between chunks so the tracker and
+dashboards can keep writing and reading during a long upgrade.
+
+A released step is never changed: a later schema change is a new version. Schema
+steps are frozen SQL, but some backfills reuse application code rather than
+carrying their own copy of it: the rollup, activity bitmap and session backfills
+run hours_engine (and database.local_day_bounds), and moving text to ocr_texts
+uses database.text_hash and text_compression. That code has to keep working on
+the schema those versions leave behind, and a change to its results (the gap
+rule, the text hash, the compressed format) needs a new version that rewrites
+the affected rows, since databases past the old version never re-run it.
+"""
+
+from datetime import date, datetime, timezone
+from .db_connection import get_connection
+
+MIGRATION_CHUNK_SIZE = 5000  # rows rewritten per transaction by data backfills
+
+
+def _add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table if an older database doesn't have it yet."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def backfill_in_chunks(conn, select_sql, apply_chunk, chunk_size=MIGRATION_CHUNK_SIZE, params=()):
+    """
+    Rewrite rows in id order, one committed transaction per chunk.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        select_sql (str): Query with placeholders "id > ?" first and "LIMIT ?" last, that
+            returns rows still needing the backfill with the id as first column
+        apply_chunk (callable): Called with (cursor, rows) to update one chunk
+        chunk_size (int): Rows per chunk
+        params (tuple): Values for any placeholders between those two
+
+    Returns:
+        int: Number of rows processed
+    """
+    last_id = 0
+    processed = 0
+    while True:
+        rows = conn.execute(select_sql, (last_id, *params, chunk_size)).fetchall()
+        if not rows:
+            return processed
+
+        cursor = conn.cursor()
+        apply_chunk(cursor, rows)
+        conn.commit()
+
+        last_id = rows[-1][0]
+        processed += len(rows)
+
+
+def _create_base_tables(cursor):
+    """Version 1: the tables of the first release."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            window_name TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS screenshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            extracted_text TEXT,
+            log_id INTEGER,
+            FOREIGN KEY (log_id) REFERENCES logs(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS liveness_checks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            face_detected BOOLEAN NOT NULL,
+            confidence REAL NOT NULL,
+            face_count INTEGER NOT NULL,
+            error TEXT
+        )
+    """)
+
+
+def _add_screenshot_hashes(cursor):
+    """Version 2: perceptual and content hashes, duplicate-frame pointer."""
+    _add_column_if_missing(cursor, "screenshots", "phash", "TEXT")
+    _add_column_if_missing(cursor, "screenshots", "duplicate_of", "INTEGER REFERENCES screenshots(id)")
+    _add_column_if_missing(cursor, "screenshots", "content_hash", "TEXT")
+
+
+def _add_window_spans(cursor):
+    """Version 3: dictionary-encoded window titles and (start, end) spans in logs."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS window_titles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL UNIQUE
+        )
+    """)
+    # timestamp is the span start; rows from older versions are single samples
+    # with window_name set and no title_id/end_timestamp
+    _add_column_if_missing(cursor, "logs", "title_id", "INTEGER REFERENCES window_titles(id)")
+    _add_column_if_missing(cursor, "logs", "end_timestamp", "DATETIME")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_title_span ON logs (title_id, timestamp, end_timestamp)")
+
+
+def _add_timestamp_indexes(cursor):
+    """Version 4: indexes for day-range queries."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_screenshots_timestamp ON screenshots (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_liveness_checks_timestamp ON liveness_checks (timestamp)")
+
+
+def _normalize_timestamps(conn, table, column="timestamp"):
+    """
+    Rewrite a table's demo-mode timestamps (local ISO strings such as
+    "2025-01-01T09:30:00.123456") in the stored UTC "YYYY-MM-DD HH:MM:SS" format,
+    so they sort and range-compare with the rest.
+    """
+    def to_utc(value):
+        # astimezone() treats a naive datetime as local time
+        return datetime.fromisoformat(value).astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    def apply_chunk(cursor, rows):
+        cursor.executemany(
+            f"UPDATE {table} SET {column} = ? WHERE id = ?",
+            [(to_utc(timestamp), row_id) for row_id, timestamp in rows]
+        )
+
+    backfill_in_chunks(
+        conn,
+        f"SELECT id, {column} FROM {table} WHERE id > ? AND {column} LIKE '%T%' ORDER BY id LIMIT ?",
+        apply_chunk
+    )
+
+
+def _normalize_screenshot_timestamps(conn, db_path):
+    """Version 4 backfill: screenshot timestamps in the stored format (see _normalize_timestamps)."""
+    _normalize_timestamps(conn, "screenshots")
+
+
+def _create_daily_rollups(cursor):
+    """Version 5: per-day screenshot totals (day is the local date)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            day TEXT PRIMARY KEY,
+            screenshot_count INTEGER NOT NULL,
+            active_seconds REAL NOT NULL,
+            first_timestamp DATETIME NOT NULL,
+            last_timestamp DATETIME NOT NULL,
+            needs_rebuild INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _create_text_search_index(cursor):
+    """
+    Version 6: FTS5 full-text index over screenshot OCR text.
+    An external-content table (the text lives only in screenshots) kept in sync by triggers,
+    so every write path - capture, background OCR, backfill, cleanup - updates it.
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS screenshots_fts USING fts5(
+            extracted_text,
+            content='screenshots',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_fts_insert AFTER INSERT ON screenshots BEGIN
+            INSERT INTO screenshots_fts (rowid, extracted_text) VALUES (new.id, new.extracted_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_fts_delete AFTER DELETE ON screenshots BEGIN
+            INSERT INTO screenshots_fts (screenshots_fts, rowid, extracted_text)
+            VALUES ('delete', old.id, old.extracted_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_fts_update AFTER UPDATE OF extracted_text ON screenshots BEGIN
+            INSERT INTO screenshots_fts (screenshots_fts, rowid, extracted_text)
+            VALUES ('delete', old.id, old.extracted_text);
+            INSERT INTO screenshots_fts (rowid, extracted_text) VALUES (new.id, new.extracted_text);
+        END
+    """)
+
+
+def _backfill_text_search_index(conn, db_path):
+    """
+    Version 6 backfill: index screenshots saved before the triggers existed.
+    Rows already in the index (its docsize table has one row per indexed id) are
+    skipped, so rows indexed by the triggers during the backfill aren't added twice.
+    """
+    def apply_chunk(cursor, rows):
+        cursor.executemany(
+            "INSERT INTO screenshots_fts (rowid, extracted_text) VALUES (?, ?)",
+            rows
+        )
+
+    backfill_in_chunks(
+        conn,
+        "SELECT id, extracted_text FROM screenshots WHERE id > ? "
+        "AND id NOT IN (SELECT id FROM screenshots_fts_docsize) ORDER BY id LIMIT ?",
+        apply_chunk
+    )
+
+
+def _add_text_compression(cursor):
+    """
+    Version 7: compressed OCR text. Adds the dictionary table and points the search
+    index at a view that decodes the text (ocr_text() is registered on every
+    connection), so snippets and the sync triggers see plain text. Stored text is
+    compressed when version 8 moves it into ocr_texts.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS text_dictionaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codec TEXT NOT NULL,
+            dictionary BLOB NOT NULL,
+            sample_count INTEGER NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # An FTS5 table's content source can't be changed in place; rebuild it over the view
+    for trigger in ("screenshots_fts_insert", "screenshots_fts_delete", "screenshots_fts_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("DROP TABLE IF EXISTS screenshots_fts")
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS screenshots_text AS
+        SELECT id, ocr_text(extracted_text) AS extracted_text FROM screenshots
+    """)
+    cursor.execute("""
+        CREATE VIRTUAL TABLE screenshots_fts USING fts5(
+            extracted_text,
+            content='screenshots_text',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER screenshots_fts_insert AFTER INSERT ON screenshots BEGIN
+            INSERT INTO screenshots_fts (rowid, extracted_text) VALUES (new.id, ocr_text(new.extracted_text));
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER screenshots_fts_delete AFTER DELETE ON screenshots BEGIN
+            INSERT INTO screenshots_fts (screenshots_fts, rowid, extracted_text)
+            VALUES ('delete', old.id, ocr_text(old.extracted_text));
+        END
+    """)
+    # Re-encoding a row (compressing it, or with a newer dictionary) leaves its text unchanged
+    cursor.execute("""
+        CREATE TRIGGER screenshots_fts_update AFTER UPDATE OF extracted_text ON screenshots
+        WHEN ocr_text(old.extracted_text) IS NOT ocr_text(new.extracted_text) BEGIN
+            INSERT INTO screenshots_fts (screenshots_fts, rowid, extracted_text)
+            VALUES ('delete', old.id, ocr_text(old.extracted_text));
+            INSERT INTO screenshots_fts (rowid, extracted_text) VALUES (new.id, ocr_text(new.extracted_text));
+        END
+    """)
+
+
+def _compress_existing_text(conn, db_path):
+    """Version 7 backfill: re-index the search table, then train a dictionary and compress stored text."""
+    from .config import TEXT_COMPRESSION, TEXT_COMPRESSION_MIN_BYTES, TEXT_DICTIONARY_SAMPLES
+    from .text_compression import active_dictionary, train_text_dictionary, compress_text
+
+    _backfill_text_search_index(conn, db_path)
+    if not TEXT_COMPRESSION:
+        return
+
+    if active_dictionary(db_path) is None:
+        rows = conn.execute(
+            "SELECT extracted_text FROM screenshots "
+            "WHERE duplicate_of IS NULL AND extracted_text IS NOT NULL AND extracted_text != '' "
+            "ORDER BY id DESC LIMIT ?",
+            (TEXT_DICTIONARY_SAMPLES,)
+        ).fetchall()
+        train_text_dictionary(db_path, samples=list(dict.fromkeys(text for (text,) in rows if text.strip())))
+    dictionary_id = active_dictionary(db_path) or 0
+
+    def apply_chunk(cursor, rows):
+        cursor.executemany(
+            "UPDATE screenshots SET extracted_text = ? WHERE id = ?",
+            [(compress_text(text, db_path, dictionary_id), row_id) for row_id, text in rows]
+        )
+
+    backfill_in_chunks(
+        conn,
+        "SELECT id, extracted_text FROM screenshots WHERE id > ? "
+        "AND typeof(extracted_text) = 'text' AND length(extracted_text) >= ? ORDER BY id LIMIT ?",
+        apply_chunk,
+        params=(TEXT_COMPRESSION_MIN_BYTES,)
+    )
+
+
+def _add_text_table(cursor):
+    """
+    Version 8: content-addressed OCR text. Each distinct text is stored once in
+    ocr_texts, keyed by a hash of the text, and screenshots point to it by text_id.
+    Triggers keep each text's refcount (screenshots pointing at it) and delete a
+    text when its last screenshot goes. The search index moves to ocr_texts, so a
+    text seen on a thousand frames is indexed once. screenshots.extracted_text is
+    emptied by the backfill but kept, as older SQLite builds can't drop columns.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ocr_texts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hash TEXT NOT NULL UNIQUE,
+            text TEXT NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    _add_column_if_missing(cursor, "screenshots", "text_id", "INTEGER REFERENCES ocr_texts(id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_screenshots_text_id ON screenshots (text_id, timestamp)")
+
+    for trigger in ("screenshots_fts_insert", "screenshots_fts_delete", "screenshots_fts_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("DROP TABLE IF EXISTS screenshots_fts")
+    cursor.execute("DROP VIEW IF EXISTS screenshots_text")
+
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS ocr_texts_plain AS
+        SELECT id, ocr_text(text) AS text FROM ocr_texts
+    """)
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS ocr_texts_fts USING fts5(
+            text,
+            content='ocr_texts_plain',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ocr_texts_fts_insert AFTER INSERT ON ocr_texts BEGIN
+            INSERT INTO ocr_texts_fts (rowid, text) VALUES (new.id, ocr_text(new.text));
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ocr_texts_fts_delete AFTER DELETE ON ocr_texts BEGIN
+            INSERT INTO ocr_texts_fts (ocr_texts_fts, rowid, text) VALUES ('delete', old.id, ocr_text(old.text));
+        END
+    """)
+    # Texts only change by being re-encoded (compressed, or with a newer dictionary)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS ocr_texts_fts_update AFTER UPDATE OF text ON ocr_texts
+        WHEN ocr_text(old.text) IS NOT ocr_text(new.text) BEGIN
+            INSERT INTO ocr_texts_fts (ocr_texts_fts, rowid, text) VALUES ('delete', old.id, ocr_text(old.text));
+            INSERT INTO ocr_texts_fts (rowid, text) VALUES (new.id, ocr_text(new.text));
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_text_ref_insert AFTER INSERT ON screenshots
+        WHEN new.text_id IS NOT NULL BEGIN
+            UPDATE ocr_texts SET refcount = refcount + 1 WHERE id = new.text_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_text_ref_delete AFTER DELETE ON screenshots
+        WHEN old.text_id IS NOT NULL BEGIN
+            UPDATE ocr_texts SET refcount = refcount - 1 WHERE id = old.text_id;
+            DELETE FROM ocr_texts WHERE id = old.text_id AND refcount <= 0;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_text_ref_update AFTER UPDATE OF text_id ON screenshots
+        WHEN old.text_id IS NOT new.text_id BEGIN
+            UPDATE ocr_texts SET refcount = refcount + 1 WHERE id = new.text_id;
+            UPDATE ocr_texts SET refcount = refcount - 1 WHERE id = old.text_id;
+            DELETE FROM ocr_texts WHERE id = old.text_id AND refcount <= 0;
+        END
+    """)
+
+
+def _move_text_to_text_table(conn, db_path):
+    """
+    Version 8 backfill: move each screenshot's text into ocr_texts, then train a
+    compression dictionary on the distinct texts and compress them.
+    """
+    from .database import text_hash
+    from .text_compression import ensure_text_dictionary, recompress_texts
+
+    def text_id(cursor, text):
+        # Version 8's insert trigger indexes the text
+        if not text or not text.strip():
+            return None
+        cursor.execute("INSERT OR IGNORE INTO ocr_texts (hash, text) VALUES (?, ?)", (text_hash(text), text))
+        cursor.execute("SELECT id FROM ocr_texts WHERE hash = ?", (text_hash(text),))
+        return cursor.fetchone()[0]
+
+    def apply_chunk(cursor, rows):
+        cursor.executemany(
+            "UPDATE screenshots SET text_id = ?, extracted_text = NULL WHERE id = ?",
+            [(text_id(cursor, text), row_id) for row_id, text in rows]
+        )
+
+    backfill_in_chunks(
+        conn,
+        "SELECT id, ocr_text(extracted_text) FROM screenshots WHERE id > ? "
+        "AND extracted_text IS NOT NULL ORDER BY id LIMIT ?",
+        apply_chunk
+    )
+    ensure_text_dictionary(db_path)
+    recompress_texts(db_path)
+
+
+def backfill_by_day(conn, apply_day):
+    """
+    Run a data backfill over the screenshots one local day at a time, earliest
+    first, committing after each day.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        apply_day (callable): Called with (cursor, day, timestamps), where day is the
+            local date and timestamps its stored UTC screenshot timestamps in order
+
+    Returns:
+        int: Number of days processed
+    """
+    from .database import local_day_bounds, _local_day
+
+    days = 0
+    start = conn.execute("SELECT MIN(timestamp) FROM screenshots").fetchone()[0]
+    while start is not None:
+        day = date.fromisoformat(_local_day(start))
+        bounds = local_day_bounds(day)
+        timestamps = [timestamp for (timestamp,) in conn.execute(
+            "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp", bounds
+        )]
+
+        cursor = conn.cursor()
+        apply_day(cursor, day, timestamps)
+        conn.commit()
+
+        days += 1
+        start = conn.execute("SELECT MIN(timestamp) FROM screenshots WHERE timestamp >= ?", (bounds[1],)).fetchone()[0]
+    return days
+
+
+def _backfill_daily_rollups(conn, db_path):
+    """Version 5 backfill: roll up screenshots saved before the table existed."""
+    from .hours_engine import hours_by_day
+
+    def apply_day(cursor, day, timestamps):
+        for totals in hours_by_day(timestamps).values():
+            cursor.execute(
+                "INSERT OR REPLACE INTO daily_rollups (day, screenshot_count, active_seconds, first_timestamp, "
+                "last_timestamp) VALUES (?, ?, ?, ?, ?)",
+                (day.isoformat(), totals['screenshot_count'], totals['active_seconds'],
+                 _utc(totals['first_epoch']), _utc(totals['last_epoch']))
+            )
+
+    backfill_by_day(conn, apply_day)
+
+
+def _add_activity_bitmaps(cursor):
+    """Version 9: per-minute activity bitmap on each daily rollup."""
+    _add_column_if_missing(cursor, "daily_rollups", "activity", "BLOB")
+
+
+def _backfill_activity_bitmaps(conn, db_path):
+    """Version 9 backfill: activity bitmaps for days rolled up before they existed."""
+    from .hours_engine import hours_by_day
+
+    def apply_day(cursor, day, timestamps):
+        for totals in hours_by_day(timestamps, with_activity=True).values():
+            cursor.execute("UPDATE daily_rollups SET activity = ? WHERE day = ?", (totals['activity'], day.isoformat()))
+
+    backfill_by_day(conn, apply_day)
+
+
+def _create_sessions(cursor):
+    """
+    Version 10: work sessions. timestamp/end_timestamp bound a run of screenshots
+    no more than MAX_GAP_SECONDS apart (paused = 0) or a P/R pause (paused = 1);
+    closed_by says what ended it (NULL while open).
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME NOT NULL,
+            end_timestamp DATETIME NOT NULL,
+            source TEXT NOT NULL,
+            paused INTEGER NOT NULL DEFAULT 0,
+            closed_by TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp)")
+
+
+def _backfill_sessions(conn, db_path):
+    """Version 10 backfill: work sessions of the screenshots saved before the table existed."""
+    from .hours_engine import active_spans
+
+    today = datetime.now().date()
+
+    def apply_day(cursor, day, timestamps):
+        bounds = (timestamps[0], timestamps[-1])
+        cursor.execute("DELETE FROM sessions WHERE paused = 0 AND timestamp >= ? AND timestamp <= ?", bounds)
+        cursor.executemany(
+            "INSERT INTO sessions (timestamp, end_timestamp, source, closed_by) VALUES (?, ?, 'rebuild', ?)",
+            [
+                # The latest session stays open only if it's today's
+                (_utc(start), _utc(end), closed_by or (None if span_day == today else "day"))
+                for span_day, start, end, closed_by in active_spans(timestamps)
+            ]
+        )
+
+    backfill_by_day(conn, apply_day)
+
+
+def _index_text_without_triggers(cursor):
+    """
+    Version 11: search index triggers in plain SQL. The triggers of version 8 call
+    ocr_text(), which only connections from db_connection have, so deleting a
+    screenshot from any other connection (the sqlite3 shell, backup or repair
+    tools) failed. New texts are now indexed by the code that stores them (it
+    has the plain text), re-encoding a text doesn't change it, and a deleted
+    text's stored value is queued in ocr_texts_fts_deleted for the next
+    database.sync_text_index() to take out of the index.
+    """
+    for trigger in ("ocr_texts_fts_insert", "ocr_texts_fts_delete", "ocr_texts_fts_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ocr_texts_fts_deleted (
+            id INTEGER PRIMARY KEY,
+            text NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER ocr_texts_fts_delete AFTER DELETE ON ocr_texts BEGIN
+            INSERT OR REPLACE INTO ocr_texts_fts_deleted (id, text) VALUES (old.id, old.text);
+        END
+    """)
+
+
+def _create_ocr_cache(cursor):
+    """
+    Version 12: the OCR result cache (see ocr_cache), keyed by frame content hash
+    plus OCR settings. Texts are stored like ocr_texts.text (possibly compressed).
+    Older releases created the table on first use; it is kept as it is.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            content_hash TEXT PRIMARY KEY,
+            text TEXT NOT NULL,
+            last_used REAL NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used ON ocr_cache (last_used)")
+
+
+def _mark_thumbnails(cursor):
+    """
+    Version 13: screenshots.thumbnail flags rows whose file is a preview (see
+    SCREENSHOT_STORAGE), not the captured frame, so the OCR backfill doesn't
+    read text from it.
+    """
+    _add_column_if_missing(cursor, "screenshots", "thumbnail", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _backfill_thumbnail_flags(conn, db_path):
+    """Version 13 backfill: flag older preview rows, recognised by the file name."""
+    def apply_chunk(cursor, rows):
+        cursor.executemany("UPDATE screenshots SET thumbnail = 1 WHERE id = ?", rows)
+
+    backfill_in_chunks(
+        conn,
+        "SELECT id FROM screenshots WHERE id > ? AND thumbnail = 0"
+        " AND file_path LIKE '%\\_thumb.jpg' ESCAPE '\\' ORDER BY id LIMIT ?",
+        apply_chunk
+    )
+
+
+def _no_schema_change(cursor):
+    """Schema step of a version that only rewrites data."""
+
+
+def _normalize_other_timestamps(conn, db_path):
+    """
+    Version 14 backfill: liveness check and window log timestamps in the stored
+    format too (see _normalize_timestamps). Version 4 only rewrote screenshots,
+    but day-range queries compare these tables' timestamps as text as well, so
+    demo-mode rows fell outside (or straddled) their day.
+    """
+    _normalize_timestamps(conn, "liveness_checks")
+    _normalize_timestamps(conn, "logs")
+    _normalize_timestamps(conn, "logs", "end_timestamp")
+
+
+def _utc(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# (version, description, schema step run in one transaction, optional chunked data backfill)
+MIGRATIONS = [
+    (1, "base tables", _create_base_tables, None),
+    (2, "screenshot hashes", _add_screenshot_hashes, None),
+    (3, "window title spans", _add_window_spans, None),
+    (4, "timestamp indexes", _add_timestamp_indexes, _normalize_screenshot_timestamps),
+    (5, "daily rollups", _create_daily_rollups, _backfill_daily_rollups),
+    (6, "full-text search", _create_text_search_index, _backfill_text_search_index),
+    (7, "compressed OCR text", _add_text_compression, _compress_existing_text),
+    (8, "deduplicated OCR text", _add_text_table, _move_text_to_text_table),
+    (9, "activity bitmaps", _add_activity_bitmaps, _backfill_activity_bitmaps),
+    (10, "work sessions", _create_sessions, _backfill_sessions),
+    (11, "plain SQL search index triggers", _index_text_without_triggers, None),
+    (12, "OCR result cache", _create_ocr_cache, None),
+    (13, "thumbnail screenshots", _mark_thumbnails, _backfill_thumbnail_flags),
+    (14, "liveness and log timestamps", _no_schema_change, _normalize_other_timestamps),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Get the database's schema version (0 for a new or pre-migration database)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path):
+    """
+    Bring a database up to SCHEMA_VERSION.
+
+    Each step's schema changes and version bump commit together. A backfill
+    commits per chunk and the version is bumped after it finishes, so an
+    interrupted upgrade resumes from the unfinished step on the next start.
+
+    Args:
+        db_path (str): Database file
+
+    Returns:
+        list: Versions that were applied
+    """
+    conn = get_connection(db_path)
+    applied = []
+    for version, description, schema_step, backfill in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        # Take the write lock before re-checking, in case another process is migrating too
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= version:
+                conn.commit()
+                continue
+            schema_step(conn.cursor())
+            if backfill is None:
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        if backfill is not None:
+            backfill(conn, db_path)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+
+        applied.append(version)
+    return applied
@@ -0,0 +1,45 @@
+"""
+Parallel OCR backfill for screenshots that were saved without text.
+Runs OCR across a process pool and writes results back to the screenshots table in batches.
+"""
+
+from .ocr_processor import extract_text_parallel
+from .database import update_screenshot_texts
+from .config import OCR_BACKFILL_WORKERS, OCR_BACKFILL_CHUNKSIZE, OCR_BACKFILL_BATCH_SIZE
+
+
+def backfill_screenshot_text(pending, workers=OCR_BACKFILL_WORKERS, chunksize=OCR_BACKFILL_CHUNKSIZE,
+                             batch_size=OCR_BACKFILL_BATCH_SIZE, on_progress=None):
+    """
+    OCR screenshots in parallel and store the text on their rows.
+
+    Args:
+        pending (list): List of (screenshot_id, file_path) tuples to OCR
+        workers (int): Number of OCR processes
+        chunksize (int): Images sent to a worker per dispatch
+        batch_size (int): Results written per database transaction
+        on_progress (callable, optional): Called with (screenshot_id, file_path) after each image
+
+    Returns:
+        dict: Mapping of screenshot_id to extracted text
+    """
+    ids_by_path = {}
+    for screenshot_id, file_path in pending:
+        ids_by_path.setdefault(file_path, []).append(screenshot_id)
+
+    results = {}
+    batch = []
+
+    for file_path, text in extract_text_parallel(list(ids_by_path), workers=workers, chunksize=chunksize):
+        for screenshot_id in ids_by_path[file_path]:
+            results[screenshot_id] = text
+            batch.append((screenshot_id, text))
+            if on_progress:
+                on_progress(screenshot_id, file_path)
+
+        if len(batch) >= batch_size:
+            update_screenshot_texts(batch)
+            batch = []
+
+    update_screenshot_texts(batch)
+    return results
@@ -0,0 +1,137 @@
+"""
+Persistent OCR result cache.
+Identical frames (lock screen, the same chat channel, the same docs page) recur all
+day; their OCR text is stored in SQLite keyed by a hash of the frame's pixels so a
+repeat costs one indexed lookup instead of a tesseract run. The table (created by
+migration 12) is capped in size and evicts the least recently used entries, and
+texts are stored compressed like the rest of the OCR text.
+"""
+
+import time
+import sqlite3
+import threading
+from .db_connection import get_connection, transaction
+from .text_compression import compress_text
+from .config import OCR_CACHE_MAX_ENTRIES
+
+TRIM_EVERY = 100  # inserts between size checks
+
+
+class OCRCache:
+    """SQLite-backed LRU cache of OCR text keyed by image content hash."""
+
+    def __init__(self, db_path=None, max_entries=OCR_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._migrated = False
+        self._inserts_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _ensure_schema(self):
+        # OCR can run before anything else opened the database (e.g. ocr-tune)
+        if not self._migrated:
+            from .database import init_db
+            init_db(self.db_path)
+            self._migrated = True
+
+    def get(self, key):
+        """
+        Look up cached OCR text.
+
+        Args:
+            key (str): Cache key (content hash plus OCR settings)
+
+        Returns:
+            str: Cached text, or None on a miss
+        """
+        try:
+            self._ensure_schema()
+            row = get_connection(self.db_path).execute(
+                "SELECT ocr_text(text) FROM ocr_cache WHERE content_hash = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                with transaction(self.db_path) as conn:
+                    conn.execute("UPDATE ocr_cache SET last_used = ? WHERE content_hash = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            # The cache is an optimisation; never let it break OCR
+            print(f"OCR cache lookup failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key, text):
+        """
+        Store OCR text, evicting least recently used entries once over the size cap.
+
+        Args:
+            key (str): Cache key (content hash plus OCR settings)
+            text (str): Extracted text
+        """
+        try:
+            self._ensure_schema()
+            with transaction(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ocr_cache (content_hash, text, last_used) VALUES (?, ?, ?)",
+                    (key, compress_text(text, self.db_path), time.time())
+                )
+
+                with self._lock:
+                    self._inserts_since_trim += 1
+                    should_trim = self._inserts_since_trim >= TRIM_EVERY
+                    if should_trim:
+                        self._inserts_since_trim = 0
+
+                if should_trim:
+                    self._trim(conn)
+        except sqlite3.Error as e:
+            print(f"OCR cache write failed: {e}")
+
+    def _trim(self, conn):
+        """Delete the least recently used entries above max_entries."""
+        count = conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM ocr_cache WHERE content_hash IN "
+                "(SELECT content_hash FROM ocr_cache ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            )
+            with self._lock:
+                self.evictions += excess
+
+    def stats(self):
+        """
+        Get cache counters for this process.
+
+        Returns:
+            dict: hits, misses, evictions and hit_rate (0.0-1.0)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_cache():
+    """Get the shared OCR cache for this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OCRCache()
+        return _cache
@@ -0,0 +1,178 @@
+"""
+OCR engines.
+The tesserocr engine keeps a tesseract instance (and its loaded language model) alive
+in-process for each thread; the pytesseract engine spawns the tesseract binary per
+call and is used as the fallback when tesserocr is not installed.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+import pytesseract
+from .config import OCR_ENGINE, OCR_LANGUAGE
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class OCREngine(ABC):
+    """Base class for OCR engines."""
+
+    name = "base"
+
+    def is_available(self):
+        """Check whether this engine can run on the current machine."""
+        return False
+
+    @abstractmethod
+    def image_to_string(self, image):
+        """
+        Read all text in an image.
+
+        Args:
+            image (PIL.Image.Image): Image to read
+
+        Returns:
+            str: Extracted text
+        """
+
+    @abstractmethod
+    def image_to_words(self, image):
+        """
+        Read the words in an image with their positions.
+
+        Args:
+            image (PIL.Image.Image): Image to read
+
+        Returns:
+            list: (word, left, top, width, height, line_key) tuples in reading order,
+                where line_key identifies the text line the word belongs to
+        """
+
+
+class PytesseractEngine(OCREngine):
+    """Runs the tesseract binary in a subprocess for every call (reloads the model each time)."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang=OCR_LANGUAGE):
+        self.lang = lang
+
+    def is_available(self):
+        try:
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            return False
+
+    def image_to_string(self, image):
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def image_to_words(self, image):
+        data = pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+        words = []
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            if word:
+                line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+                words.append((word, data["left"][i], data["top"][i], data["width"][i], data["height"][i], line_key))
+        return words
+
+
+class TesserocrEngine(OCREngine):
+    """
+    Long-lived in-process tesseract via tesserocr.
+    Each thread gets its own API handle (they are not thread-safe), created on first use
+    and reused for every later image, so the language model is loaded once per thread.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANGUAGE):
+        self.lang = lang
+        self._local = threading.local()
+
+    def is_available(self):
+        try:
+            import tesserocr
+        except ImportError:
+            return False
+        try:
+            self._api()
+            return True
+        except Exception:
+            return False
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            import tesserocr
+            api = tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        return api
+
+    def image_to_string(self, image):
+        api = self._api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+    def image_to_words(self, image):
+        from tesserocr import RIL, iterate_level
+
+        api = self._api()
+        api.SetImage(image)
+        api.Recognize()
+
+        words = []
+        block = paragraph = line = 0
+        for result in iterate_level(api.GetIterator(), RIL.WORD):
+            if result.IsAtBeginningOf(RIL.BLOCK):
+                block += 1
+            if result.IsAtBeginningOf(RIL.PARA):
+                paragraph += 1
+            if result.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+
+            word = (result.GetUTF8Text(RIL.WORD) or "").strip()
+            box = result.BoundingBox(RIL.WORD)
+            if word and box:
+                left, top, right, bottom = box
+                words.append((word, left, top, right - left, bottom - top, (block, paragraph, line)))
+        return words
+
+
+ENGINES = {
+    TesserocrEngine.name: TesserocrEngine,
+    PytesseractEngine.name: PytesseractEngine,
+}
+
+
+def create_ocr_engine(name=None):
+    """
+    Create an OCR engine.
+
+    Args:
+        name (str, optional): "auto", "tesserocr" or "pytesseract" (defaults to OCR_ENGINE).
+            "auto" prefers the persistent tesserocr engine and falls back to pytesseract.
+
+    Returns:
+        OCREngine: The selected engine
+    """
+    name = name or OCR_ENGINE
+
+    if name == "auto":
+        engine = TesserocrEngine()
+        return engine if engine.is_available() else PytesseractEngine()
+
+    engine_class = ENGINES.get(name)
+    if engine_class is None:
+        raise ValueError(f"Unknown OCR engine: {name} (expected auto, {', '.join(ENGINES)})")
+    return engine_class()
+
+
+def get_ocr_engine():
+    """Get the shared OCR engine for this process, creating it on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_ocr_engine()
+        return _engine
@@ -0,0 +1,174 @@
+"""
+Background OCR pipeline for the scheduled tracker.
+Capture pushes frames into a bounded queue that a pool of worker threads drains,
+so a slow tesseract run never stalls window tracking or the screenshot cadence.
+"""
+
+import queue
+import threading
+from .ocr_processor import TiledOCR, extract_text_from_image
+from .database import update_screenshot_text
+from .config import OCR_WORKERS, OCR_QUEUE_SIZE, OCR_OVERFLOW_POLICY, OCR_MODE, SCREENSHOT_STORAGE
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class OCRPipeline:
+    """
+    Bounded producer/consumer queue feeding OCR worker threads.
+
+    Frames are saved to the database before they are submitted, so a frame that
+    is dropped under load keeps its screenshot row (and its place in the hours
+    calculation) with empty text. The end-of-day summary pass OCRs those rows from
+    the kept screenshot file. With SCREENSHOT_STORAGE "thumbnail" or "none" there is
+    no such file, so the drop policies fall back to "block": every frame is OCR'd
+    here, at the cost of capture waiting for a free slot under load.
+
+    With OCR_MODE = "tiled", each worker diffs the frames it takes against the
+    last frame it read itself (its own TiledOCR), so workers run in parallel.
+    """
+
+    def __init__(self, workers=OCR_WORKERS, max_queue=OCR_QUEUE_SIZE, overflow_policy=OCR_OVERFLOW_POLICY,
+                 storage=SCREENSHOT_STORAGE):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown OCR overflow policy: {overflow_policy} (expected one of {', '.join(OVERFLOW_POLICIES)})")
+        if storage != "full":
+            # A dropped frame would never get text: nothing on disk for the backfill to read
+            overflow_policy = "block"
+
+        self.workers = max(1, int(workers))
+        self.overflow_policy = overflow_policy
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._threads = []
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._processed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._peak_depth = 0
+
+    def start(self):
+        """Start the OCR worker threads."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ocr-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, screenshot_id, image, content_hash=None):
+        """
+        Queue a captured frame for OCR.
+
+        Args:
+            screenshot_id (int): ID of the already-saved screenshot row
+            image (PIL.Image.Image or str): Captured frame, or path to the screenshot file
+            content_hash (str, optional): Content hash of the full-color frame (OCR cache key)
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped
+        """
+        job = (screenshot_id, image, content_hash)
+
+        with self._lock:
+            self._submitted += 1
+
+        if self.overflow_policy == "block":
+            self._queue.put(job)
+        else:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                if self.overflow_policy == "drop_newest":
+                    self._count_drop()
+                    return False
+
+                # drop_oldest: discard the stalest frame to make room for the new one
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._count_drop()
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait(job)
+                except queue.Full:
+                    self._count_drop()
+                    return False
+
+        with self._lock:
+            self._peak_depth = max(self._peak_depth, self._queue.qsize())
+        return True
+
+    def join(self):
+        """Block until every queued frame has been processed."""
+        self._queue.join()
+
+    def stop(self, drain=True):
+        """
+        Stop the worker threads.
+
+        Args:
+            drain (bool): Finish OCR for queued frames first (default: True).
+                Otherwise queued frames are discarded and counted as dropped.
+        """
+        if drain:
+            self.join()
+        else:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._count_drop()
+                except queue.Empty:
+                    break
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def stats(self):
+        """
+        Get pipeline counters.
+
+        Returns:
+            dict: queue depth, peak depth, submitted, processed, dropped and failed counts
+        """
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'peak_depth': self._peak_depth,
+                'queue_capacity': self._queue.maxsize,
+                'submitted': self._submitted,
+                'processed': self._processed,
+                'dropped': self._dropped,
+                'failed': self._failed,
+            }
+
+    def _count_drop(self):
+        with self._lock:
+            self._dropped += 1
+
+    def _worker(self):
+        """Drain the queue, running OCR and writing text back to the screenshot row."""
+        tiled = TiledOCR() if OCR_MODE == "tiled" else None
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+
+                screenshot_id, image, content_hash = job
+                try:
+                    extracted_text = extract_text_from_image(image, content_hash, tiled)
+                    update_screenshot_text(screenshot_id, extracted_text)
+                    with self._lock:
+                        self._processed += 1
+                except Exception as e:
+                    print(f"OCR worker failed on screenshot {screenshot_id}: {e}")
+                    with self._lock:
+                        self._failed += 1
+            finally:
+                self._queue.task_done()
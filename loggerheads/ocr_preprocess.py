@@ -0,0 +1,215 @@
+"""
+Image preprocessing ahead of OCR.
+Grayscale conversion, downscaling to a target DPI, binarization and cropping of
+solid-color borders shrink the work tesseract has to do per frame. Named presets
+trade speed for accuracy; the tuner measures that trade-off on a real corpus.
+"""
+
+import os
+import time
+from PIL import Image, ImageChops
+from .ocr_engines import get_ocr_engine
+from .app_based_analyzer import detect_app_from_text
+from .config import OCR_PREPROCESS_PRESET, OCR_SCREEN_DPI
+
+PRESETS = {
+    'none': {},
+    'accurate': {'grayscale': True, 'crop_borders': True},
+    'balanced': {'grayscale': True, 'crop_borders': True, 'target_dpi': 72},
+    'fast': {'grayscale': True, 'crop_borders': True, 'target_dpi': 60, 'binarize': True},
+}
+
+DEFAULT_PRESET = 'none'
+
+BORDER_TOLERANCE = 12  # grayscale difference from the corner color still counted as border
+
+
+def configured_preset(name=OCR_PREPROCESS_PRESET):
+    """
+    Check the configured preset name (LOGGERHEADS_OCR_PREPROCESS).
+
+    An unknown name falls back to DEFAULT_PRESET with a warning, instead of
+    failing the OCR of every frame later on.
+
+    Args:
+        name (str): Configured preset name (case-insensitive)
+
+    Returns:
+        str: A key of PRESETS
+    """
+    preset = (name or DEFAULT_PRESET).strip().lower()
+    if preset in PRESETS:
+        return preset
+    print(f"⚠️  Warning: Unknown OCR preprocessing preset {name!r} (expected one of {', '.join(PRESETS)}), "
+          f"using {DEFAULT_PRESET!r}")
+    return DEFAULT_PRESET
+
+
+ACTIVE_PRESET = configured_preset()  # the preset frames are preprocessed with
+
+
+def otsu_threshold(image):
+    """
+    Pick a binarization threshold for a grayscale image with Otsu's method.
+
+    Args:
+        image (PIL.Image.Image): Grayscale ("L") image
+
+    Returns:
+        int: Threshold between 0 and 255
+    """
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    total_sum = sum(i * count for i, count in enumerate(histogram))
+
+    background_weight = 0
+    background_sum = 0
+    best_threshold = 127
+    best_variance = 0.0
+
+    for threshold, count in enumerate(histogram):
+        background_weight += count
+        if background_weight == 0:
+            continue
+        foreground_weight = total - background_weight
+        if foreground_weight == 0:
+            break
+
+        background_sum += threshold * count
+        background_mean = background_sum / background_weight
+        foreground_mean = (total_sum - background_sum) / foreground_weight
+        variance = background_weight * foreground_weight * (background_mean - foreground_mean) ** 2
+
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = threshold
+
+    return best_threshold
+
+
+def crop_solid_borders(image, tolerance=BORDER_TOLERANCE):
+    """
+    Crop uniform margins (desktop background, letterboxing) that share the corner pixel's color.
+
+    Args:
+        image (PIL.Image.Image): Image to crop
+        tolerance (int): Max difference from the border color still treated as border
+
+    Returns:
+        PIL.Image.Image: Cropped image (or the original if there is no border)
+    """
+    gray = image.convert("L")
+    background = Image.new("L", gray.size, gray.getpixel((0, 0)))
+    mask = ImageChops.difference(gray, background).point(lambda p: 255 if p > tolerance else 0)
+    bbox = mask.getbbox()
+
+    if not bbox or bbox == (0, 0) + image.size:
+        return image
+    return image.crop(bbox)
+
+
+def preprocess_for_ocr(image, preset=None, screen_dpi=OCR_SCREEN_DPI):
+    """
+    Prepare a frame for OCR.
+
+    Args:
+        image (PIL.Image.Image): Captured frame
+        preset (str or dict, optional): Preset name from PRESETS, or a dict of steps
+            (grayscale, crop_borders, target_dpi, binarize). Defaults to ACTIVE_PRESET.
+        screen_dpi (int): Pixel density of the captured screen, used for DPI scaling
+
+    Returns:
+        PIL.Image.Image: Preprocessed image
+    """
+    if isinstance(preset, dict):
+        steps = preset
+    else:
+        steps = PRESETS.get(preset or ACTIVE_PRESET)
+        if steps is None:
+            raise ValueError(f"Unknown OCR preprocessing preset: {preset} (expected one of {', '.join(PRESETS)})")
+    if not steps:
+        return image
+
+    if steps.get('grayscale'):
+        image = image.convert("L")
+
+    if steps.get('crop_borders'):
+        image = crop_solid_borders(image)
+
+    # Only ever downscale; upscaling adds pixels without adding detail
+    target_dpi = steps.get('target_dpi')
+    if target_dpi and target_dpi < screen_dpi:
+        scale = target_dpi / screen_dpi
+        width, height = image.size
+        image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+
+    if steps.get('binarize'):
+        gray = image.convert("L")
+        threshold = otsu_threshold(gray)
+        image = gray.point(lambda p: 255 if p > threshold else 0)
+
+    return image
+
+
+def tune_presets(image_paths, presets=None, engine=None, on_progress=None):
+    """
+    Measure OCR speed and accuracy of preprocessing presets on a corpus.
+
+    Text from unprocessed frames is the reference. For each preset this reports
+    seconds per frame (preprocessing + OCR), text similarity to the reference, and
+    how often detect_app_from_text classifies the frame the same way.
+
+    Args:
+        image_paths (list): Screenshot files to evaluate
+        presets (list, optional): Preset names to evaluate (defaults to all)
+        engine (OCREngine, optional): OCR engine (defaults to the configured one)
+        on_progress (callable, optional): Called with the preset name before it runs
+
+    Returns:
+        list: One dict per preset with 'preset', 'seconds_per_frame', 'similarity'
+            and 'app_agreement', in the order evaluated
+    """
+    from .ocr_processor import ocr_text_similarity
+
+    engine = engine or get_ocr_engine()
+    presets = presets or list(PRESETS)
+    frames = []
+    for path in image_paths:
+        if os.path.exists(path):
+            with Image.open(path) as image:
+                frames.append(image.convert("RGB"))
+
+    if not frames:
+        return []
+
+    references = None
+    results = []
+
+    for name in ['none'] + [p for p in presets if p != 'none']:
+        if on_progress:
+            on_progress(name)
+
+        texts = []
+        start = time.perf_counter()
+        for frame in frames:
+            texts.append(engine.image_to_string(preprocess_for_ocr(frame, name)).strip())
+        elapsed = time.perf_counter() - start
+
+        if references is None:
+            references = texts
+
+        similarity = sum(ocr_text_similarity(r, t) for r, t in zip(references, texts)) / len(frames)
+        same_app = sum(
+            detect_app_from_text(r)['app_name'] == detect_app_from_text(t)['app_name']
+            for r, t in zip(references, texts)
+        )
+
+        if name in presets:
+            results.append({
+                'preset': name,
+                'seconds_per_frame': elapsed / len(frames),
+                'similarity': similarity,
+                'app_agreement': same_app / len(frames),
+            })
+
+    return results
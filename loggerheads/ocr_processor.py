@@ -1,47 +1,272 @@
 """
 OCR processor for extracting text from screenshots.
-Uses pytesseract to perform optical character recognition on captured images.
+Uses the configured OCR engine (in-process tesserocr, or pytesseract as the fallback)
+to perform optical character recognition on captured images.
 """
 
-import pytesseract
+import numpy as np
 from PIL import Image
 import os
+import threading
+from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
+from .ocr_engines import get_ocr_engine
+from .ocr_preprocess import ACTIVE_PRESET, PRESETS, preprocess_for_ocr
+from .ocr_cache import get_ocr_cache
+from .perceptual_hash import content_hash as compute_content_hash
+from .config import (
+    OCR_BACKFILL_WORKERS,
+    OCR_BACKFILL_CHUNKSIZE,
+    OCR_MODE,
+    OCR_TILE_ROWS,
+    OCR_TILE_COLS,
+    OCR_TILE_PIXEL_THRESHOLD,
+    OCR_TILE_FULL_FRAME_RATIO,
+    OCR_CACHE_ENABLED
+)
 
 
-def extract_text_from_image(image_path):
+class TiledOCR:
     """
-    Extract text from an image file using OCR.
+    Incremental OCR that only re-reads the parts of the screen that changed.
+
+    Each frame is split into a grid of tiles and diffed against the previous frame.
+    Rows of dirty tiles are grown up and down to the nearest blank pixel rows and
+    read across the full width, so no text line is cut at a tile edge; the lines
+    read replace the cached lines of that band, and the rest of the page reuses
+    its cached lines. When most of the screen changed (or on the first frame) the
+    whole frame is read at once. The page text is rebuilt from the line cache,
+    tile by tile in reading order.
+
+    Instances are stateful: use one per stream of frames (each OCR worker thread
+    of the tracker keeps its own), so a frame is always diffed against the frame
+    whose text is cached.
+    """
+
+    def __init__(self, rows=OCR_TILE_ROWS, cols=OCR_TILE_COLS,
+                 pixel_threshold=OCR_TILE_PIXEL_THRESHOLD, full_frame_ratio=OCR_TILE_FULL_FRAME_RATIO):
+        self.rows = max(1, int(rows))
+        self.cols = max(1, int(cols))
+        self.pixel_threshold = pixel_threshold
+        self.full_frame_ratio = full_frame_ratio
+        self._lock = threading.Lock()
+        self._previous = None  # grayscale pixels of the last frame read
+        self._row_edges = None
+        self._col_edges = None
+        self._lines = []  # (top, bottom, left, text) of every text line on the last frame
+        self.tiles_read = 0
+        self.tiles_reused = 0
+        self.full_frames = 0
+
+    def reset(self):
+        """Forget the previous frame so the next one is read in full."""
+        with self._lock:
+            self._previous = None
+            self._lines = []
+
+    def extract_text(self, image):
+        """
+        Extract text from a frame, re-reading only the text lines that changed.
+
+        Args:
+            image (PIL.Image.Image): Captured frame
+
+        Returns:
+            str: Full-page text rebuilt from the line cache
+        """
+        with self._lock:
+            gray = np.asarray(image.convert("L"), dtype=np.int16)
+            height, width = gray.shape
+
+            if self._previous is None or self._previous.shape != gray.shape:
+                self._row_edges = np.linspace(0, height, self.rows + 1).astype(int)
+                self._col_edges = np.linspace(0, width, self.cols + 1).astype(int)
+                dirty = np.ones((self.rows, self.cols), dtype=bool)
+            else:
+                # Count changed pixels per tile: sum over row bands, then column bands
+                changed = (np.abs(gray - self._previous) > self.pixel_threshold).astype(np.int32)
+                per_band = np.add.reduceat(changed, self._row_edges[:-1], axis=0)
+                per_tile = np.add.reduceat(per_band, self._col_edges[:-1], axis=1)
+                dirty = per_tile > 0
+
+            dirty_count = int(dirty.sum())
+            if dirty_count >= self.full_frame_ratio * dirty.size:
+                self._lines = self._read_lines(image, 0, height)
+                self.full_frames += 1
+            else:
+                for top, bottom in self._dirty_bands(gray, dirty.any(axis=1)):
+                    # Lines are either inside a band or outside it: band edges are blank rows
+                    kept = [line for line in self._lines if not top <= (line[0] + line[1]) // 2 < bottom]
+                    self._lines = kept + self._read_lines(image, top, bottom)
+                self.tiles_read += dirty_count
+                self.tiles_reused += dirty.size - dirty_count
+
+            self._previous = gray
+            return self._page_text()
+
+    def _dirty_bands(self, gray, dirty_rows):
+        """
+        Pixel row ranges to re-read: each run of dirty tile rows, grown to the
+        nearest blank pixel rows (no text crosses them), overlapping ranges merged.
+        """
+        blank = (gray.max(axis=1) - gray.min(axis=1)) <= self.pixel_threshold
+        height = gray.shape[0]
+
+        bands = []
+        for row in np.flatnonzero(dirty_rows):
+            top, bottom = int(self._row_edges[row]), int(self._row_edges[row + 1])
+            while top > 0 and not blank[top - 1]:
+                top -= 1
+            while bottom < height and not blank[bottom]:
+                bottom += 1
+            if bands and top <= bands[-1][1]:
+                bands[-1] = (bands[-1][0], max(bands[-1][1], bottom))
+            else:
+                bands.append((top, bottom))
+        return bands
+
+    def _read_lines(self, image, top, bottom):
+        """OCR a full-width band of the frame into (top, bottom, left, text) lines in frame coordinates."""
+        lines = {}
+        band = image if (top, bottom) == (0, image.height) else image.crop((0, top, image.width, bottom))
+
+        for word, left, word_top, width, height, line_key in get_ocr_engine().image_to_words(band):
+            line = lines.setdefault(line_key, [word_top, word_top + height, left, []])
+            line[0] = min(line[0], word_top)
+            line[1] = max(line[1], word_top + height)
+            line[2] = min(line[2], left)
+            line[3].append(word)
+
+        return [
+            (line_top + top, line_bottom + top, left, " ".join(words))
+            for line_top, line_bottom, left, words in lines.values()
+        ]
+
+    def _page_text(self):
+        """Rebuild the page text from the line cache, tiles top-to-bottom then left-to-right."""
+        def reading_order(line):
+            line_top, line_bottom, left, _ = line
+            row = min(int(np.searchsorted(self._row_edges, (line_top + line_bottom) // 2, side="right")) - 1,
+                      self.rows - 1)
+            col = min(int(np.searchsorted(self._col_edges, left, side="right")) - 1, self.cols - 1)
+            return row, col, line_top, left
+
+        return "\n".join(line[3] for line in sorted(self._lines, key=reading_order))
+
+
+def extract_text_from_image(image_path, content_hash=None, tiled=None):
+    """
+    Extract text from an image file (or an in-memory frame) using OCR.
+
+    Frames go through the configured preprocessing preset first. With
+    OCR_MODE = "tiled" and a TiledOCR for the frame's capture stream, only the
+    screen regions that changed since that stream's previous frame are re-read;
+    without one (backfills, batch OCR) the whole frame is read. Results are
+    cached by image content hash, so a frame seen before is not OCR'd again.
 
     Args:
-        image_path (str): Path to the image file
+        image_path (str or PIL.Image.Image): Path to the image file, or a captured frame
+        content_hash (str, optional): Precomputed content hash of the full-color frame
+        tiled (TiledOCR, optional): Diff state of the capture stream the frame belongs to
 
     Returns:
         str: Extracted text from the image, or empty string if extraction fails
     """
     try:
-        if not os.path.exists(image_path):
+        if isinstance(image_path, Image.Image):
+            image = image_path
+        elif not os.path.exists(image_path):
             print(f"Image file not found: {image_path}")
             return ""
+        else:
+            # Open the image
+            image = Image.open(image_path)
 
-        # Open the image
-        image = Image.open(image_path)
+        mode = "tiled" if OCR_MODE == "tiled" and tiled is not None else "full"
+        cache_key = None
+        if OCR_CACHE_ENABLED:
+            cache_key = f"{mode}:{ACTIVE_PRESET}:{content_hash or compute_content_hash(image)}"
+            cached = get_ocr_cache().get(cache_key)
+            if cached is not None:
+                return cached
 
         # Perform OCR
-        text = pytesseract.image_to_string(image)
+        if mode == "tiled":
+            # Border cropping would change frame geometry between frames and defeat tile diffing
+            steps = {k: v for k, v in PRESETS[ACTIVE_PRESET].items() if k != 'crop_borders'}
+            text = tiled.extract_text(preprocess_for_ocr(image, steps))
+        else:
+            text = get_ocr_engine().image_to_string(preprocess_for_ocr(image))
 
-        return text.strip()
+        text = text.strip()
+        if cache_key:
+            get_ocr_cache().put(cache_key, text)
+        return text
 
     except Exception as e:
-        print(f"Error extracting text from {image_path}: {e}")
+        source = "captured frame" if isinstance(image_path, Image.Image) else image_path
+        print(f"Error extracting text from {source}: {e}")
         return ""
 
 
-def process_screenshot_batch(screenshot_dir):
+def ocr_text_similarity(reference, candidate):
+    """
+    Character-level similarity between two OCR results (1.0 = identical).
+
+    Whitespace is normalised first, since layout differences are not reading errors.
+
+    Args:
+        reference (str): Text from the reference (e.g. lossless, unprocessed) image
+        candidate (str): Text from the image under test
+
+    Returns:
+        float: Similarity ratio between 0.0 and 1.0
+    """
+    reference = " ".join(reference.split())
+    candidate = " ".join(candidate.split())
+    if not reference and not candidate:
+        return 1.0
+    return SequenceMatcher(None, reference, candidate, autojunk=False).ratio()
+
+
+def extract_text_parallel(image_paths, workers=None, chunksize=None):
+    """
+    Extract text from many images using a pool of OCR processes.
+
+    Images are dispatched to workers in chunks and results are yielded in the
+    same order as image_paths, so callers can stream them straight into the database.
+
+    Args:
+        image_paths (list): Paths to the image files
+        workers (int, optional): Number of worker processes (defaults to OCR_BACKFILL_WORKERS)
+        chunksize (int, optional): Images per dispatch (defaults to OCR_BACKFILL_CHUNKSIZE)
+
+    Yields:
+        tuple: (image_path, extracted_text) in input order
+    """
+    image_paths = list(image_paths)
+    workers = max(1, int(workers or OCR_BACKFILL_WORKERS))
+    chunksize = max(1, int(chunksize or OCR_BACKFILL_CHUNKSIZE))
+
+    # A pool is not worth spawning for a handful of images
+    if workers == 1 or len(image_paths) <= chunksize:
+        for image_path in image_paths:
+            yield image_path, extract_text_from_image(image_path)
+        return
+
+    workers = min(workers, (len(image_paths) + chunksize - 1) // chunksize)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for image_path, text in zip(image_paths, executor.map(extract_text_from_image, image_paths, chunksize=chunksize)):
+            yield image_path, text
+
+
+def process_screenshot_batch(screenshot_dir, workers=None):
     """
     Process all screenshots in a directory and extract text from each.
 
     Args:
         screenshot_dir (str): Directory containing screenshot files
+        workers (int, optional): Number of OCR processes (defaults to OCR_BACKFILL_WORKERS)
 
     Returns:
         dict: Dictionary mapping image filenames to extracted text
@@ -54,12 +279,12 @@ def process_screenshot_batch(screenshot_dir):
 
     # Get all image files (png, jpg, jpeg)
     image_extensions = ('.png', '.jpg', '.jpeg')
-    image_files = [f for f in os.listdir(screenshot_dir)
-                   if f.lower().endswith(image_extensions)]
+    image_files = sorted(f for f in os.listdir(screenshot_dir)
+                         if f.lower().endswith(image_extensions))
+    image_paths = [os.path.join(screenshot_dir, f) for f in image_files]
 
-    for image_file in image_files:
-        image_path = os.path.join(screenshot_dir, image_file)
-        text = extract_text_from_image(image_path)
+    for image_path, text in extract_text_parallel(image_paths, workers=workers):
+        image_file = os.path.basename(image_path)
         results[image_file] = text
         print(f"Processed {image_file}: {len(text)} characters extracted")
 
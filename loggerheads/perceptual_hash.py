@@ -0,0 +1,84 @@
+"""
+Perceptual hashing for screenshots.
+A difference hash (dHash) summarises the coarse layout of a frame, so two captures
+of an unchanged screen produce hashes that differ in only a few bits. An exact
+content hash of the pixels is also provided for identifying identical frames.
+"""
+
+import hashlib
+from PIL import Image
+
+HASH_SIZE = 16  # hash is HASH_SIZE x HASH_SIZE bits
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    """
+    Compute the difference hash of an image.
+
+    Args:
+        image (PIL.Image.Image): Image to hash
+        hash_size (int): Hash grid size; the hash has hash_size**2 bits
+
+    Returns:
+        int: Hash value
+    """
+    # One extra column so every cell has a right-hand neighbour to compare with
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = list(small.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hash_to_hex(value, hash_size=HASH_SIZE):
+    """Format a hash as a fixed-width hex string for storage."""
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+
+def hex_to_hash(hex_value):
+    """Parse a stored hex hash back into an int."""
+    return int(hex_value, 16)
+
+
+def hamming_distance(hash_a, hash_b):
+    """Number of differing bits between two hashes."""
+    return bin(hash_a ^ hash_b).count("1")
+
+
+def compute_image_hash(image_path, hash_size=HASH_SIZE):
+    """
+    Compute the difference hash of an image file.
+
+    Args:
+        image_path (str): Path to the image file
+        hash_size (int): Hash grid size
+
+    Returns:
+        int: Hash value, or None if the image could not be read
+    """
+    try:
+        with Image.open(image_path) as image:
+            return dhash(image, hash_size)
+    except Exception as e:
+        print(f"Error hashing {image_path}: {e}")
+        return None
+
+
+def content_hash(image):
+    """
+    Compute an exact hash of a frame's pixels.
+
+    Args:
+        image (PIL.Image.Image): Image to hash
+
+    Returns:
+        str: Hex digest that changes if any pixel, the size or the mode changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,148 @@
+"""
+Retention of tracked history.
+Screenshot images are partitioned into one directory per local day, and database
+rows are bucketed by day through the timestamp indexes. Expiring a day removes its
+directory in one call and its rows with one indexed range delete per table,
+instead of unlinking files and deleting rows one at a time. OCR text and window
+spans are kept longer than images, and the daily hours rollups are kept for good.
+"""
+
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from .config import SCREENSHOT_DIR, TEXT_RETENTION_DAYS, IMAGE_RETENTION_DAYS
+from .database import get_db_path, local_day_bounds, sync_text_index
+from .db_connection import transaction
+
+DAY_DIR_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+LEGACY_FILE_PATTERN = re.compile(r"^screenshot_(\d{8})_\d{6}")  # images saved before day directories
+
+
+def screenshot_day_dir(day=None, root=SCREENSHOT_DIR):
+    """
+    Get (and create) the directory holding one local day's screenshot images.
+
+    Args:
+        day (date, optional): Local date (defaults to today)
+        root (str): Screenshot root directory
+
+    Returns:
+        str: Path of the day's directory
+    """
+    day = day or datetime.now().date()
+    path = Path(root) / day.isoformat()
+    path.mkdir(parents=True, exist_ok=True)
+    return str(path)
+
+
+def _cutoff_day(keep_days, today=None):
+    """First local day still kept when keeping keep_days days (today included)."""
+    today = today or datetime.now().date()
+    return today - timedelta(days=keep_days - 1)
+
+
+def expire_images(keep_days=IMAGE_RETENTION_DAYS, root=SCREENSHOT_DIR, today=None, db_path=None):
+    """
+    Delete screenshot images of days older than the retention window.
+
+    Each expired day is one directory removal; rows that pointed at the images
+    keep their text and hashes but no longer reference a file.
+
+    Args:
+        keep_days (int): Days of images to keep, today included (0 = keep forever)
+        root (str): Screenshot root directory
+        today (date, optional): Local date to count from (defaults to today)
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        int: Number of day directories (or legacy files) removed
+    """
+    if keep_days <= 0 or not os.path.isdir(root):
+        return 0
+    cutoff = _cutoff_day(keep_days, today)
+    removed = 0
+
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir() and DAY_DIR_PATTERN.match(entry.name):
+                if entry.name < cutoff.isoformat():
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            elif entry.is_file():
+                legacy = LEGACY_FILE_PATTERN.match(entry.name)
+                if legacy and datetime.strptime(legacy.group(1), "%Y%m%d").date() < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+
+    with transaction(db_path or get_db_path()) as conn:
+        conn.execute(
+            "UPDATE screenshots SET file_path = '' WHERE timestamp < ? AND file_path != ''",
+            (local_day_bounds(cutoff)[0],)
+        )
+    return removed
+
+
+def expire_history(keep_days=TEXT_RETENTION_DAYS, today=None, db_path=None):
+    """
+    Delete screenshots (with their OCR text), window spans, liveness checks,
+    work sessions and cached OCR results of days older than the retention window.
+    Daily hours rollups are kept.
+
+    Args:
+        keep_days (int): Days of history to keep, today included (0 = keep forever)
+        today (date, optional): Local date to count from (defaults to today)
+        db_path (str, optional): Custom database path (defaults to standard path)
+
+    Returns:
+        dict: Rows deleted per table
+    """
+    if keep_days <= 0:
+        return {}
+    cutoff_day = _cutoff_day(keep_days, today)
+    cutoff = local_day_bounds(cutoff_day)[0]
+    deleted = {}
+
+    with transaction(db_path or get_db_path()) as conn:
+        cursor = conn.cursor()
+
+        # Kept frames that repeat an expiring frame take over its text
+        cursor.execute(
+            "UPDATE screenshots SET text_id = (SELECT src.text_id FROM screenshots src "
+            "WHERE src.id = screenshots.duplicate_of), duplicate_of = NULL "
+            "WHERE timestamp >= ? AND duplicate_of IN (SELECT id FROM screenshots WHERE timestamp < ?)",
+            (cutoff, cutoff)
+        )
+
+        # OCR texts go with their last screenshot (refcount triggers)
+        for table in ("screenshots", "logs", "liveness_checks", "sessions"):
+            cursor.execute(f"DELETE FROM {table} WHERE timestamp < ?", (cutoff,))
+            deleted[table] = cursor.rowcount
+
+        cursor.execute(
+            "DELETE FROM window_titles WHERE id NOT IN (SELECT title_id FROM logs WHERE title_id IS NOT NULL)"
+        )
+
+        # Cached OCR results last used before the window (last_used is a Unix time)
+        cursor.execute(
+            "DELETE FROM ocr_cache WHERE last_used < ?",
+            (datetime.combine(cutoff_day, datetime.min.time()).astimezone().timestamp(),)
+        )
+        deleted['ocr_cache'] = cursor.rowcount
+
+        # Expired texts leave the search index too
+        sync_text_index(db_path)
+    return deleted
+
+
+def apply_retention(today=None, db_path=None):
+    """
+    Expire images and history that fall outside the configured retention windows.
+
+    Returns:
+        dict: 'image_days' removed and rows deleted per table
+    """
+    stats = {'image_days': expire_images(today=today, db_path=db_path)}
+    stats.update(expire_history(today=today, db_path=db_path))
+    return stats
@@ -8,7 +8,7 @@ import time
 import threading
 import os
 from datetime import datetime
-from pynput import keyboard
+from pynput import keyboard, mouse
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
@@ -17,14 +17,24 @@ from rich.live import Live
 from rich.layout import Layout
 from rich import box
 from rich.text import Text
-from .database import init_db, save_logs, save_screenshot, get_screenshots, save_liveness_check
-from .screen_recorder import capture_screenshot
-from .ocr_processor import extract_text_from_image
+from .database import (
+    init_db, save_screenshot, iter_text_occurrences, count_screenshots, save_liveness_check,
+    get_screenshots_pending_ocr, get_window_time_totals, close_session, start_pause, end_pause,
+    get_session_totals
+)
+from .screen_recorder import capture_frame, store_frame
+from .ocr_pipeline import OCRPipeline
+from .ocr_backfill import backfill_screenshot_text
+from .ocr_cache import get_ocr_cache
+from .adaptive_capture import AdaptiveCaptureInterval
+from .window_tracker import WindowSpanTracker
+from .perceptual_hash import dhash, hash_to_hex, hamming_distance, content_hash
 from .text_analyzer import analyze_text, generate_structured_summary, format_summary_for_display
 from .ai_summarizer import summarize_work_with_ai, format_ai_summary_for_display
 from .app_based_analyzer import generate_app_based_summary, format_app_summary_for_display
 from .discord_notifier import send_summary_to_discord
-from .database_cleanup import clear_all_database_data
+from .retention import apply_retention, screenshot_day_dir
+from .text_compression import ensure_text_dictionary
 from .liveness_detector import check_liveness, is_liveness_available
 from .config import (
     WORK_START_TIME,
@@ -32,17 +42,24 @@ from .config import (
     WORK_DAYS,
     TRACKING_INTERVAL,
     SCREENSHOT_INTERVAL,
-    SCREENSHOT_DIR,
+    IMAGE_RETENTION_DAYS,
+    TEXT_RETENTION_DAYS,
+    ADAPTIVE_CAPTURE,
     TARGET_WINDOW,
     DISCORD_WEBHOOK_URL,
     SEND_TO_DISCORD,
     USE_AI_SUMMARIZATION,
     OLLAMA_API_URL,
-    OLLAMA_MODEL
+    OLLAMA_MODEL,
+    PHASH_DEDUP_ENABLED,
+    PHASH_THRESHOLD,
+    SCREENSHOT_STORAGE
 )
 
 console = Console()
 
+AI_SAMPLE_SIZE = 30  # max screenshot texts sent to the AI summarizer
+
 
 def is_work_hours():
     """
@@ -85,37 +102,20 @@ def track_single_activity():
     return None
 
 
-def cleanup_screenshots():
-    """
-    Delete all screenshot files and clean up the screenshots directory.
-    """
-    console.print("\n[bold yellow]🗑️  Cleaning up screenshots...[/bold yellow]")
-
+def expire_old_data():
+    """Drop screenshot images and history older than the retention windows."""
     try:
-        # Get all screenshots from database
-        screenshots = get_screenshots()
-        deleted_count = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True,
-        ) as progress:
-            task = progress.add_task("[cyan]Deleting screenshot files...", total=len(screenshots))
-
-            for screenshot_id, file_path, timestamp, extracted_text in screenshots:
-                if os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        deleted_count += 1
-                    except Exception as e:
-                        console.print(f"[yellow]⚠️  Could not delete {file_path}: {e}[/yellow]")
-                progress.advance(task)
-
-        console.print(f"[bold green]✅ Deleted {deleted_count} screenshot files[/bold green]")
-
+        stats = apply_retention()
     except Exception as e:
-        console.print(f"[bold red]❌ Error cleaning up screenshots: {e}[/bold red]")
+        console.print(f"[bold red]❌ Error applying retention: {e}[/bold red]")
+        return
+
+    if stats.get('image_days') or stats.get('screenshots'):
+        console.print(
+            f"[bold green]🗑️  Expired {stats['image_days']} day(s) of images "
+            f"(kept {IMAGE_RETENTION_DAYS}), {stats.get('screenshots', 0)} screenshots of history "
+            f"(kept {TEXT_RETENTION_DAYS} days)[/bold green]"
+        )
 
 
 def process_and_generate_summary():
@@ -125,48 +125,50 @@ def process_and_generate_summary():
     """
     console.print("\n[bold cyan]🔄 Processing screenshots with OCR...[/bold cyan]")
 
-    # Get all screenshots from database
-    screenshots = get_screenshots()
-
-    if not screenshots:
+    if not count_screenshots(today_only=True):
         console.print("[yellow]No screenshots to process.[/yellow]")
+        expire_old_data()
         return
 
-    all_ocr_texts = []
+    # Screenshots whose text was never extracted (e.g. dropped by the OCR queue)
+    pending = [
+        (screenshot_id, file_path)
+        for screenshot_id, file_path in get_screenshots_pending_ocr()
+        if os.path.exists(file_path)
+    ]
+
+    if pending:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+        ) as progress:
+            task = progress.add_task("[cyan]Processing screenshots...", total=len(pending))
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-    ) as progress:
-        task = progress.add_task("[cyan]Processing screenshots...", total=len(screenshots))
+            def on_progress(screenshot_id, file_path):
+                progress.update(task, description=f"[cyan]Processing: {os.path.basename(file_path)}")
+                progress.advance(task)
 
-        for screenshot_id, file_path, timestamp, extracted_text in screenshots:
-            # If text not already extracted, do OCR now
-            if not extracted_text or extracted_text.strip() == "":
-                if os.path.exists(file_path):
-                    progress.update(task, description=f"[cyan]Processing: {os.path.basename(file_path)}")
-                    extracted_text = extract_text_from_image(file_path)
+            backfill_screenshot_text(pending, on_progress=on_progress)
 
-            # Collect all OCR text
-            if extracted_text and extracted_text.strip():
-                all_ocr_texts.append(extracted_text)
+    # Once there's enough OCR text, train the dictionary later days' text is compressed with
+    ensure_text_dictionary()
 
-            progress.advance(task)
+    # OCR text is streamed from the database rather than loaded all at once;
+    # unchanged-screen frames repeat an earlier frame's text, so count distinct screens only
+    text_count = count_screenshots(today_only=True, has_text=True, include_static=False)
 
     # Generate summary using app-based detection (more reliable than keyword extraction)
-    if all_ocr_texts:
-        console.print(f"\n[bold cyan]📱 Analyzing {len(all_ocr_texts)} screenshots with app-based detection...[/bold cyan]")
-
-        # Prepare data for app-based analyzer
-        screenshots_data = []
-        for i, (screenshot_id, file_path, timestamp, extracted_text) in enumerate(screenshots):
-            if extracted_text and extracted_text.strip():
-                screenshots_data.append({
-                    'ocr_text': extracted_text,
-                    'timestamp': timestamp
-                })
+    if text_count:
+        console.print(f"\n[bold cyan]📱 Analyzing {text_count} screenshots with app-based detection...[/bold cyan]")
+
+        # Prepare data for app-based analyzer: each distinct text once, weighted by how many
+        # screenshots showed it (a generator, consumed in one streaming pass)
+        screenshots_data = (
+            {'ocr_text': text, 'timestamp': first_seen, 'count': count, 'static_count': static_count}
+            for text, count, static_count, first_seen, _ in iter_text_occurrences(today_only=True)
+        )
 
         # Try AI summarization first if enabled
         formatted_summary = None
@@ -175,8 +177,25 @@ def process_and_generate_summary():
             console.print(f"\n[bold magenta]🤖 Generating AI-powered narrative summary...[/bold magenta]")
             is_friday = datetime.now().weekday() == 4
 
+            # The model only sees a sample of the day: distinct texts, picked in proportion to
+            # how long each was on screen, each sent once with its screenshot count
+            screen_time = count_screenshots(today_only=True, has_text=True)
+            step = screen_time / AI_SAMPLE_SIZE
+            sampled_ocr_texts = []
+            sampled_counts = []
+            seen = 0
+            for text, count, _, _, _ in iter_text_occurrences(today_only=True):
+                # Take a text when its screenshots cross the next multiple of step
+                if int((seen + count) / step) > int(seen / step):
+                    sampled_ocr_texts.append(text)
+                    sampled_counts.append(count)
+                seen += count
+            if len(sampled_ocr_texts) < text_count:
+                console.print(f"[cyan]📊 Sampled {len(sampled_ocr_texts)} distinct screens of {text_count} screenshots[/cyan]")
+
             with console.status("[bold green]Analyzing with AI...", spinner="dots"):
-                ai_summary = summarize_work_with_ai(all_ocr_texts, OLLAMA_API_URL, OLLAMA_MODEL, is_friday)
+                ai_summary = summarize_work_with_ai(sampled_ocr_texts, OLLAMA_API_URL, OLLAMA_MODEL, is_friday,
+                                                    counts=sampled_counts)
 
             if ai_summary and ai_summary.get('tasks_worked_on'):
                 console.print("[bold green]✅ AI summary generated successfully[/bold green]")
@@ -201,21 +220,29 @@ def process_and_generate_summary():
         ))
         console.print()
 
+        # Time per window, from the run-length encoded window spans
+        window_totals = get_window_time_totals(limit=10)
+        if window_totals:
+            window_table = Table(title="[bold]🪟 Time by Window[/bold]", box=box.ROUNDED, border_style="cyan")
+            window_table.add_column("Window", style="cyan", overflow="ellipsis", max_width=60)
+            window_table.add_column("Time", style="bold green", justify="right")
+            window_table.add_column("Visits", justify="right")
+            for title, seconds, spans in window_totals:
+                window_table.add_row(title, f"{seconds // 3600}h {seconds % 3600 // 60:02d}m", str(spans))
+            console.print(window_table)
+            console.print()
+
         # Send to Discord if enabled
         if SEND_TO_DISCORD and DISCORD_WEBHOOK_URL:
             console.print("[bold blue]📤 Sending summary to Discord...[/bold blue]")
             send_summary_to_discord(DISCORD_WEBHOOK_URL, formatted_summary)
         elif SEND_TO_DISCORD and not DISCORD_WEBHOOK_URL:
             console.print("[yellow]⚠️  Discord notifications enabled but webhook URL not configured[/yellow]")
-
-        # Clean up screenshots after summary is generated
-        cleanup_screenshots()
-
-        # Clean up database - delete all logs and screenshots
-        clear_all_database_data()
     else:
         console.print("[yellow]No text extracted from screenshots.[/yellow]")
 
+    expire_old_data()
+
 
 def run_scheduled_tracker():
     """
@@ -224,9 +251,22 @@ def run_scheduled_tracker():
     """
     init_db()
 
+    # A session (or pause) left open means the last run didn't shut down cleanly
+    close_session("stopped")
+
+    # Catch up on expiry missed while the tracker wasn't running at the end of a day
+    expire_old_data()
+
     # Check if liveness detection is available
     liveness_enabled = is_liveness_available()
 
+    # Capture cadence: backs off while idle when adaptive capture is on, fixed otherwise
+    capture_interval = AdaptiveCaptureInterval() if ADAPTIVE_CAPTURE else AdaptiveCaptureInterval(max_interval=SCREENSHOT_INTERVAL)
+    if capture_interval.max_interval > capture_interval.min_interval:
+        interval_description = f"{capture_interval.min_interval}-{capture_interval.max_interval:.0f} seconds (adaptive)"
+    else:
+        interval_description = f"{SCREENSHOT_INTERVAL} seconds"
+
     # Create startup banner
     console.print()
     liveness_status = "[green]Enabled ✓[/green]" if liveness_enabled else "[yellow]Disabled (opencv not installed)[/yellow]"
@@ -234,7 +274,7 @@ def run_scheduled_tracker():
         f"[bold green]🚀 Activity Tracker Service Started[/bold green]\n\n"
         f"[cyan]📅 Work hours:[/cyan] {WORK_START_TIME} - {WORK_END_TIME}\n"
         f"[cyan]📆 Work days:[/cyan] {', '.join(['Mon', 'Tue', 'Wed', 'Thu', 'Fri'][day] for day in WORK_DAYS)}\n"
-        f"[cyan]📸 Screenshot interval:[/cyan] {SCREENSHOT_INTERVAL} seconds\n"
+        f"[cyan]📸 Screenshot interval:[/cyan] {interval_description}\n"
         f"[cyan]👤 Liveness detection:[/cyan] {liveness_status}\n\n"
         f"[yellow]⌨️  Controls:[/yellow]\n"
         f"  [bold]P[/bold] - Pause tracking\n"
@@ -250,41 +290,61 @@ def run_scheduled_tracker():
     if liveness_enabled:
         console.print("[cyan]👤 Liveness checks will run every 30 minutes[/cyan]\n")
 
-    session_logs = []
+    # OCR runs on background workers so capture and window tracking keep their cadence
+    ocr_pipeline = OCRPipeline()
+    ocr_pipeline.start()
+
+    window_tracker = WindowSpanTracker()  # writes window spans to the logs table as titles change
     last_status = None
     last_screenshot_time = time.time()
     last_minute_log = time.time()
     last_liveness_check = time.time()  # Track liveness check timing
     screenshot_count = 0
+    static_frame_count = 0
+    last_frame_hash = None  # perceptual hash of the last OCR'd frame
+    last_frame_id = None
+    last_content_hash = None
     activity_count = 0
     liveness_check_count = 0
     is_paused = False
     pause_start_time = None
+    pause_session_id = None  # sessions row of the current pause
     total_pause_time = 0
 
     def on_press(key):
         """Handle keyboard input for pause/resume."""
-        nonlocal is_paused, pause_start_time, total_pause_time
+        nonlocal is_paused, pause_start_time, pause_session_id, total_pause_time
 
+        capture_interval.record_input()
         try:
             if hasattr(key, 'char'):
                 if key.char == 'p' or key.char == 'P':
                     if not is_paused:
                         is_paused = True
                         pause_start_time = time.time()
+                        pause_session_id = start_pause()
                         console.print(f"\n[bold yellow]⏸️  [{datetime.now().strftime('%H:%M:%S')}] PAUSED[/bold yellow] - Press 'R' to resume")
                 elif key.char == 'r' or key.char == 'R':
                     if is_paused:
                         is_paused = False
                         if pause_start_time:
                             total_pause_time += time.time() - pause_start_time
+                        if pause_session_id is not None:
+                            end_pause(pause_session_id)
+                            pause_session_id = None
                         console.print(f"\n[bold green]▶️  [{datetime.now().strftime('%H:%M:%S')}] RESUMED[/bold green] - Tracking active")
         except AttributeError:
             pass
 
-    # Start keyboard listener in background
+    def on_mouse_activity(*args):
+        """Mouse movement, clicks and scrolling count as activity for the capture cadence."""
+        capture_interval.record_input()
+
+    # Start keyboard and mouse listeners in background
     listener = keyboard.Listener(on_press=on_press)
     listener.start()
+    mouse_listener = mouse.Listener(on_move=on_mouse_activity, on_click=on_mouse_activity, on_scroll=on_mouse_activity)
+    mouse_listener.start()
 
     try:
         while True:
@@ -295,43 +355,71 @@ def run_scheduled_tracker():
                 if current_status:
                     console.print(f"[bold green]✅ [{datetime.now().strftime('%H:%M:%S')}] Work hours started[/bold green] - tracking active")
                     last_screenshot_time = time.time()  # Reset screenshot timer
+                    capture_interval.reset()
                     last_minute_log = time.time()
                     screenshot_count = 0
+                    static_frame_count = 0
+                    last_frame_hash = None
+                    last_frame_id = None
                     activity_count = 0
                 else:
                     console.print(f"[bold yellow]⏸️  [{datetime.now().strftime('%H:%M:%S')}] Work hours ended[/bold yellow] - generating summary...")
 
-                    # Save activity logs
-                    if session_logs:
-                        save_logs(session_logs)
-                        session_logs = []
+                    # Close the open window span and work session
+                    window_tracker.close()
+                    close_session("work_hours")
 
-                    # Process screenshots and generate summary
+                    # Let queued OCR finish, then process screenshots and generate summary
+                    ocr_pipeline.join()
                     process_and_generate_summary()
 
                     console.print(f"\n[cyan]📸 Total screenshots captured today: {screenshot_count}[/cyan]")
                     screenshot_count = 0
+                    static_frame_count = 0
+                    last_frame_hash = None
+                    last_frame_id = None
                     activity_count = 0
 
                 last_status = current_status
 
             # Track activity if within work hours AND not paused
             if current_status and not is_paused:
-                activity = track_single_activity()
-                if activity:
-                    session_logs.append(activity)
+                if window_tracker.observe(track_single_activity()):
                     activity_count += 1
 
                 # Capture screenshot at intervals
                 current_time = time.time()
-                if current_time - last_screenshot_time >= SCREENSHOT_INTERVAL:
-                    screenshot_path = capture_screenshot(SCREENSHOT_DIR)
-                    if screenshot_path:
-                        # Extract text immediately
-                        extracted_text = extract_text_from_image(screenshot_path)
-                        # Save to database
-                        save_screenshot(screenshot_path, extracted_text)
+                if current_time - last_screenshot_time >= capture_interval.next_interval():
+                    frame = capture_frame()
+                    # Path of the kept image or thumbnail, "" in diskless mode, None on failure
+                    screenshot_path = store_frame(frame, screenshot_day_dir()) if frame is not None else None
+                    if screenshot_path is not None:
+                        frame_hash = dhash(frame) if PHASH_DEDUP_ENABLED else None
+                        phash = hash_to_hex(frame_hash) if frame_hash is not None else None
+                        frame_content_hash = content_hash(frame)
+                        frame_changed = frame_content_hash != last_content_hash
+                        last_content_hash = frame_content_hash
+                        # A thumbnail is only a preview: the frame's text must come from the OCR queue
+                        thumbnail = bool(screenshot_path) and SCREENSHOT_STORAGE == "thumbnail"
+
+                        if (frame_hash is not None and last_frame_hash is not None
+                                and hamming_distance(frame_hash, last_frame_hash) <= PHASH_THRESHOLD):
+                            # Screen unchanged - point at the last OCR'd frame instead of running OCR
+                            save_screenshot(screenshot_path, phash=phash, duplicate_of=last_frame_id,
+                                            content_hash=frame_content_hash, thumbnail=thumbnail)
+                            static_frame_count += 1
+                            frame_changed = False
+                        else:
+                            # Save to database now so the timestamp reflects capture time,
+                            # then hand the frame to the OCR workers
+                            screenshot_id = save_screenshot(screenshot_path, phash=phash,
+                                                            content_hash=frame_content_hash, thumbnail=thumbnail)
+                            # Queue the in-memory frame (grayscale to keep the queue small)
+                            ocr_pipeline.submit(screenshot_id, frame.convert("L"), frame_content_hash)
+                            last_frame_hash = frame_hash
+                            last_frame_id = screenshot_id
                         screenshot_count += 1
+                        capture_interval.record_frame(frame_changed, current_time)
 
                     last_screenshot_time = current_time
 
@@ -361,13 +449,33 @@ def run_scheduled_tracker():
                 if current_time - last_minute_log >= 60:
                     table = Table(show_header=False, box=None, padding=(0, 1))
                     table.add_row("[bold cyan]⏱️  Status Update[/bold cyan]", f"[dim]{datetime.now().strftime('%H:%M:%S')}[/dim]")
-                    table.add_row("[cyan]📸 Screenshots[/cyan]", f"[bold]{screenshot_count}[/bold]")
-                    table.add_row("[cyan]📝 Activities[/cyan]", f"[bold]{activity_count}[/bold]")
+                    table.add_row("[cyan]📸 Screenshots[/cyan]", f"[bold]{screenshot_count}[/bold] [dim]({static_frame_count} unchanged, OCR skipped)[/dim]")
+                    table.add_row("[cyan]📝 Activities[/cyan]", f"[bold]{activity_count}[/bold] [dim](window switches)[/dim]")
+                    table.add_row(
+                        "[cyan]⏲️  Capture Interval[/cyan]",
+                        f"[bold]{capture_interval.interval:.0f}s[/bold] [dim]({'idle' if capture_interval.is_idle() else 'active'})[/dim]"
+                    )
+                    ocr_stats = ocr_pipeline.stats()
+                    table.add_row(
+                        "[cyan]🔤 OCR Queue[/cyan]",
+                        f"[bold]{ocr_stats['queue_depth']}/{ocr_stats['queue_capacity']}[/bold] "
+                        f"[dim](peak {ocr_stats['peak_depth']}, done {ocr_stats['processed']}, dropped {ocr_stats['dropped']})[/dim]"
+                    )
+                    cache_stats = get_ocr_cache().stats()
+                    table.add_row(
+                        "[cyan]🗃️  OCR Cache[/cyan]",
+                        f"[bold]{cache_stats['hits']}[/bold] hits / [bold]{cache_stats['misses']}[/bold] misses "
+                        f"[dim]({cache_stats['hit_rate'] * 100:.0f}% hit rate)[/dim]"
+                    )
                     if liveness_enabled:
                         table.add_row("[cyan]👤 Liveness Checks[/cyan]", f"[bold]{liveness_check_count}[/bold]")
                     console.print(table)
                     last_minute_log = current_time
 
+            else:
+                # Not tracking (paused or outside work hours) - end the open window span
+                window_tracker.close()
+
             # Show paused status every minute when paused
             if is_paused:
                 current_time = time.time()
@@ -381,12 +489,20 @@ def run_scheduled_tracker():
     except KeyboardInterrupt:
         console.print("\n\n[bold red]🛑 Service stopped by user[/bold red]")
 
-        # Stop keyboard listener
+        # Stop keyboard and mouse listeners
         listener.stop()
+        mouse_listener.stop()
+
+        # Finish OCR for frames still in the queue
+        console.print("[cyan]🔤 Finishing queued OCR...[/cyan]")
+        ocr_pipeline.stop(drain=True)
+        ocr_stats = ocr_pipeline.stats()
 
-        # Save any remaining logs
-        if session_logs:
-            save_logs(session_logs)
+        # Close the open window span, work session and pause
+        window_tracker.close()
+        if pause_session_id is not None:
+            end_pause(pause_session_id)
+        close_session("stopped")
 
         # Process and generate final summary
         console.print("\n[bold cyan]Generating final summary...[/bold cyan]")
@@ -398,8 +514,12 @@ def run_scheduled_tracker():
         stats_table.add_column("Value", style="bold green")
 
         stats_table.add_row("📸 Total Screenshots", str(screenshot_count))
+        stats_table.add_row("🔤 OCR Dropped (deferred)", str(ocr_stats['dropped']))
         stats_table.add_row("⏸️  Total Pause Time", f"{int(total_pause_time / 60)} minutes")
-        stats_table.add_row("⏱️  Active Tracking Time", f"{int((time.time() - last_status if last_status else 0 - total_pause_time) / 60)} minutes")
+        session_totals = get_session_totals()
+        stats_table.add_row("⏱️  Active Time Today",
+                            f"{int(session_totals['active_seconds'] / 60)} minutes "
+                            f"in {session_totals['sessions']} session(s)")
 
         console.print()
         console.print(stats_table)
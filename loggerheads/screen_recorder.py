@@ -1,29 +1,32 @@
-import os
 import time
-import subprocess
 from datetime import datetime
 from pathlib import Path
+from .capture_backends import get_capture_backend
+from .frame_encoder import get_frame_encoder
+from .config import SCREENSHOT_STORAGE, THUMBNAIL_SIZE
+
+_backend = None
+
+
+def get_backend():
+    """Get the capture backend for this process, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = get_capture_backend()
+    return _backend
 
 
 def check_screen_recording_permission():
     """
-    Check if the app has screen recording permission on macOS.
-    Returns True if permission is granted, False otherwise.
+    Check if the app can capture the screen (screen recording permission on macOS).
+    Returns True if a test frame can be captured, False otherwise.
     """
     try:
-        # Try to take a test screenshot to check permissions
-        test_path = "/tmp/test_screenshot.png"
-        result = subprocess.run(
-            ["screencapture", "-x", test_path],
-            capture_output=True,
-            timeout=2
-        )
-
-        # Check if file was created
-        if os.path.exists(test_path):
-            os.remove(test_path)
-            return True
-        return False
+        backend = get_backend()
+        if backend is None:
+            print("No screen capture backend available (install mss, or run on macOS)")
+            return False
+        return backend.grab() is not None
     except Exception as e:
         print(f"Permission check failed: {e}")
         return False
@@ -39,10 +42,23 @@ def ensure_screenshot_directory(directory="screenshots"):
     return screenshot_dir.absolute()
 
 
-def capture_screenshot(save_directory="screenshots"):
+def capture_frame():
     """
-    Capture a single screenshot and save it with a timestamp.
-    Returns the file path of the captured screenshot, or None if failed.
+    Capture a single frame in memory using the configured capture backend.
+    Returns a PIL image, or None if capture failed.
+    """
+    backend = get_backend()
+    if backend is None:
+        print("Screenshot capture failed: no capture backend available")
+        return None
+    return backend.grab()
+
+
+def save_frame(image, save_directory="screenshots", encoder=None):
+    """
+    Save a captured frame with a timestamped filename.
+    Uses the configured storage encoder (PNG by default, or WebP/JPEG) unless one is given.
+    Returns the file path of the saved screenshot, or None if failed.
     """
     try:
         # Ensure directory exists
@@ -50,27 +66,63 @@ def capture_screenshot(save_directory="screenshots"):
 
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"screenshot_{timestamp}.png"
-        filepath = screenshot_dir / filename
-
-        # Capture screenshot using macOS screencapture utility
-        # -x: don't play sound
-        # -C: capture cursor (optional, remove if you don't want cursor)
-        result = subprocess.run(
-            ["screencapture", "-x", str(filepath)],
-            capture_output=True,
-            timeout=5
-        )
-
-        if result.returncode == 0 and filepath.exists():
-            return str(filepath)
-        else:
-            print(f"Screenshot capture failed: {result.stderr.decode()}")
-            return None
+        filepath = screenshot_dir / f"screenshot_{timestamp}"
+
+        return (encoder or get_frame_encoder()).save(image, str(filepath))
 
     except Exception as e:
-        print(f"Error capturing screenshot: {e}")
+        print(f"Error saving screenshot: {e}")
+        return None
+
+
+def save_thumbnail(image, save_directory="screenshots"):
+    """
+    Save a small JPEG preview of a captured frame.
+    Returns the file path of the thumbnail, or None if failed.
+    """
+    try:
+        screenshot_dir = ensure_screenshot_directory(save_directory)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = screenshot_dir / f"screenshot_{timestamp}_thumb.jpg"
+
+        thumbnail = image.convert("RGB")
+        thumbnail.thumbnail(THUMBNAIL_SIZE)
+        thumbnail.save(filepath, "JPEG", quality=70)
+        return str(filepath)
+
+    except Exception as e:
+        print(f"Error saving thumbnail: {e}")
+        return None
+
+
+def store_frame(image, save_directory="screenshots", storage=SCREENSHOT_STORAGE):
+    """
+    Persist a captured frame according to the storage mode.
+
+    Args:
+        image (PIL.Image.Image): Captured frame
+        save_directory (str): Directory for screenshot files
+        storage (str): "full", "thumbnail" or "none"
+
+    Returns:
+        str: Path of the stored file, "" when nothing is kept on disk, or None if saving failed
+    """
+    if storage == "none":
+        return ""
+    if storage == "thumbnail":
+        return save_thumbnail(image, save_directory)
+    return save_frame(image, save_directory)
+
+
+def capture_screenshot(save_directory="screenshots"):
+    """
+    Capture a single screenshot and save it with a timestamp.
+    Returns the file path of the captured screenshot, or None if failed.
+    """
+    image = capture_frame()
+    if image is None:
         return None
+    return save_frame(image, save_directory)
 
 
 def record_screen(duration=10, interval=30, save_directory="screenshots"):
@@ -130,7 +182,7 @@ def cleanup_old_screenshots(directory="screenshots", days_to_keep=7):
         days_in_seconds = days_to_keep * 24 * 60 * 60
         deleted_count = 0
 
-        for file_path in screenshot_dir.glob("screenshot_*.png"):
+        for file_path in screenshot_dir.glob("screenshot_*"):
             file_age = current_time - file_path.stat().st_mtime
             if file_age > days_in_seconds:
                 file_path.unlink()
@@ -252,18 +252,21 @@ def detect_completion_indicators(text):
     return completed
 
 
-def analyze_text(text):
+def analyze_text(text, count=1):
     """
     Perform comprehensive analysis on extracted text focusing on work content.
 
     Args:
         text (str): Text to analyze
+        count (int): Number of screenshots that showed this exact text; the text is
+            analyzed once and its topics and words are weighted by this count
 
     Returns:
         dict: Dictionary containing all analysis results
     """
     if not text or not text.strip():
         return {
+            'count': count,
             'tasks': [],
             'completed': [],
             'problems': [],
@@ -283,6 +286,7 @@ def analyze_text(text):
     solana = extract_solana_news(text)
 
     return {
+        'count': count,
         'tasks': tasks,
         'completed': completed,
         'problems': problems,
@@ -299,7 +303,7 @@ def generate_frequency_summary(analysis_results):
     Generate work-focused summary from multiple analysis results.
 
     Args:
-        analysis_results (list): List of analysis result dictionaries
+        analysis_results (list): List of analysis result dictionaries (weighted by their 'count')
 
     Returns:
         dict: Summary with work accomplishments and topics
@@ -309,19 +313,24 @@ def generate_frequency_summary(analysis_results):
     all_problems = []
     all_learning = []
     all_code = []
-    all_topics = []
+    topic_counts = Counter()
     all_solana = []
     total_words = 0
+    total_sessions = 0
 
     for result in analysis_results:
+        # A result may cover several screenshots with identical text
+        count = result.get('count', 1)
         all_tasks.extend(result.get('tasks', []))
         all_completed.extend(result.get('completed', []))
         all_problems.extend(result.get('problems', []))
         all_learning.extend(result.get('learning', []))
         all_code.extend(result.get('code_snippets', []))
-        all_topics.extend(result.get('technical_topics', []))
+        for topic in result.get('technical_topics', []):
+            topic_counts[topic] += count
         all_solana.extend(result.get('solana_news', []))
-        total_words += result.get('word_count', 0)
+        total_words += result.get('word_count', 0) * count
+        total_sessions += count
 
     return {
         'tasks': all_tasks,
@@ -329,10 +338,10 @@ def generate_frequency_summary(analysis_results):
         'problems': all_problems,
         'learning': all_learning,
         'code_snippets': list(set(all_code)),  # Deduplicate
-        'technical_topics': Counter(all_topics).most_common(15),
+        'technical_topics': topic_counts.most_common(15),
         'solana_news': list(set(all_solana)),  # Deduplicate
         'total_word_count': total_words,
-        'total_sessions': len(analysis_results)
+        'total_sessions': total_sessions
     }
 
 
@@ -0,0 +1,311 @@
+"""
+OCR text compression.
+OCR text is highly repetitive: the same IDE chrome, menu bars and browser tabs are
+on thousands of frames. Texts are stored compressed against a dictionary trained on
+the user's own screens, which captures that shared boilerplate far better than
+compressing each short text on its own.
+
+Stored values are either plain TEXT (short texts, or compression turned off) or a
+BLOB: one codec byte, the 4-byte id of the dictionary in text_dictionaries (0 for
+none), then the compressed text. Every connection registers decompress_text as the
+SQL function ocr_text(), so queries decompress only the rows they return.
+"""
+
+import struct
+import threading
+import zlib
+from .db_connection import get_connection, transaction
+from .config import (TEXT_COMPRESSION, TEXT_COMPRESSION_MIN_BYTES, TEXT_DICTIONARY_SIZE,
+                     TEXT_DICTIONARY_SAMPLES, TEXT_DICTIONARY_MIN_SAMPLES)
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib with a preset dictionary is used instead
+    zstandard = None
+
+HEADER = struct.Struct(">BI")  # codec, dictionary id
+CODEC_ZLIB = ord("D")  # raw deflate, dictionary as zdict
+CODEC_ZSTD = ord("Z")
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 9
+
+_lock = threading.RLock()
+_dictionaries = {}  # (db_path, dictionary id) -> (codec, dictionary bytes); stored dictionaries never change
+_active = {}  # db_path -> id of the dictionary new texts are compressed with (None: no dictionary yet)
+_zstd_compressors = {}  # (db_path, dictionary id) -> zstandard.ZstdCompressor
+_zstd_decompressors = {}  # (db_path, dictionary id) -> zstandard.ZstdDecompressor
+
+
+def _resolve(db_path):
+    if db_path is None:
+        from .database import get_db_path
+        db_path = get_db_path()
+    return db_path
+
+
+def _load_dictionary(db_path, dictionary_id):
+    key = (db_path, dictionary_id)
+    if key not in _dictionaries:
+        row = get_connection(db_path).execute(
+            "SELECT codec, dictionary FROM text_dictionaries WHERE id = ?", (dictionary_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Text dictionary {dictionary_id} is missing")
+        _dictionaries[key] = (row[0], bytes(row[1]))
+    return _dictionaries[key]
+
+
+def _zstd_for(cache, factory, db_path, dictionary_id):
+    key = (db_path, dictionary_id)
+    if key not in cache:
+        if zstandard is None:
+            raise RuntimeError("Text was compressed with zstd; install the zstandard package to read it")
+        if dictionary_id:
+            data = zstandard.ZstdCompressionDict(_load_dictionary(db_path, dictionary_id)[1])
+            cache[key] = factory(dict_data=data)
+        else:
+            cache[key] = factory()
+    return cache[key]
+
+
+def active_dictionary(db_path=None):
+    """
+    Get the dictionary new texts are compressed with: the newest one in the database.
+    Looked up once per process, so a tracker keeps its dictionary until restarted.
+
+    Args:
+        db_path (str, optional): Database file (defaults to the standard path)
+
+    Returns:
+        int: Dictionary id, or None if none has been trained yet
+    """
+    db_path = _resolve(db_path)
+    with _lock:
+        if db_path not in _active:
+            row = get_connection(db_path).execute("SELECT MAX(id) FROM text_dictionaries").fetchone()
+            _active[db_path] = row[0]
+        return _active[db_path]
+
+
+def compress_text(text, db_path=None, dictionary_id=None):
+    """
+    Encode OCR text for storage.
+
+    Args:
+        text (str): OCR text
+        db_path (str, optional): Database file (defaults to the standard path)
+        dictionary_id (int, optional): Dictionary to use (defaults to the active one)
+
+    Returns:
+        str or bytes: The text itself if it's short, compression is off or doesn't
+            help, otherwise the compressed BLOB
+    """
+    if not TEXT_COMPRESSION or not text or len(text) < TEXT_COMPRESSION_MIN_BYTES or not text.strip():
+        return text
+
+    db_path = _resolve(db_path)
+    if dictionary_id is None:
+        dictionary_id = active_dictionary(db_path) or 0
+    raw = text.encode("utf-8")
+
+    with _lock:
+        codec = _load_dictionary(db_path, dictionary_id)[0] if dictionary_id else (
+            "zstd" if zstandard is not None else "zlib")
+        if codec == "zstd":
+            compressor = _zstd_for(_zstd_compressors, lambda **kw: zstandard.ZstdCompressor(level=ZSTD_LEVEL, **kw),
+                                   db_path, dictionary_id)
+            payload = HEADER.pack(CODEC_ZSTD, dictionary_id) + compressor.compress(raw)
+        else:
+            zdict = _load_dictionary(db_path, dictionary_id)[1] if dictionary_id else None
+            compressor = (zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -15, zdict=zdict) if zdict
+                          else zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -15))
+            payload = HEADER.pack(CODEC_ZLIB, dictionary_id) + compressor.compress(raw) + compressor.flush()
+
+    return payload if len(payload) < len(raw) else text
+
+
+def decompress_text(value, db_path=None):
+    """
+    Decode a stored OCR text value (registered on every connection as ocr_text()).
+
+    Args:
+        value (str or bytes): Stored value
+        db_path (str, optional): Database file (defaults to the standard path)
+
+    Returns:
+        str: The OCR text (None stays None)
+    """
+    if value is None or isinstance(value, str):
+        return value
+
+    codec, dictionary_id = HEADER.unpack_from(value)
+    body = bytes(value[HEADER.size:])
+    db_path = _resolve(db_path)
+
+    with _lock:
+        if codec == CODEC_ZSTD:
+            decompressor = _zstd_for(_zstd_decompressors, zstandard.ZstdDecompressor if zstandard else None,
+                                     db_path, dictionary_id)
+            raw = decompressor.decompress(body)
+        elif codec == CODEC_ZLIB:
+            zdict = _load_dictionary(db_path, dictionary_id)[1] if dictionary_id else None
+            decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+            raw = decompressor.decompress(body) + decompressor.flush()
+        else:
+            raise ValueError(f"Unknown text codec {codec!r}")
+    return raw.decode("utf-8")
+
+
+def _train_zlib_dictionary(samples, size):
+    """
+    Build a zlib preset dictionary from lines that recur across samples.
+    Deflate finds matches cheapest at short distances, so the most valuable
+    lines (frequency x length) go at the end of the dictionary.
+    """
+    document_counts = {}
+    for sample in samples:
+        for line in {line.strip() for line in sample.splitlines()}:
+            if len(line) >= 4:
+                document_counts[line] = document_counts.get(line, 0) + 1
+
+    ranked = sorted(
+        (line for line, count in document_counts.items() if count > 1),
+        key=lambda line: document_counts[line] * len(line),
+        reverse=True
+    )
+
+    chosen = []
+    used = 0
+    for line in ranked:
+        encoded = line.encode("utf-8") + b"\n"
+        if used + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        used += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+def train_text_dictionary(db_path=None, sample_count=TEXT_DICTIONARY_SAMPLES, codec=None, samples=None):
+    """
+    Train a compression dictionary on the most recent distinct OCR texts and make
+    it the active one.
+
+    Args:
+        db_path (str, optional): Database file (defaults to the standard path)
+        sample_count (int): Distinct texts to train on
+        codec (str, optional): "zstd" or "zlib" (defaults to zstd when installed)
+        samples (list, optional): Distinct texts to train on instead of the stored ones
+
+    Returns:
+        int: New dictionary id, or None if there's too little text to train on
+    """
+    db_path = _resolve(db_path)
+    if samples is None:
+        rows = get_connection(db_path).execute(
+            "SELECT ocr_text(text) FROM ocr_texts ORDER BY id DESC LIMIT ?", (sample_count,)
+        ).fetchall()
+        samples = [text for (text,) in rows]
+    if len(samples) < TEXT_DICTIONARY_MIN_SAMPLES:
+        return None
+
+    if codec is None:
+        codec = "zstd" if zstandard is not None else "zlib"
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("zstd dictionaries need the zstandard package")
+
+    dictionary = None
+    if codec == "zstd":
+        try:
+            trained = zstandard.train_dictionary(TEXT_DICTIONARY_SIZE, [text.encode("utf-8") for text in samples])
+            codec, dictionary = "zstd", trained.as_bytes()
+        except zstandard.ZstdError:
+            codec = "zlib"  # too few or too uniform samples for zstd's trainer
+    if dictionary is None:
+        dictionary = _train_zlib_dictionary(samples, min(TEXT_DICTIONARY_SIZE, 32 * 1024))
+    if not dictionary:
+        return None
+
+    with transaction(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO text_dictionaries (codec, dictionary, sample_count) VALUES (?, ?, ?)",
+            (codec, dictionary, len(samples))
+        )
+        dictionary_id = cursor.lastrowid
+
+    with _lock:
+        _active[db_path] = dictionary_id
+    return dictionary_id
+
+
+def ensure_text_dictionary(db_path=None):
+    """
+    Train the first dictionary once enough OCR text has been collected.
+
+    Returns:
+        int: Active dictionary id, or None if there isn't one yet
+    """
+    if not TEXT_COMPRESSION:
+        return None
+    return active_dictionary(db_path) or train_text_dictionary(db_path)
+
+
+def recompress_texts(db_path=None):
+    """
+    Re-encode stored texts that aren't compressed with the active dictionary
+    (plain text, or an older dictionary), one committed chunk at a time.
+
+    Args:
+        db_path (str, optional): Database file (defaults to the standard path)
+
+    Returns:
+        int: Number of rows rewritten
+    """
+    from .migrations import backfill_in_chunks
+
+    db_path = _resolve(db_path)
+    if not TEXT_COMPRESSION:
+        return 0
+    dictionary_id = active_dictionary(db_path) or 0
+    rewritten = 0
+
+    def apply_chunk(cursor, rows):
+        nonlocal rewritten
+        updates = []
+        for row_id, value in rows:
+            encoded = compress_text(decompress_text(value, db_path), db_path, dictionary_id)
+            if encoded != value:
+                updates.append((encoded, row_id))
+        cursor.executemany("UPDATE ocr_texts SET text = ? WHERE id = ?", updates)
+        rewritten += len(updates)
+
+    backfill_in_chunks(
+        get_connection(db_path),
+        "SELECT id, text FROM ocr_texts WHERE id > ? AND length(text) >= ? "
+        "AND (typeof(text) = 'text' OR substr(text, 2, 4) != ?) ORDER BY id LIMIT ?",
+        apply_chunk,
+        params=(TEXT_COMPRESSION_MIN_BYTES, struct.pack(">I", dictionary_id))
+    )
+    return rewritten
+
+
+def compression_stats(db_path=None):
+    """
+    Get how much space stored OCR text takes.
+
+    Returns:
+        dict: rows (distinct texts), compressed_rows, stored_bytes, dictionary_id and codec
+    """
+    db_path = _resolve(db_path)
+    rows, compressed, stored = get_connection(db_path).execute(
+        "SELECT COUNT(*), SUM(typeof(text) = 'blob'), "
+        "COALESCE(SUM(length(CAST(text AS BLOB))), 0) FROM ocr_texts"
+    ).fetchone()
+    dictionary_id = active_dictionary(db_path)
+    return {
+        'rows': rows,
+        'compressed_rows': compressed or 0,
+        'stored_bytes': stored,
+        'dictionary_id': dictionary_id,
+        'codec': _load_dictionary(db_path, dictionary_id)[0] if dictionary_id else None,
+    }
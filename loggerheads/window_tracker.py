@@ -0,0 +1,93 @@
+"""
+Active-window span tracking.
+Polled window titles are run-length encoded: consecutive samples of the same title
+become one (title, start, end) span, written when the title changes and extended
+periodically while it doesn't, so nothing accumulates in memory during the day.
+"""
+
+import time
+from .database import save_log_span, utc_timestamp
+from .config import MAX_GAP_SECONDS
+
+SPAN_FLUSH_INTERVAL = 60  # seconds between end-time updates of the open span
+
+
+class WindowSpanTracker:
+    """
+    Turns a stream of active-window samples into spans in the logs table.
+
+    A span ends when the title changes, when no window is active, when the
+    tracker is closed (pause, end of work hours), or when samples stop arriving
+    for longer than max_gap seconds (e.g. the machine slept).
+    """
+
+    def __init__(self, flush_interval=SPAN_FLUSH_INTERVAL, max_gap=MAX_GAP_SECONDS):
+        self.flush_interval = flush_interval
+        self.max_gap = max_gap
+        self.title = None
+        self.span_start = None
+        self.span_end = None
+        self.span_count = 0
+        self._log_id = None
+        self._last_flush = None
+
+    def observe(self, title, now=None):
+        """
+        Record one sample of the active window.
+
+        Args:
+            title (str): Active window title, or None if there is none
+            now (float, optional): Sample time (defaults to time.time())
+
+        Returns:
+            bool: True if the sample started a new span
+        """
+        now = now if now is not None else time.time()
+
+        if self.title is not None and now - self.span_end > self.max_gap:
+            self.close()
+
+        if title == self.title:
+            if title is not None:
+                self.span_end = now
+                if now - self._last_flush >= self.flush_interval:
+                    self.flush()
+            return False
+
+        self.close(now)
+        if title is None:
+            return False
+
+        self.title = title
+        self.span_start = self.span_end = self._last_flush = now
+        self._log_id = self._save()
+        self.span_count += 1
+        return True
+
+    def flush(self):
+        """Write the open span's current end time to the database."""
+        if self._log_id is not None:
+            self._save()
+            self._last_flush = self.span_end
+
+    def close(self, now=None):
+        """
+        End the open span.
+
+        Args:
+            now (float, optional): End time; defaults to the last sample of the span
+        """
+        if self.title is None:
+            return
+        if now is not None and now - self.span_end <= self.max_gap:
+            self.span_end = now
+        self.flush()
+        self.title = None
+        self._log_id = None
+
+    def _save(self):
+        try:
+            return save_log_span(self.title, utc_timestamp(self.span_start), utc_timestamp(self.span_end), self._log_id)
+        except Exception as e:
+            print(f"Error saving window span: {e}")
+            return self._log_id
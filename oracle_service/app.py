@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from loggerheads.blockchain import submit_hours, get_vault_info, derive_vault_pda
 from loggerheads.oracle_secure import get_oracle_keypair
+from loggerheads.activity_bitmap import decode as decode_activity, active_minutes
 from solders.pubkey import Pubkey
 
 app = Flask(__name__)
@@ -33,6 +34,13 @@ limiter = Limiter(
     storage_uri="memory://"
 )
 
+# Longest capture interval the oracle accepts from adaptive capture (seconds). The
+# minimum screenshot count is scaled by this server-side value, never by the proof.
+# Keep it in step with the client: at least LOGGERHEADS_SCREENSHOT_MAX_INTERVAL, and
+# at most the tracker's own cap (MAX_GAP_SECONDS - TRACKING_INTERVAL - 1, see
+# loggerheads/adaptive_capture.py), or honest proofs are rejected or the floor is too low.
+MAX_CAPTURE_INTERVAL = int(os.getenv('ORACLE_MAX_CAPTURE_INTERVAL', '50'))
+
 
 def verify_work_proof(proof: dict, hours: float) -> None:
     """
@@ -41,14 +49,17 @@ def verify_work_proof(proof: dict, hours: float) -> None:
     The oracle verifies the employee's proof (screenshots) matches their claimed hours.
     This is separate from the employer's target hours (checked by smart contract).
 
-    Screenshots are taken every 10 seconds during active work.
+    Screenshots are taken every 10 seconds during active work, backing off to at
+    most MAX_CAPTURE_INTERVAL seconds while the user is idle.
     Theoretical max: 360 screenshots/hour (no breaks)
-    Practical with breaks: 200-300 screenshots/hour
+    Practical with breaks: 200-300 screenshots/hour at a fixed 10 second interval
 
     Checks:
     1. Screenshot count is reasonable for claimed hours
-    2. Timestamps are consistent with time span
-    3. Submission is recent (within 48 hours)
+    2. Claimed hours are covered by the per-minute activity bitmap and by the
+       work sessions (if provided)
+    3. Timestamps are consistent with time span
+    4. Submission is recent (within 48 hours)
 
     Args:
         proof: Work proof dict with screenshot_count, first/last timestamps
@@ -62,15 +73,56 @@ def verify_work_proof(proof: dict, hours: float) -> None:
     if screenshot_count == 0:
         raise ValueError("No screenshots provided")
 
-    # Lenient check: At least 60 screenshots per hour
+    # The client reports its longest capture interval; it must be a number within
+    # what the oracle allows, but only the oracle's own limit sets the floor below
+    max_capture_interval = proof.get('max_capture_interval')
+    if max_capture_interval is not None:
+        if isinstance(max_capture_interval, bool) or not isinstance(max_capture_interval, (int, float)):
+            raise ValueError(f"Invalid max_capture_interval: {max_capture_interval!r} is not a number")
+        if not 0 < max_capture_interval <= MAX_CAPTURE_INTERVAL:
+            raise ValueError(
+                f"Capture interval {max_capture_interval}s is outside the allowed range "
+                f"(1-{MAX_CAPTURE_INTERVAL}s)"
+            )
+
+    # Lenient check: At least 250 screenshots per hour at a 10 second interval,
+    # scaled down to the longest interval adaptive capture is allowed to back off to
     # (allows for significant idle time while catching obvious fraud)
-    expected_min_screenshots = max(int(hours * 250), 1)
+    expected_min_screenshots = max(int(hours * 250 * 10 / MAX_CAPTURE_INTERVAL), 1)
     if screenshot_count < expected_min_screenshots:
         raise ValueError(
             f"Too few screenshots: {screenshot_count} for {hours} hours "
             f"(expected at least {expected_min_screenshots})"
         )
 
+    # Check claimed hours against the minutes marked active (if provided);
+    # the client rounds hours to 0.1, so allow that much
+    activity_bitmap = proof.get('activity_bitmap')
+    if activity_bitmap is not None:
+        try:
+            bitmap_hours = active_minutes(decode_activity(activity_bitmap)) / 60
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid activity bitmap: {e}")
+        if hours > bitmap_hours + 0.1:
+            raise ValueError(
+                f"Claimed hours ({hours}h) exceed active minutes in activity bitmap ({bitmap_hours:.1f}h)"
+            )
+
+    # Check claimed hours against the work sessions' total length (if provided);
+    # sessions come in time order without overlaps, so repeating one can't inflate the total
+    sessions = proof.get('sessions')
+    if sessions is not None:
+        try:
+            spans = [(datetime.fromisoformat(start), datetime.fromisoformat(end)) for start, end in sessions]
+            for (_, previous_end), (start, end) in zip([(None, None)] + spans, spans):
+                if end < start or (previous_end is not None and start < previous_end):
+                    raise ValueError("sessions must be in time order and must not overlap")
+            session_hours = sum((end - start).total_seconds() for start, end in spans) / 3600
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid sessions: {e}")
+        if hours > session_hours + 0.1:
+            raise ValueError(f"Claimed hours ({hours}h) exceed work sessions ({session_hours:.1f}h)")
+
     # Check timestamps if provided
     first_time_str = proof.get('first_screenshot_time')
     last_time_str = proof.get('last_screenshot_time')
@@ -36,7 +36,9 @@ setup(
         "pygetwindow>=0.0.9",
         "pillow>=10.0.0",
         "pytesseract>=0.3.10",
+        "numpy>=1.24.0",
         "pynput>=1.7.6",
+        "mss>=9.0.1",
 
         # UI and display
         "rich>=13.0.0",
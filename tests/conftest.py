@@ -0,0 +1,25 @@
+"""
+Shared fixtures: every test gets its own home directory, so the database under
+~/.loggerheads_logs/ is a fresh file that's removed afterwards.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loggerheads.db_connection import close_connection
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """A fresh, migrated database at the standard path under a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from loggerheads.database import init_db, get_db_path
+    path = get_db_path()
+    init_db(path)
+    yield path
+    close_connection()
@@ -0,0 +1,66 @@
+"""
+Tests for per-minute activity bitmaps (activity_bitmap).
+"""
+
+import base64
+from datetime import datetime, timezone
+
+import pytest
+
+from loggerheads.activity_bitmap import (BITMAP_BYTES, MINUTES_PER_DAY, active_blocks, active_minutes, decode,
+                                         empty_bitmap, encode, idle_gaps, mark_active, minute_of_day, summarize)
+
+
+def day_bitmap(*spans):
+    bitmap = empty_bitmap()
+    for first, last in spans:
+        bitmap = mark_active(bitmap, first, last)
+    return bitmap
+
+
+def test_mark_active_sets_inclusive_spans():
+    bitmap = day_bitmap((540, 599), (590, 610), (0, 0), (MINUTES_PER_DAY - 1, MINUTES_PER_DAY + 5))
+
+    assert len(bitmap) == BITMAP_BYTES
+    assert active_minutes(bitmap) == 71 + 1 + 1
+    assert list(active_blocks(bitmap)) == [(0, 1), (540, 611), (MINUTES_PER_DAY - 1, MINUTES_PER_DAY)]
+    # A span going backwards (DST ending) marks nothing
+    assert mark_active(bitmap, 700, 650) == bitmap
+    assert mark_active(None, 700, 650) == empty_bitmap()
+
+
+def test_idle_gaps_and_summary():
+    bitmap = day_bitmap((540, 599), (605, 719), (780, 1019))
+
+    assert idle_gaps(bitmap) == [(600, 605), (720, 780)]
+    assert idle_gaps(bitmap, min_minutes=30) == [(720, 780)]
+    assert summarize(bitmap) == {
+        'active_minutes': 60 + 115 + 240,
+        'first_active': "09:00",
+        'last_active': "16:59",
+        'longest_block_minutes': 240,
+        'longest_block': (780, 1020),
+        'idle_gaps': 2,
+    }
+    assert summarize(empty_bitmap())['first_active'] is None
+
+
+def test_minute_of_day_is_local():
+    moment = datetime(2026, 3, 2, 14, 35, tzinfo=timezone.utc)
+    local = moment.astimezone()
+    assert minute_of_day(moment.strftime("%Y-%m-%d %H:%M:%S")) == local.hour * 60 + local.minute
+
+
+def test_encode_decode_round_trip():
+    bitmap = day_bitmap((540, 1019))
+    assert decode(encode(bitmap)) == bitmap
+    assert decode(encode(None)) == empty_bitmap()
+
+
+@pytest.mark.parametrize("value", [
+    base64.b64encode(bytes(BITMAP_BYTES - 1)).decode("ascii"),
+    "not base64!",
+])
+def test_decode_rejects_malformed_bitmaps(value):
+    with pytest.raises(ValueError):
+        decode(value)
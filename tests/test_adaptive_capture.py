@@ -0,0 +1,20 @@
+"""
+Tests for the activity-adaptive screenshot cadence (adaptive_capture).
+"""
+
+import time
+
+from loggerheads.adaptive_capture import AdaptiveCaptureInterval
+from loggerheads.config import MAX_GAP_SECONDS, TRACKING_INTERVAL
+
+
+def test_longest_interval_stays_under_the_gap_limit_when_late():
+    capture = AdaptiveCaptureInterval(min_interval=10, max_interval=600, idle_after=0, backoff=2.0)
+
+    now = time.time() + 1
+    for _ in range(10):
+        now += capture.record_frame(changed=False, now=now)
+
+    assert capture.interval == capture.max_interval
+    # The capture loop may only notice the interval has passed a tick later
+    assert capture.max_interval + TRACKING_INTERVAL < MAX_GAP_SECONDS
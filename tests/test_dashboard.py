@@ -0,0 +1,36 @@
+"""
+Tests for the live dashboard's recent screenshots panel: static frames (saved as
+duplicates of an earlier frame, without text of their own) show that frame's text.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from loggerheads.database import iter_screenshots, save_screenshot
+
+TEXT = "loggerheads dashboard - recent screenshots"
+
+
+@pytest.fixture
+def static_frame(db_path):
+    """Today's OCR'd frame followed by a static capture of the same screen."""
+    now = datetime.now()
+    source_id = save_screenshot("", TEXT, timestamp=now - timedelta(seconds=10))
+    save_screenshot("", duplicate_of=source_id, timestamp=now)
+    return db_path
+
+
+def test_newest_screenshots_resolve_duplicate_text(static_frame):
+    rows = list(iter_screenshots(("timestamp", "extracted_text"), today_only=True, newest_first=True))
+
+    assert [text for _, text in rows] == [TEXT, TEXT]
+
+
+def test_dashboard_shows_text_of_static_frames(static_frame):
+    pytest.importorskip("pynput")
+    from loggerheads.cli.dashboard import LiveDashboard
+
+    recent = LiveDashboard()._get_recent_screenshots(limit=5)
+
+    assert [row['ocr'] for row in recent] == [TEXT, TEXT]
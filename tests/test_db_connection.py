@@ -0,0 +1,59 @@
+"""
+Tests for the per-thread connection manager (loggerheads/db_connection.py).
+"""
+
+import pytest
+
+from loggerheads.db_connection import get_connection, transaction
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = get_connection(db_path)
+    conn.execute("CREATE TABLE items (name TEXT)")
+    conn.commit()
+    return conn
+
+
+def names(conn):
+    return [name for (name,) in conn.execute("SELECT name FROM items ORDER BY name")]
+
+
+def test_transaction_commits_and_rolls_back(db_path, conn):
+    with transaction(db_path):
+        conn.execute("INSERT INTO items VALUES ('a')")
+    with pytest.raises(RuntimeError):
+        with transaction(db_path):
+            conn.execute("INSERT INTO items VALUES ('b')")
+            raise RuntimeError
+    assert names(conn) == ["a"]
+
+
+def test_nested_transaction_does_not_commit_outer_work(db_path, conn):
+    with pytest.raises(RuntimeError):
+        with transaction(db_path):
+            conn.execute("INSERT INTO items VALUES ('outer')")
+            with transaction(db_path):
+                conn.execute("INSERT INTO items VALUES ('inner')")
+            raise RuntimeError
+    assert names(conn) == []
+
+
+def test_nested_transaction_before_first_write(db_path, conn):
+    with pytest.raises(RuntimeError):
+        with transaction(db_path):
+            with transaction(db_path):
+                conn.execute("INSERT INTO items VALUES ('inner')")
+            raise RuntimeError
+    assert names(conn) == []
+
+
+def test_failed_inner_transaction_rolls_back_only_itself(db_path, conn):
+    with transaction(db_path):
+        conn.execute("INSERT INTO items VALUES ('outer')")
+        with pytest.raises(RuntimeError):
+            with transaction(db_path):
+                conn.execute("INSERT INTO items VALUES ('inner')")
+                raise RuntimeError
+    assert names(conn) == ["outer"]
+    assert not conn.in_transaction
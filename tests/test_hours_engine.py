@@ -0,0 +1,85 @@
+"""
+Tests for the vectorized hours engine (hours_engine): it must agree with the
+daily rollups the tracker keeps incrementally, DST changes included.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from loggerheads.database import get_daily_rollup, local_day_bounds, save_screenshot, _active_seconds
+from loggerheads.db_connection import get_connection
+from loggerheads.hours_engine import active_spans, hours_by_day
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    """Local time in a zone with DST changes."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def save_run(start, count, seed):
+    """Save `count` screenshots from a UTC start, 5-90 seconds apart."""
+    rng = random.Random(seed)
+    moment = start
+    for _ in range(count):
+        save_screenshot("", "", timestamp=moment)
+        moment += timedelta(seconds=rng.choice((5, 10, 10, 10, 30, 60, 61, 90)))
+
+
+def stored_timestamps(db_path):
+    return [ts for (ts,) in get_connection(db_path).execute("SELECT timestamp FROM screenshots ORDER BY timestamp")]
+
+
+def assert_engine_matches_rollups(db_path):
+    timestamps = stored_timestamps(db_path)
+    days = hours_by_day(timestamps, with_activity=True)
+    assert days
+
+    for day, totals in days.items():
+        rollup = get_daily_rollup(day, db_path)
+        assert rollup['screenshot_count'] == totals['screenshot_count']
+        assert rollup['active_seconds'] == totals['active_seconds']
+        assert rollup['activity'] == totals['activity']
+
+        day_timestamps = [ts for ts in timestamps if local_day_bounds(day)[0] <= ts < local_day_bounds(day)[1]]
+        assert _active_seconds(day_timestamps) == totals['active_seconds']
+
+
+def test_engine_matches_incremental_rollups(db_path):
+    # Three days, the last run crossing local midnight
+    midnight = datetime.combine(datetime.now().date() - timedelta(days=3), datetime.min.time()).astimezone()
+    save_run(midnight + timedelta(hours=9), 400, seed=1)
+    save_run(midnight + timedelta(days=1, hours=13), 300, seed=2)
+    save_run(midnight + timedelta(days=2, hours=23, minutes=50), 100, seed=3)
+
+    assert_engine_matches_rollups(db_path)
+
+
+@pytest.mark.parametrize("start", [
+    datetime(2026, 3, 8, 6, 30, tzinfo=timezone.utc),  # 01:30 EST, clocks go forward at 07:00 UTC
+    datetime(2025, 11, 2, 5, 30, tzinfo=timezone.utc),  # 01:30 EDT, clocks go back at 06:00 UTC
+])
+def test_engine_matches_incremental_rollups_across_dst(new_york, db_path, start):
+    save_run(start, 200, seed=4)
+
+    assert_engine_matches_rollups(db_path)
+
+
+def test_active_spans_split_by_gap_day_and_pause():
+    base = int(datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc).timestamp())
+    epochs = [base, base + 10, base + 20, base + 90, base + 100, base + 110, base + 120]
+    pauses = [base + 105]
+
+    spans = active_spans(epochs, pauses=pauses)
+
+    assert [(start - base, end - base, closed_by) for _, start, end, closed_by in spans] == [
+        (0, 20, "gap"), (90, 100, "pause"), (110, 120, None)
+    ]
+    assert hours_by_day(epochs, pauses=pauses)[spans[0][0]]['active_seconds'] == 20 + 10 + 10
@@ -0,0 +1,154 @@
+"""
+Tests for the schema migrations (loggerheads/migrations.py) and the search index
+they maintain.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from loggerheads import migrations
+from loggerheads.database import (get_db_path, get_daily_rollup, get_session_totals, rebuild_daily_rollups,
+                                  save_screenshot, search_screenshots, sync_text_index,
+                                  get_screenshots_pending_ocr, get_daily_report)
+from loggerheads.db_connection import get_connection, close_connection
+
+TEXT = "def migrate(db_path): upgrade the activity database schema"
+
+
+def stored(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def local_noon(days_back):
+    day = datetime.now().date() - timedelta(days=days_back)
+    return datetime.combine(day, datetime.min.time()).astimezone() + timedelta(hours=12)
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A database as the first release left it: version 0, plain text, two days of screenshots."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = get_db_path()
+    conn = sqlite3.connect(path)
+    migrations._create_base_tables(conn.cursor())
+    for days_back in (2, 1):
+        start = local_noon(days_back)
+        for i in range(30):
+            # A 20 minute break after the first 20 screenshots
+            moment = start + timedelta(seconds=10 * i + (1200 if i >= 20 else 0))
+            conn.execute(
+                "INSERT INTO screenshots (file_path, timestamp, extracted_text) VALUES (?, ?, ?)",
+                ("", stored(moment), f"{TEXT} {i % 3}")
+            )
+    conn.commit()
+    conn.close()
+    yield path
+    close_connection()
+
+
+def trigger_sql(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [sql for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'")]
+    finally:
+        conn.close()
+
+
+def test_new_database_is_at_current_version(db_path):
+    assert migrations.get_schema_version(get_connection(db_path)) == migrations.SCHEMA_VERSION
+
+
+def test_migrations_are_listed_in_order():
+    versions = [version for version, *_ in migrations.MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_schema_steps_are_idempotent(db_path):
+    conn = get_connection(db_path)
+    for _, _, schema_step, _ in migrations.MIGRATIONS:
+        if schema_step in (migrations._add_text_compression, migrations._add_text_table):
+            continue  # rebuild the search index of their own version
+        schema_step(conn.cursor())
+    conn.commit()
+
+
+def test_upgrade_from_first_release(legacy_db):
+    assert migrations.migrate(legacy_db) == [version for version, *_ in migrations.MIGRATIONS]
+    conn = get_connection(legacy_db)
+
+    # Text moved into ocr_texts, one row per distinct text, and indexed
+    assert conn.execute("SELECT COUNT(*) FROM ocr_texts").fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(*) FROM screenshots WHERE extracted_text IS NOT NULL").fetchone()[0] == 0
+    assert len(search_screenshots("upgrade schema", db_path=legacy_db)) == 3
+
+    # Rollups, bitmaps and sessions backfilled day by day match a rebuild
+    for days_back in (2, 1):
+        day = local_noon(days_back).date()
+        backfilled = get_daily_rollup(day, legacy_db)
+        assert backfilled['screenshot_count'] == 30
+        assert backfilled['active_seconds'] == 28 * 10
+        assert backfilled['activity'] is not None
+        assert get_session_totals(day, legacy_db)['sessions'] == 2
+
+        rebuild_daily_rollups(day, legacy_db)
+        assert get_daily_rollup(day, legacy_db) == backfilled
+        assert get_session_totals(day, legacy_db)['active_seconds'] == backfilled['active_seconds']
+
+
+def test_triggers_are_plain_sql(db_path):
+    assert not [sql for sql in trigger_sql(db_path) if "ocr_text(" in sql]
+
+
+def test_other_connections_can_delete_screenshots(db_path):
+    save_screenshot("", TEXT)
+    assert len(search_screenshots("activity database", db_path=db_path)) == 1
+
+    # e.g. the sqlite3 shell, which has no ocr_text() function
+    other = sqlite3.connect(db_path)
+    other.execute("DELETE FROM screenshots")
+    other.commit()
+    other.close()
+
+    assert get_connection(db_path).execute("SELECT COUNT(*) FROM ocr_texts").fetchone()[0] == 0
+    assert sync_text_index(db_path) == 1
+    assert search_screenshots("activity database", db_path=db_path) == []
+    assert get_connection(db_path).execute("SELECT COUNT(*) FROM ocr_texts_fts_deleted").fetchone()[0] == 0
+
+
+def test_thumbnail_rows_are_not_backfilled_from_the_preview(legacy_db, tmp_path):
+    conn = sqlite3.connect(legacy_db)
+    for name in ("screenshot_20250102_090000_thumb.jpg", "screenshot_20250102_090010.png"):
+        conn.execute("INSERT INTO screenshots (file_path, timestamp) VALUES (?, ?)",
+                     (str(tmp_path / name), stored(local_noon(3))))
+    conn.commit()
+    conn.close()
+    migrations.migrate(legacy_db)
+
+    save_screenshot(str(tmp_path / "screenshot_20250103_090000_thumb.jpg"), thumbnail=True)
+    save_screenshot(str(tmp_path / "screenshot_20250103_090010.png"))
+
+    pending = [Path(file_path).name for _, file_path in get_screenshots_pending_ocr(legacy_db)]
+    assert pending == ["screenshot_20250102_090010.png", "screenshot_20250103_090010.png"]
+
+
+def test_demo_timestamps_are_normalized_in_every_table(legacy_db):
+    # Demo mode stored local ISO timestamps as given
+    late = (local_noon(1) + timedelta(hours=11, minutes=30)).replace(tzinfo=None)
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("INSERT INTO liveness_checks (timestamp, face_detected, confidence, face_count) VALUES (?, 1, 0.9, 1)",
+                 (late.isoformat(),))
+    conn.execute("INSERT INTO logs (window_name, timestamp) VALUES ('Editor', ?)", (late.isoformat(),))
+    conn.commit()
+    conn.close()
+
+    migrations.migrate(legacy_db)
+
+    conn = get_connection(legacy_db)
+    expected = stored(late.astimezone())
+    assert conn.execute("SELECT timestamp FROM liveness_checks").fetchone()[0] == expected
+    assert conn.execute("SELECT timestamp FROM logs").fetchone()[0] == expected
+    day = get_daily_report(late.date(), late.date(), legacy_db)[0]
+    assert (day['liveness_checks'], day['liveness_passed']) == (1, 1)
@@ -0,0 +1,61 @@
+"""
+Tests for the process-pool OCR backfill (ocr_processor.extract_text_parallel,
+ocr_backfill.backfill_screenshot_text), with a fake engine that reads a frame's
+gray level as its text.
+"""
+
+import multiprocessing
+
+import pytest
+from PIL import Image
+
+from loggerheads import ocr_processor
+from loggerheads.database import get_screenshots, get_screenshots_pending_ocr, save_screenshot
+from loggerheads.ocr_backfill import backfill_screenshot_text
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="worker processes inherit the fake engine by forking")
+
+
+class GrayLevelEngine:
+    def image_to_string(self, image):
+        return f"frame {image.convert('L').getpixel((0, 0))}"
+
+
+@pytest.fixture(autouse=True)
+def gray_level_engine(monkeypatch):
+    monkeypatch.setattr(ocr_processor, "get_ocr_engine", GrayLevelEngine)
+    monkeypatch.setattr(ocr_processor, "OCR_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def frames(tmp_path):
+    paths = []
+    for level in range(0, 240, 20):
+        path = tmp_path / f"screenshot_{level:03d}.png"
+        Image.new("L", (32, 32), level).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_parallel_results_come_back_in_input_order(frames):
+    results = list(ocr_processor.extract_text_parallel(frames, workers=3, chunksize=2))
+
+    assert [path for path, _ in results] == frames
+    assert [text for _, text in results] == [f"frame {level}" for level in range(0, 240, 20)]
+
+
+def test_backfill_writes_text_to_every_row_of_a_file(db_path, frames):
+    for path in frames:
+        save_screenshot(path)
+    save_screenshot(frames[0])  # a second row for the same file
+    pending = get_screenshots_pending_ocr(db_path)
+
+    results = backfill_screenshot_text(pending, workers=2, chunksize=2, batch_size=5)
+
+    assert len(results) == len(frames) + 1
+    assert get_screenshots_pending_ocr(db_path) == []
+    expected = {path: f"frame {level}" for path, level in zip(frames, range(0, 240, 20))}
+    rows = get_screenshots(db_path=db_path)
+    assert len(rows) == len(frames) + 1
+    assert all(text == expected[file_path] for _, file_path, _, text in rows)
@@ -0,0 +1,36 @@
+"""
+Tests for the OCR result cache (loggerheads/ocr_cache.py).
+"""
+
+from loggerheads.db_connection import get_connection
+from loggerheads.ocr_cache import OCRCache
+
+TEXT = "File Edit View Selection Go Run Terminal Help\n" * 20
+
+
+def test_table_comes_from_migrations(db_path):
+    tables = [name for (name,) in get_connection(db_path).execute("SELECT name FROM sqlite_master")]
+    assert "ocr_cache" in tables
+
+
+def test_put_and_get(db_path):
+    cache = OCRCache(db_path)
+    assert cache.get("frame-1") is None
+    cache.put("frame-1", TEXT)
+    assert cache.get("frame-1") == TEXT
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_texts_are_stored_compressed(db_path):
+    OCRCache(db_path).put("frame-1", TEXT)
+    stored = get_connection(db_path).execute("SELECT text FROM ocr_cache").fetchone()[0]
+    assert isinstance(stored, bytes) and len(stored) < len(TEXT)
+
+
+def test_least_recently_used_entries_are_evicted(db_path, monkeypatch):
+    monkeypatch.setattr("loggerheads.ocr_cache.TRIM_EVERY", 1)
+    cache = OCRCache(db_path, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
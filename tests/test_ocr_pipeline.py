@@ -0,0 +1,29 @@
+"""
+Tests for the OCR pipeline's overflow policies (ocr_pipeline.OCRPipeline).
+"""
+
+import pytest
+
+from loggerheads.ocr_pipeline import OCRPipeline
+
+
+def test_full_queue_drops_frames_that_keep_their_file():
+    pipeline = OCRPipeline(workers=1, max_queue=1, overflow_policy="drop_newest", storage="full")
+
+    assert pipeline.submit(1, "screenshot_1.png")
+    assert not pipeline.submit(2, "screenshot_2.png")
+    assert pipeline.stats()['dropped'] == 1
+
+
+@pytest.mark.parametrize("storage", ["thumbnail", "none"])
+@pytest.mark.parametrize("policy", ["drop_oldest", "drop_newest"])
+def test_diskless_storage_blocks_instead_of_dropping(storage, policy):
+    # The end-of-day backfill has no file to OCR a dropped frame from
+    pipeline = OCRPipeline(workers=1, max_queue=1, overflow_policy=policy, storage=storage)
+
+    assert pipeline.overflow_policy == "block"
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        OCRPipeline(overflow_policy="drop_all", storage="none")
@@ -0,0 +1,36 @@
+"""
+Tests for OCR preprocessing presets (ocr_preprocess).
+"""
+
+import pytest
+from PIL import Image
+
+from loggerheads.config import OCR_SCREEN_DPI
+from loggerheads.ocr_preprocess import DEFAULT_PRESET, PRESETS, configured_preset, preprocess_for_ocr
+
+
+def test_configured_preset_accepts_known_names():
+    assert configured_preset("fast") == "fast"
+    assert configured_preset(" Balanced ") == "balanced"
+    assert configured_preset("") == DEFAULT_PRESET
+
+
+def test_unknown_configured_preset_falls_back_with_warning(capsys):
+    assert configured_preset("fastest") == DEFAULT_PRESET
+    warning = capsys.readouterr().out
+    assert "'fastest'" in warning and "balanced" in warning
+
+
+def test_unknown_preset_name_is_an_error():
+    with pytest.raises(ValueError, match="Unknown OCR preprocessing preset: fastest"):
+        preprocess_for_ocr(Image.new("RGB", (8, 8)), "fastest")
+
+
+@pytest.mark.parametrize("preset", [name for name, steps in PRESETS.items() if 'target_dpi' in steps])
+def test_scaling_presets_downscale_at_the_default_dpi(preset):
+    # No solid border, so any size change comes from DPI scaling
+    frame = Image.effect_noise((1920, 1080), 64).convert("RGB")
+
+    processed = preprocess_for_ocr(frame, preset, screen_dpi=OCR_SCREEN_DPI)
+
+    assert processed.width < frame.width and processed.height < frame.height
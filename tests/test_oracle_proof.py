@@ -0,0 +1,111 @@
+"""
+Tests for the oracle's work proof checks (oracle_service/app.py verify_work_proof).
+"""
+
+import importlib.util
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+for module in ("flask", "flask_cors", "flask_limiter", "solders", "solana"):
+    pytest.importorskip(module)
+
+
+@pytest.fixture(scope="module")
+def oracle_app():
+    """Import oracle_service/app.py with a throwaway oracle keypair."""
+    from solders.keypair import Keypair
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("ORACLE_KEYPAIR_JSON", json.dumps(list(bytes(Keypair()))))
+        path = Path(__file__).parent.parent / "oracle_service" / "app.py"
+        spec = importlib.util.spec_from_file_location("oracle_app", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def make_proof(hours, **fields):
+    """A proof that passes every check for `hours` at a 10 second cadence."""
+    last = datetime.now() - timedelta(minutes=5)
+    proof = {
+        'screenshot_count': int(hours * 360),
+        'first_screenshot_time': (last - timedelta(hours=hours)).isoformat(),
+        'last_screenshot_time': last.isoformat(),
+    }
+    proof.update(fields)
+    return proof
+
+
+def test_valid_proof_passes(oracle_app):
+    oracle_app.verify_work_proof(make_proof(8), 8)
+
+
+def test_screenshot_floor_uses_server_capture_interval(oracle_app):
+    floor = int(8 * 250 * 10 / oracle_app.MAX_CAPTURE_INTERVAL)
+    oracle_app.verify_work_proof(make_proof(8, screenshot_count=floor), 8)
+    with pytest.raises(ValueError, match="Too few screenshots"):
+        oracle_app.verify_work_proof(make_proof(8, screenshot_count=floor - 1), 8)
+
+
+def test_client_capture_interval_cannot_lower_floor(oracle_app):
+    floor = int(8 * 250 * 10 / oracle_app.MAX_CAPTURE_INTERVAL)
+    proof = make_proof(8, screenshot_count=floor - 1, max_capture_interval=oracle_app.MAX_CAPTURE_INTERVAL)
+    with pytest.raises(ValueError, match="Too few screenshots"):
+        oracle_app.verify_work_proof(proof, 8)
+
+    proof = make_proof(8, max_capture_interval=oracle_app.MAX_CAPTURE_INTERVAL * 6)
+    with pytest.raises(ValueError, match="outside the allowed range"):
+        oracle_app.verify_work_proof(proof, 8)
+
+
+@pytest.mark.parametrize("value", ["sixty", "60s", [10], True, 0, -10])
+def test_malformed_capture_interval_is_rejected(oracle_app, value):
+    with pytest.raises(ValueError, match="max_capture_interval|outside the allowed range"):
+        oracle_app.verify_work_proof(make_proof(8, max_capture_interval=value), 8)
+
+
+def test_activity_bitmap_must_cover_claimed_hours(oracle_app):
+    from loggerheads.activity_bitmap import empty_bitmap, encode, mark_active
+
+    eight_hours = encode(mark_active(empty_bitmap(), 540, 540 + 8 * 60 - 1))
+    oracle_app.verify_work_proof(make_proof(8, activity_bitmap=eight_hours), 8)
+
+    six_hours = encode(mark_active(empty_bitmap(), 540, 540 + 6 * 60 - 1))
+    with pytest.raises(ValueError, match="exceed active minutes"):
+        oracle_app.verify_work_proof(make_proof(8, activity_bitmap=six_hours), 8)
+
+
+@pytest.mark.parametrize("value", ["not base64!", "AAAA", 42])
+def test_malformed_activity_bitmap_is_rejected(oracle_app, value):
+    with pytest.raises(ValueError, match="Invalid activity bitmap"):
+        oracle_app.verify_work_proof(make_proof(8, activity_bitmap=value), 8)
+
+
+def work_sessions(hours, count=4):
+    """`count` back-to-back sessions adding up to `hours`, as auto_submit sends them."""
+    start = datetime.now() - timedelta(hours=hours, minutes=10)
+    length = timedelta(hours=hours) / count
+    return [[(start + i * length).isoformat(), (start + (i + 1) * length).isoformat()] for i in range(count)]
+
+
+def test_sessions_must_cover_claimed_hours(oracle_app):
+    oracle_app.verify_work_proof(make_proof(8, sessions=work_sessions(8)), 8)
+
+    with pytest.raises(ValueError, match="exceed work sessions"):
+        oracle_app.verify_work_proof(make_proof(8, sessions=work_sessions(6)), 8)
+
+
+def test_repeated_sessions_cannot_inflate_hours(oracle_app):
+    session = work_sessions(2, count=1)[0]
+    with pytest.raises(ValueError, match="Invalid sessions"):
+        oracle_app.verify_work_proof(make_proof(8, sessions=[session] * 4), 8)
+
+
+@pytest.mark.parametrize("value", ["2026-01-01", [["yesterday", "today"]], [["2026-01-01T10:00"]], 42,
+                                   [["2026-01-01T10:00", "2026-01-01T09:00"]]])
+def test_malformed_sessions_are_rejected(oracle_app, value):
+    with pytest.raises(ValueError, match="Invalid sessions"):
+        oracle_app.verify_work_proof(make_proof(8, sessions=value), 8)
@@ -0,0 +1,51 @@
+"""
+Tests for the multi-day report (database.get_daily_report).
+"""
+
+from datetime import datetime, timedelta
+
+from loggerheads.database import (get_daily_report, local_day_bounds, save_screenshot, save_liveness_check,
+                                  _active_seconds)
+from loggerheads.db_connection import get_connection
+from loggerheads.retention import expire_history
+
+TODAY = datetime.now().date()
+
+
+def at(days_back, seconds):
+    """Naive local time `seconds` after 09:00 of a day."""
+    return datetime.combine(TODAY - timedelta(days=days_back), datetime.min.time()) + timedelta(hours=9,
+                                                                                                 seconds=seconds)
+
+
+def test_report_matches_python_gap_rule(db_path):
+    # Gaps of 10 s, exactly MAX_GAP_SECONDS, just over it, and an hour
+    for seconds in (0, 10, 20, 80, 141, 3741, 3751):
+        save_screenshot("", "", timestamp=at(1, seconds))
+    save_screenshot("", "", timestamp=at(0, 0))
+    save_screenshot("", "", timestamp=at(0, 37))
+    save_liveness_check(True, 0.9, 1, timestamp=at(1, 5))
+    save_liveness_check(False, 0.0, 0, timestamp=at(1, 15))
+
+    report = get_daily_report(TODAY - timedelta(days=3), TODAY)
+
+    assert [row['day'] for row in report] == [(TODAY - timedelta(days=1)).isoformat(), TODAY.isoformat()]
+    for row in report:
+        day = datetime.fromisoformat(row['day']).date()
+        timestamps = [ts for (ts,) in get_connection(db_path).execute(
+            "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            local_day_bounds(day)
+        )]
+        assert row['active_seconds'] == _active_seconds(timestamps)
+        assert row['screenshot_count'] == len(timestamps)
+    assert report[0]['active_seconds'] == 10 + 10 + 60 + 10
+    assert (report[0]['liveness_checks'], report[0]['liveness_passed']) == (2, 1)
+
+
+def test_expired_days_fall_back_to_rollups(db_path):
+    for seconds in range(0, 100, 10):
+        save_screenshot("", "", timestamp=at(10, seconds))
+    expire_history(keep_days=5, db_path=db_path)
+
+    [row] = get_daily_report(TODAY - timedelta(days=10), TODAY)
+    assert (row['screenshot_count'], row['active_seconds']) == (10, 90)
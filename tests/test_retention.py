@@ -0,0 +1,91 @@
+"""
+Tests for expiring history (loggerheads/retention.py) and the full reset
+(loggerheads/database_cleanup.py).
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+from loggerheads.database import (get_daily_rollup, save_screenshot, save_liveness_check, search_screenshots,
+                                  start_pause, end_pause)
+from loggerheads.database_cleanup import clear_all_database_data
+from loggerheads.db_connection import get_connection
+from loggerheads.ocr_cache import OCRCache
+from loggerheads.retention import expire_history, expire_images, screenshot_day_dir
+
+TODAY = datetime.now().date()
+
+
+def at(days_back, hour=12):
+    """Naive local time, as save_screenshot's demo-mode timestamps take it."""
+    return datetime.combine(TODAY - timedelta(days=days_back), datetime.min.time()) + timedelta(hours=hour)
+
+
+def count(db_path, table):
+    return get_connection(db_path).execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_expire_history_deletes_old_days_only(db_path):
+    for days_back in (10, 0):
+        for i in range(3):
+            save_screenshot("", f"report draft for day {days_back}", timestamp=at(days_back) + timedelta(seconds=10 * i))
+        save_liveness_check(True, 0.9, 1, timestamp=at(days_back))
+
+    deleted = expire_history(keep_days=5, db_path=db_path)
+
+    assert deleted['screenshots'] == 3
+    assert deleted['liveness_checks'] == 1
+    assert deleted['sessions'] == 1
+    assert count(db_path, "screenshots") == 3
+    assert count(db_path, "ocr_texts") == 1
+    # The search index follows, and the old day's hours are kept as history
+    assert [hit[2] for hit in search_screenshots("draft", db_path=db_path)] == ["report [draft] for day 0"]
+    assert get_daily_rollup(at(10).date(), db_path)['screenshot_count'] == 3
+
+
+def test_duplicates_of_expired_frames_keep_their_text(db_path):
+    original = save_screenshot("", "terminal output", timestamp=at(10))
+    save_screenshot("", "", timestamp=at(0), duplicate_of=original)
+
+    expire_history(keep_days=5, db_path=db_path)
+
+    text = get_connection(db_path).execute("SELECT ocr_text(t.text) FROM screenshots s JOIN ocr_texts t "
+                                           "ON t.id = s.text_id").fetchone()[0]
+    assert text == "terminal output"
+
+
+def test_expire_history_deletes_stale_ocr_cache_entries(db_path):
+    cache = OCRCache(db_path)
+    cache.put("old-frame", "old text")
+    cache.put("new-frame", "new text")
+    get_connection(db_path).execute(
+        "UPDATE ocr_cache SET last_used = ? WHERE content_hash = 'old-frame'", (time.time() - 10 * 86400,)
+    )
+
+    assert expire_history(keep_days=5, db_path=db_path)['ocr_cache'] == 1
+    assert cache.get("old-frame") is None
+    assert cache.get("new-frame") == "new text"
+
+
+def test_expire_images_removes_old_day_directories(db_path, tmp_path):
+    root = str(tmp_path / "screenshots")
+    old_dir = screenshot_day_dir(TODAY - timedelta(days=3), root)
+    new_dir = screenshot_day_dir(TODAY, root)
+    save_screenshot(os.path.join(old_dir, "frame.jpg"), "", timestamp=at(3))
+
+    assert expire_images(keep_days=2, root=root, db_path=db_path) == 1
+    assert not os.path.exists(old_dir) and os.path.exists(new_dir)
+    assert get_connection(db_path).execute("SELECT file_path FROM screenshots").fetchone()[0] == ""
+
+
+def test_clear_all_database_data(db_path):
+    save_screenshot("", "some text", timestamp=at(0))
+    end_pause(start_pause())
+    OCRCache(db_path).put("frame", "some text")
+
+    clear_all_database_data()
+
+    for table in ("screenshots", "ocr_texts", "sessions", "daily_rollups", "ocr_cache", "ocr_texts_fts_deleted"):
+        assert count(db_path, table) == 0
+    assert search_screenshots("text", db_path=db_path) == []
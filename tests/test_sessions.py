@@ -0,0 +1,93 @@
+"""
+Tests for work sessions and pauses, and for the one gap rule that sessions, daily
+rollups, the report and the hours engine share.
+"""
+
+from datetime import datetime, timedelta
+
+from loggerheads.database import (save_screenshot, start_pause, end_pause, close_session, get_sessions,
+                                  get_session_totals, get_daily_rollup, get_daily_report, rebuild_daily_rollups,
+                                  local_day_bounds, _active_seconds)
+from loggerheads.db_connection import get_connection
+from loggerheads.hours_engine import hours_by_day
+
+DAY = datetime.now().date() - timedelta(days=1)
+
+
+def at(seconds):
+    """Naive local time `seconds` after 09:00 of DAY."""
+    return datetime.combine(DAY, datetime.min.time()) + timedelta(hours=9, seconds=seconds)
+
+
+def day_hours(db_path):
+    """The day's active seconds as every code path computes them."""
+    conn = get_connection(db_path)
+    bounds = local_day_bounds(DAY)
+    timestamps = [ts for (ts,) in conn.execute(
+        "SELECT timestamp FROM screenshots WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp", bounds
+    )]
+    pauses = [ts for (ts,) in conn.execute(
+        "SELECT timestamp FROM sessions WHERE paused = 1 AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+        bounds
+    )]
+    return {
+        'sessions': get_session_totals(DAY, db_path)['active_seconds'],
+        'rollup': get_daily_rollup(DAY, db_path)['active_seconds'],
+        'report': get_daily_report(DAY, DAY, db_path)[0]['active_seconds'],
+        'engine': hours_by_day(timestamps, pauses=pauses)[DAY]['active_seconds'],
+        'python': _active_seconds(timestamps, pauses),
+    }
+
+
+def test_rebuild_keeps_pause_split(db_path):
+    for seconds in (0, 2, 4):
+        save_screenshot("", "", timestamp=at(seconds))
+    pause_id = start_pause(db_path, timestamp=at(5))
+    end_pause(pause_id, db_path, timestamp=at(6))
+    for seconds in (7, 9, 11):
+        save_screenshot("", "", timestamp=at(seconds))
+
+    assert set(day_hours(db_path).values()) == {8}
+
+    rebuild_daily_rollups(db_path=db_path)
+
+    assert set(day_hours(db_path).values()) == {8}
+    work = [session for session in get_sessions(DAY, db_path) if not session['paused']]
+    assert [(session['seconds'], session['closed_by']) for session in work] == [(4, "pause"), (4, "day")]
+
+
+def test_gap_rule_agrees_everywhere(db_path):
+    # 10 s and exactly MAX_GAP_SECONDS count; 61 s and an hour don't
+    for seconds in (0, 10, 70, 131, 3731, 3741):
+        save_screenshot("", "", timestamp=at(seconds))
+    # Stopping and restarting within the gap rule continues the session
+    close_session("stopped", db_path)
+    save_screenshot("", "", timestamp=at(3751))
+    pause_id = start_pause(db_path, timestamp=at(3755))
+    end_pause(pause_id, db_path, timestamp=at(3800))
+    save_screenshot("", "", timestamp=at(3805))
+    save_screenshot("", "", timestamp=at(3815))
+
+    expected = 10 + 60 + 10 + 10 + 10
+    assert set(day_hours(db_path).values()) == {expected}
+    work = [session for session in get_sessions(DAY, db_path) if not session['paused']]
+    assert [session['closed_by'] for session in work] == ["gap", "gap", "pause", None]
+
+    assert rebuild_daily_rollups(DAY, db_path) == 1
+    assert set(day_hours(db_path).values()) == {expected}
+    rebuilt = [session for session in get_sessions(DAY, db_path) if not session['paused']]
+    assert [(s['start'], s['end'], s['seconds']) for s in rebuilt] == [(s['start'], s['end'], s['seconds'])
+                                                                       for s in work]
+    # A session without a later screenshot is closed by the day once it's over
+    assert [session['closed_by'] for session in rebuilt] == ["gap", "gap", "pause", "day"]
+
+
+def test_rebuild_keeps_recorded_close_reason(db_path):
+    for seconds in (0, 10, 20):
+        save_screenshot("", "", timestamp=at(seconds))
+    close_session("work_hours", db_path)
+
+    rebuild_daily_rollups(db_path=db_path)
+
+    work = [session for session in get_sessions(DAY, db_path) if not session['paused']]
+    assert [(session['seconds'], session['closed_by']) for session in work] == [(20, "work_hours")]
@@ -0,0 +1,80 @@
+"""
+Tests for OCR text compression (text_compression), with both codecs.
+"""
+
+import random
+
+import pytest
+
+from loggerheads import text_compression
+from loggerheads.text_compression import (CODEC_ZLIB, CODEC_ZSTD, HEADER, compress_text, decompress_text,
+                                          train_text_dictionary)
+from loggerheads.db_connection import get_connection
+
+CODECS = {"zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+TEXT = "\n".join([
+    "File  Edit  Selection  View  Go  Run  Terminal  Help",
+    "EXPLORER  loggerheads  database.py  migrations.py  hours_engine.py",
+    "def rebuild_daily_rollups(day=None, db_path=None):",
+    "    Recompute daily rollups from the screenshots table, one local day at a time.",
+    "Ln 412, Col 17  Spaces: 4  UTF-8  LF  Python 3.11.4",
+])
+
+
+def screens(count, seed=7):
+    """Distinct OCR-like texts: shared editor chrome around varying code lines."""
+    rng = random.Random(seed)
+    words = ["cursor", "execute", "timestamp", "session", "rollup", "bitmap", "pause", "return", "day", "gap"]
+    return [
+        TEXT + "\n" + "\n".join(" ".join(rng.choice(words) for _ in range(8)) for _ in range(6)) + f"\n{i}"
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(params=sorted(CODECS))
+def codec(request, monkeypatch):
+    if request.param == "zstd" and text_compression.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    if request.param == "zlib":
+        monkeypatch.setattr(text_compression, "zstandard", None)
+    return request.param
+
+
+def test_short_text_stays_plain(db_path):
+    assert compress_text("Terminal", db_path) == "Terminal"
+    assert decompress_text("Terminal", db_path) == "Terminal"
+    assert decompress_text(None, db_path) is None
+
+
+def test_round_trip_without_dictionary(db_path, codec):
+    stored = compress_text(TEXT * 3, db_path, dictionary_id=0)
+
+    assert isinstance(stored, bytes)
+    assert HEADER.unpack_from(stored) == (CODECS[codec], 0)
+    assert decompress_text(stored, db_path) == TEXT * 3
+    assert get_connection(db_path).execute("SELECT ocr_text(?)", (stored,)).fetchone()[0] == TEXT * 3
+
+
+def test_round_trip_with_trained_dictionary(db_path, codec):
+    samples = screens(300)
+    dictionary_id = train_text_dictionary(db_path, codec=codec, samples=samples)
+    assert get_connection(db_path).execute(
+        "SELECT codec FROM text_dictionaries WHERE id = ?", (dictionary_id,)
+    ).fetchone()[0] == codec
+
+    text = screens(1, seed=8)[0]
+    stored = compress_text(text, db_path)
+    assert HEADER.unpack_from(stored) == (CODECS[codec], dictionary_id)
+    assert len(stored) < len(compress_text(text, db_path, dictionary_id=0))
+    assert decompress_text(stored, db_path) == text
+
+
+def test_zstd_text_needs_zstandard(db_path, monkeypatch):
+    if text_compression.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    stored = compress_text(TEXT * 3, db_path, dictionary_id=0)
+    monkeypatch.setattr(text_compression, "zstandard", None)
+    monkeypatch.setattr(text_compression, "_zstd_decompressors", {})
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        decompress_text(stored, db_path)
@@ -0,0 +1,73 @@
+"""
+Tests for incremental tiled OCR (ocr_processor.TiledOCR), with a fake engine
+that reads each solid block of one gray value as a word.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from loggerheads import ocr_processor
+from loggerheads.ocr_processor import TiledOCR
+
+WIDTH, HEIGHT = 200, 160  # 8 x 2 tiles of 20 x 100 pixels
+
+
+class BlockEngine:
+    """Words are solid blocks on a white page; a line is a run of non-blank pixel rows."""
+
+    def image_to_words(self, image):
+        pixels = np.asarray(image.convert("L"))
+        ink_rows = (pixels != 255).any(axis=1)
+        line_of_row = np.cumsum(ink_rows & ~np.append(False, ink_rows[:-1]))
+
+        words = []
+        for value in np.unique(pixels[pixels != 255]):
+            ys, xs = np.nonzero(pixels == value)
+            top, left = int(ys.min()), int(xs.min())
+            words.append((f"w{value}", left, top, int(xs.max()) - left + 1, int(ys.max()) - top + 1,
+                          int(line_of_row[top])))
+        return sorted(words, key=lambda word: (word[5], word[1]))
+
+
+@pytest.fixture(autouse=True)
+def block_engine(monkeypatch):
+    monkeypatch.setattr(ocr_processor, "get_ocr_engine", BlockEngine)
+
+
+def frame(*blocks):
+    """A white frame with (value, left, top, right, bottom) blocks drawn on it."""
+    pixels = np.full((HEIGHT, WIDTH), 255, dtype=np.uint8)
+    for value, left, top, right, bottom in blocks:
+        pixels[top:bottom, left:right] = value
+    return Image.fromarray(pixels)
+
+
+def full_read(image):
+    return TiledOCR(rows=8, cols=2).extract_text(image)
+
+
+def test_changed_line_is_read_whole_across_tile_edges():
+    tiled = TiledOCR(rows=8, cols=2)
+    # A line straddling the tile edge at y=20, and a line further down
+    first = frame((10, 10, 15, 40, 25), (11, 120, 15, 150, 25), (20, 10, 55, 40, 65))
+    assert tiled.extract_text(first) == "w10 w11\nw20"
+
+    # Only the lower half of the right-hand word changes, inside one tile
+    second = frame((10, 10, 15, 40, 25), (11, 120, 15, 150, 20), (60, 120, 20, 150, 25), (20, 10, 55, 40, 65))
+    text = tiled.extract_text(second)
+
+    assert text == full_read(second) == "w10 w11 w60\nw20"
+    assert (tiled.full_frames, tiled.tiles_read) == (1, 1)
+
+
+def test_each_stream_keeps_its_own_diff_state():
+    editor = [frame((30, 10, 5, 60, 15)), frame((30, 10, 5, 60, 15), (31, 10, 85, 60, 95))]
+    browser = [frame((40, 110, 45, 190, 55)), frame((90, 110, 45, 190, 55))]
+    streams = {"editor": TiledOCR(rows=8, cols=2), "browser": TiledOCR(rows=8, cols=2)}
+
+    for editor_frame, browser_frame in zip(editor, browser):
+        assert streams["editor"].extract_text(editor_frame) == full_read(editor_frame)
+        assert streams["browser"].extract_text(browser_frame) == full_read(browser_frame)
+
+    assert streams["editor"].full_frames == streams["browser"].full_frames == 1